@@ -0,0 +1,45 @@
+"""
+Time and result size of the daily signal counts of `Plot.plot_availability` read from
+the signals and from the rollups, and of the weekly counts of all signals of
+`ToolBox.count_values_in_db_group_by_source_and_variable`.
+
+Usage: python benchmarks/availability.py START END [BUCKET] [INSTANCE|-]
+
+Requires a default connection (see `set_defaults`), counts the signals of all sources.
+The rollups are only read if they have been created and refreshed, see
+`ToolBox.create_rollups`.
+"""
+
+import sys
+import time
+
+from datapool_client import DataPool, Plot, ToolBox
+
+
+def main():
+    start, end = sys.argv[1:3]
+    bucket = sys.argv[3] if len(sys.argv) > 3 else "1d"
+    instance = sys.argv[4] if len(sys.argv) > 4 and sys.argv[4] != "-" else None
+
+    sources = list(DataPool(instance=instance, verbose=False).source.all().name)
+    for label, rollup_ttl in (("signals", None), ("rollups", 300)):
+        plot = Plot(instance=instance, verbose=False, rollup_ttl=rollup_ttl)
+        started = time.perf_counter()
+        counts, _ = plot.plot_availability(
+            sources, start=start, end=end, bucket=bucket, inline=True
+        )
+        elapsed = time.perf_counter() - started
+        print(
+            f"{label:<8} {elapsed:8.3f} s  {counts.shape[0]} x {counts.shape[1]} counts"
+        )
+
+    started = time.perf_counter()
+    weekly = ToolBox(
+        instance=instance, verbose=False
+    ).count_values_in_db_group_by_source_and_variable()
+    elapsed = time.perf_counter() - started
+    print(f"{'toolbox':<8} {elapsed:8.3f} s  {len(weekly)} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Time to look up the source type and its special values of many sources one call at a
+time and in a batch.
+
+Usage: python benchmarks/batch.py [INSTANCE|-] [CALLS]
+
+Requires a default connection (see `set_defaults`). The sources of the database are
+repeated up to CALLS sources.
+"""
+
+import sys
+import time
+
+from datapool_client import DataPool
+
+
+def lookups(tables, source_names):
+    return [
+        (
+            tables.source_type.from_source(source_name),
+            tables.special_value_definition.from_source_type("source_type_1"),
+        )
+        for source_name in source_names
+    ]
+
+
+def main():
+    instance = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] != "-" else None
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    dp = DataPool(instance=instance, verbose=False)
+    names = dp.source.all().name.tolist()
+    source_names = (names * (calls // len(names) + 1))[:calls]
+    lookups(dp, source_names[:1])
+
+    start = time.perf_counter()
+    lookups(dp, source_names)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with dp.batch() as batch:
+        futures = lookups(batch, source_names)
+    [[future.result() for future in source] for source in futures]
+    batched = time.perf_counter() - start
+
+    print(f"single calls   {single * 1000:8.1f} ms ({2 * calls} calls)")
+    print(f"batch          {batched * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
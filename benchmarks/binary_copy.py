@@ -0,0 +1,113 @@
+"""
+Time and transferred bytes of Signal.get with the CSV and the binary COPY format.
+
+Besides Signal.get (timestamps, values and names) the same rows are fetched with
+integer ids instead of names, where all columns are of fixed width. Finally the
+latency of small results (100 rows) shows the cost of describing the result before
+the binary COPY, once with the cached description and once without.
+
+Usage: python benchmarks/binary_copy.py SOURCE_NAME [INSTANCE] [START] [END]
+
+Requires a default connection (see `set_defaults`).
+"""
+
+import statistics
+import sys
+import time
+
+from datapool_client import DataPool
+from datapool_client.core import abstractions
+
+COPY_OPTIONS = {"csv": "CSV HEADER", "binary": "(FORMAT binary)"}
+
+ID_QUERY = """
+SELECT signal.timestamp, signal.value, signal.variable_id, signal.site_id
+FROM signal
+INNER JOIN source ON signal.source_id = source.source_id
+WHERE source.name = '{source_name}'
+ORDER BY signal.timestamp ASC
+"""
+
+
+SMALL_REPETITIONS = 50
+
+
+class ByteCounter:
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+
+
+def transferred_bytes(dp, query, copy_format):
+    counter = ByteCounter()
+    conn = dp._pool.get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.copy_expert(
+                f"COPY ({query}) TO STDOUT WITH {COPY_OPTIONS[copy_format]}", counter
+            )
+    finally:
+        dp._pool.put_connection(conn)
+    return counter.size
+
+
+def main():
+    source_name = sys.argv[1]
+    instance = sys.argv[2] if len(sys.argv) > 2 else None
+    filters = dict(source_name=source_name)
+    if len(sys.argv) > 3:
+        filters["start"] = sys.argv[3]
+    if len(sys.argv) > 4:
+        filters["end"] = sys.argv[4]
+
+    for copy_format in COPY_OPTIONS:
+        dp = DataPool(instance=instance, verbose=False, copy_format=copy_format)
+        start = time.perf_counter()
+        data = dp.signal.get(**filters)
+        elapsed = time.perf_counter() - start
+        size = transferred_bytes(dp, dp.signal.last_query[:-1], copy_format)
+        report(f"{copy_format} names", len(data), elapsed, size)
+
+        query = ID_QUERY.format(source_name=source_name)
+        start = time.perf_counter()
+        data = dp.query_df(query)
+        elapsed = time.perf_counter() - start
+        size = transferred_bytes(dp, query, copy_format)
+        report(f"{copy_format} ids", len(data), elapsed, size)
+
+    print(f"median latency of {SMALL_REPETITIONS} small results:")
+    dp = DataPool(instance=instance, verbose=False)
+    print(
+        f"  csv                 {small_result_latency(dp, source_name, True) * 1e3:8.2f} ms"
+    )
+    dp = DataPool(instance=instance, verbose=False, copy_format="binary")
+    for cached in (False, True):
+        label = "binary, cached" if cached else "binary, described"
+        latency = small_result_latency(dp, source_name, cached)
+        print(f"  {label:<19} {latency * 1e3:8.2f} ms")
+
+
+def small_result_latency(dp, source_name, cached):
+    query = ID_QUERY.format(source_name=source_name) + " LIMIT 100"
+    dp.query_df(query)
+    timings = []
+    for _ in range(SMALL_REPETITIONS):
+        if not cached:
+            abstractions._DESCRIPTIONS.clear()
+        start = time.perf_counter()
+        dp.query_df(query)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def report(label, rows, elapsed, size):
+    print(
+        f"{label:<14} {rows:>10} rows   {elapsed:8.3f} s   "
+        f"{size / 1e6:10.1f} MB transferred"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Per-query latency of small lookups with and without connection pooling.
+
+Usage: python benchmarks/connection_pool.py SOURCE_NAME [INSTANCE] [REPETITIONS]
+
+Requires a default connection (see `set_defaults`).
+"""
+
+import statistics
+import sys
+import time
+
+from datapool_client import DataPool, configure_pool
+from datapool_client.core.pool import POOL_SETTINGS
+
+
+def measure(dp, source_name, repetitions):
+    timings = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        dp.source_type.from_source(source_name)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label, timings):
+    print(
+        f"{label:<12} mean {statistics.mean(timings) * 1e3:8.2f} ms   "
+        f"median {statistics.median(timings) * 1e3:8.2f} ms   "
+        f"min {min(timings) * 1e3:8.2f} ms"
+    )
+
+
+def main():
+    source_name = sys.argv[1]
+    instance = sys.argv[2] if len(sys.argv) > 2 else None
+    repetitions = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+
+    dp = DataPool(instance=instance, verbose=False)
+    max_size = POOL_SETTINGS["max_size"]
+
+    # a pool that keeps no idle connections connects on every query (old behaviour)
+    configure_pool(max_size=0)
+    report("unpooled", measure(dp, source_name, repetitions))
+
+    configure_pool(max_size=max_size)
+    measure(dp, source_name, 1)
+    report("pooled", measure(dp, source_name, repetitions))
+
+
+if __name__ == "__main__":
+    main()
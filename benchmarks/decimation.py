@@ -0,0 +1,60 @@
+"""
+Time to decimate a series of irregularly sampled points with gaps by `decimate` with
+LTTB and min/max, and time and html size of a meta plot of the full and of the
+decimated series.
+
+Usage: python benchmarks/decimation.py [POINTS] [MAX_POINTS]
+
+Needs no database, the series is random.
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from datapool_client import decimate
+from datapool_client.core.plots import generate_meta_plot
+
+
+def series(points):
+    rng = np.random.default_rng(0)
+    steps = rng.exponential(60, points).cumsum()
+    timestamps = pd.Timestamp("2015-01-01") + pd.to_timedelta(steps, unit="s")
+    values = np.sin(steps / 86400) + rng.normal(0, 0.2, points)
+    # gaps of an hour every few days
+    values[(steps % 500000) < 3600] = np.nan
+    return pd.DataFrame({"value": values}, index=timestamps)
+
+
+def plot(frame, max_points):
+    meta = pd.DataFrame(columns=["start", "end"])
+    started = time.perf_counter()
+    fig = generate_meta_plot(
+        frame, meta, [], color_encoding={}, inline=True, max_points=max_points
+    )
+    html = fig.to_html(include_plotlyjs=False)
+    return time.perf_counter() - started, len(html)
+
+
+def main():
+    points = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    max_points = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    frame = series(points)
+    for method in ("lttb", "min_max"):
+        started = time.perf_counter()
+        decimated = decimate(frame, max_points, method=method)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{method:<8} {elapsed:8.3f} s  {len(frame):10d} -> {len(decimated)} points"
+        )
+
+    for label, limit in (("full", None), ("lttb", max_points)):
+        elapsed, size = plot(frame, limit)
+        print(f"plot {label:<4} {elapsed:8.3f} s  {size / 1e6:8.1f} MB html")
+
+
+if __name__ == "__main__":
+    main()
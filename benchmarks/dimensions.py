@@ -0,0 +1,45 @@
+"""
+Wall time of Signal.get filtering on dimension ids compared to joining the names, and
+time and memory of the result modes.
+
+Usage: python benchmarks/dimensions.py SOURCE_NAME [INSTANCE|-] [REPEAT]
+
+Requires a default connection (see `set_defaults`).
+"""
+
+import sys
+import time
+
+from datapool_client import DataPool
+
+
+def memory(result):
+    if isinstance(result, tuple):
+        signals, dimensions = result
+        return memory(signals) + sum(map(memory, dimensions.values()))
+    return result.memory_usage(deep=True).sum()
+
+
+def main():
+    source_name = sys.argv[1]
+    instance = sys.argv[2] if len(sys.argv) > 2 and sys.argv[2] != "-" else None
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+
+    runs = [
+        ("joined names", None, "names"),
+        ("dimension ids", 300, "names"),
+        ("categorical", 300, "categorical"),
+        ("normalized", 300, "normalized"),
+    ]
+    for label, dimension_ttl, result_mode in runs:
+        dp = DataPool(instance=instance, verbose=False, dimension_ttl=dimension_ttl)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = dp.signal.get(source_name=source_name, result=result_mode)
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:<15} {best:8.2f} s {memory(result) / 2**20:10.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
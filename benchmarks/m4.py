@@ -0,0 +1,36 @@
+"""
+Time, transferred rows and html size of a dynamic plot of all signals of a long range
+and of the plot of their M4 signals (`Plot.plot_signal(width=...)`).
+
+Usage: python benchmarks/m4.py SOURCE_NAME START END [WIDTH] [INSTANCE|-]
+
+Requires a default connection (see `set_defaults`).
+"""
+
+import sys
+import time
+
+from datapool_client import Plot
+
+
+def main():
+    source_name, start, end = sys.argv[1:4]
+    width = int(sys.argv[4]) if len(sys.argv) > 4 else 1600
+    instance = sys.argv[5] if len(sys.argv) > 5 and sys.argv[5] != "-" else None
+
+    plot = Plot(instance=instance, verbose=False)
+    for label, plot_width in (("all", None), ("m4", width)):
+        started = time.perf_counter()
+        data, fig = plot.plot_signal(
+            source_name, start=start, end=end, width=plot_width, inline=True
+        )
+        fetched = time.perf_counter() - started
+        html = fig.to_html(include_plotlyjs=False)
+        print(
+            f"{label:<4} {fetched:8.3f} s  {int(data.count().sum()):10d} signals  "
+            f"{len(html) / 1e6:8.1f} MB html"
+        )
+
+
+if __name__ == "__main__":
+    main()
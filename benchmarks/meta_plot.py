@@ -0,0 +1,104 @@
+"""
+Time to build and write the figure of `generate_meta_plot` for many meta data rows, and
+for comparison that of a trace and an annotation per meta data row as
+`generate_meta_plot` built it before it batched the areas per log type.
+
+Usage: python benchmarks/meta_plot.py [META_ROWS] [SIGNALS]
+
+Needs no database, the data is random.
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from datapool_client.core.plots import format_tag, generate_meta_plot
+
+COLORS = {
+    "source_installation": "#3a86ff",
+    "source_maintenance": "#8338ec",
+    "operational_malfunction": "#e5383b",
+    "miscellaneous": "#ffbe0b",
+}
+
+
+def data(meta_rows, signals):
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2015-01-01", periods=signals, freq="5min")
+    frame = pd.DataFrame({"value": rng.normal(size=signals).cumsum()}, index=index)
+    start = index[rng.integers(0, signals, meta_rows)].sort_values()
+    meta = pd.DataFrame(
+        {
+            "log_type": rng.choice(list(COLORS), meta_rows),
+            "action_type": rng.choice(["cleaning", None], meta_rows),
+            "start": start,
+            "end": start + pd.to_timedelta(rng.integers(0, 48, meta_rows), unit="h"),
+            "comment": rng.choice(["sensor cleaned; " + "word " * 40, None], meta_rows),
+            "meta_flag": "green",
+            "person": "someone",
+            "depth": rng.choice([1.5, np.nan], meta_rows),
+        }
+    )
+    return frame, meta
+
+
+def per_row_figure(frame, meta):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(rows=2, cols=1, row_heights=[0.9, 0.1], shared_xaxes=True)
+    annotations = []
+    for i, (_, row) in enumerate(meta.iterrows()):
+        low, high = i / len(meta), (i + 1) / len(meta)
+        st, en = row["start"], row["end"]
+        fig.add_trace(
+            go.Scatter(
+                x=[st, st, en, en, st],
+                y=[low, high, high, low, low],
+                fill="toself",
+                fillcolor=COLORS[row["log_type"]],
+                text=format_tag(row, ["depth"]),
+                hoveron="fills",
+            ),
+            row=2,
+            col=1,
+        )
+        annotations.append(
+            dict(x=st, y=frame.value.max(), arrowcolor=COLORS[row["log_type"]])
+        )
+    fig.add_trace(go.Scatter(x=frame.index, y=frame.value), row=1, col=1)
+    fig.update_layout(annotations=annotations)
+    return fig
+
+
+def measure(build):
+    started = time.perf_counter()
+    fig = build()
+    built = time.perf_counter() - started
+    html = fig.to_html(include_plotlyjs=False)
+    return built, time.perf_counter() - started, len(html)
+
+
+def main():
+    meta_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    signals = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+    frame, meta = data(meta_rows, signals)
+    builds = {
+        "batched": lambda: generate_meta_plot(
+            frame, meta, ["depth"], color_encoding=COLORS, inline=True
+        ),
+        "per row": lambda: per_row_figure(frame, meta),
+    }
+    for label, build in builds.items():
+        built, written, size = measure(build)
+        print(
+            f"{label:<8} built {built:8.2f} s  written {written:8.2f} s  "
+            f"{size / 1e6:6.1f} MB html"
+        )
+
+
+if __name__ == "__main__":
+    main()
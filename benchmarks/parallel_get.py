@@ -0,0 +1,29 @@
+"""
+Wall time of Signal.get fetched serially and with several connections in parallel.
+
+Usage: python benchmarks/parallel_get.py SOURCE_NAME [INSTANCE|-] [PARALLEL ...]
+
+Requires a default connection (see `set_defaults`).
+"""
+
+import sys
+import time
+
+from datapool_client import DataPool
+
+
+def main():
+    source_name = sys.argv[1]
+    instance = sys.argv[2] if len(sys.argv) > 2 and sys.argv[2] != "-" else None
+    levels = [int(level) for level in sys.argv[3:]] or [2, 4, 8]
+
+    dp = DataPool(instance=instance, verbose=False)
+    for parallel in [None] + levels:
+        start = time.perf_counter()
+        data = dp.signal.get(source_name=source_name, parallel=parallel)
+        elapsed = time.perf_counter() - start
+        print(f"parallel={str(parallel):<5} {len(data):>10} rows {elapsed:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
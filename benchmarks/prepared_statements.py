@@ -0,0 +1,81 @@
+"""
+Per-call latency of repeated small `Signal.get`, `Signal.get_id` and
+`SourceType.from_source` queries with and without server side prepared statements,
+the planning time postgres spends on each of them and whether postgres reused a
+generic plan of the prepared statement or planned every execution anew.
+
+Usage: python benchmarks/prepared_statements.py SOURCE_NAME VARIABLE_NAME START END [INSTANCE|-] [REPETITIONS]
+
+Requires a default connection (see `set_defaults`). START and END should span only a
+few signals, so that planning makes up a noticeable part of the query.
+"""
+
+import re
+import statistics
+import sys
+import time
+
+from datapool_client import DataPool
+
+
+def measure(call, repetitions):
+    call()
+    timings = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def planning_time(dp, query):
+    plan = dp.query(f"EXPLAIN (ANALYZE, SUMMARY) {query}")["data"]
+    for (line,) in plan:
+        match = re.match(r"Planning Time: ([\d.]+) ms", line)
+        if match:
+            return float(match.group(1))
+
+
+def main():
+    source_name, variable_name, start, end = sys.argv[1:5]
+    instance = sys.argv[5] if len(sys.argv) > 5 and sys.argv[5] != "-" else None
+    repetitions = int(sys.argv[6]) if len(sys.argv) > 6 else 200
+
+    dp = DataPool(instance=instance, verbose=False)
+    calls = {
+        "get": lambda: dp.signal.get(
+            source_name=source_name,
+            variable_name=variable_name,
+            start=start,
+            end=end,
+            to_dataframe=False,
+        ),
+        "get_id": lambda: dp.signal.get_id(
+            source_name, variable_name, start, end, to_dataframe=False
+        ),
+        "from_source": lambda: dp.source_type.from_source(
+            source_name, to_dataframe=False
+        ),
+    }
+
+    for name, call in calls.items():
+        table = dp.source_type if name == "from_source" else dp.signal
+        for prepare in (False, True):
+            table._prepare = prepare
+            median = measure(call, repetitions)
+            label = f"{name} {'prepared' if prepare else 'plain'}"
+            print(f"{label:<20} median {median * 1e3:8.3f} ms")
+        planning = planning_time(dp, table.last_query)
+        print(f"{name + ' planning':<20}        {planning:8.3f} ms per plain call")
+
+    # the pool hands out the most recently used connection, the one of the calls
+    plans = dp.query(
+        "SELECT statement, generic_plans, custom_plans FROM pg_prepared_statements"
+    )["data"]
+    for statement, generic, custom in plans:
+        first_line = " ".join(statement.split())[:70]
+        print(f"{generic:6d} generic {custom:6d} custom plans: {first_line}")
+
+
+if __name__ == "__main__":
+    main()
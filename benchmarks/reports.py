@@ -0,0 +1,56 @@
+"""
+Time and size on disk of the plots of many sources written by a loop of
+`Plot.plot_signal_with_meta` and by `Plot.write_reports`.
+
+Usage: python benchmarks/reports.py START END DIRECTORY [WIDTH|-] [INSTANCE|-]
+
+Requires a default connection (see `set_defaults`), plots all sources, with all their
+signals unless WIDTH is given.
+`plot_signal_with_meta` skips sources without meta data, `write_reports` does not.
+"""
+
+import os
+import sys
+import time
+
+from datapool_client import DataPool, Plot
+
+
+def size(directory):
+    return sum(entry.stat().st_size for entry in os.scandir(directory))
+
+
+def main():
+    start, end, directory = sys.argv[1:4]
+    width = int(sys.argv[4]) if len(sys.argv) > 4 and sys.argv[4] != "-" else None
+    instance = sys.argv[5] if len(sys.argv) > 5 and sys.argv[5] != "-" else None
+
+    sources = list(DataPool(instance=instance, verbose=False).source.all().name)
+    plot = Plot(instance=instance, verbose=False)
+
+    loop = os.path.join(directory, "loop")
+    os.makedirs(loop, exist_ok=True)
+    started = time.perf_counter()
+    for name in sources:
+        plot.plot_signal_with_meta(
+            source_name=name,
+            start=start,
+            end=end,
+            width=width,
+            filename=os.path.join(loop, f"{name}.html"),
+            auto_open=False,
+        )
+    elapsed = time.perf_counter() - started
+    files = len(os.listdir(loop))
+    print(f"loop    {elapsed:8.2f} s  {files} plots  {size(loop) / 1e6:8.1f} MB")
+
+    batch = os.path.join(directory, "batch")
+    started = time.perf_counter()
+    paths = plot.write_reports(sources, batch, start=start, end=end, width=width)
+    elapsed = time.perf_counter() - started
+    plots = sum(path is not None for path in paths.values())
+    print(f"reports {elapsed:8.2f} s  {plots} plots  {size(batch) / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
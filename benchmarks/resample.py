@@ -0,0 +1,59 @@
+"""
+Time and transferred rows of hourly means of a long range computed on the client from
+the raw signals and in the database by `Signal.get(resample=...)`, from the signals and
+from the rollups.
+
+Usage: python benchmarks/resample.py SOURCE_NAME START END [RULE] [INSTANCE|-]
+
+Requires a default connection (see `set_defaults`). The rollups are only read if they
+have been created and refreshed, see `ToolBox.create_rollups`.
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from datapool_client import DataPool
+
+
+def main():
+    source_name, start, end = sys.argv[1:4]
+    rule = sys.argv[4] if len(sys.argv) > 4 else "1h"
+    instance = sys.argv[5] if len(sys.argv) > 5 and sys.argv[5] != "-" else None
+
+    dp = DataPool(instance=instance, verbose=False, rollup_ttl=None)
+    filters = dict(source_name=source_name, start=start, end=end)
+    columns = ["timestamp", "variable", "value"]
+
+    started = time.perf_counter()
+    signals = dp.signal.get(**filters, columns=columns)
+    client = (
+        signals.assign(timestamp=pd.to_datetime(signals.timestamp))
+        .groupby(["variable", pd.Grouper(key="timestamp", freq=rule)])
+        .value.agg(["mean", "min", "max", "count"])
+    )
+    client_time = time.perf_counter() - started
+
+    aggregates = dict(
+        columns=columns, resample=rule, agg=["mean", "min", "max", "count"]
+    )
+    started = time.perf_counter()
+    server = dp.signal.get(**filters, **aggregates)
+    server_time = time.perf_counter() - started
+
+    rolled_up = DataPool(instance=instance, verbose=False)
+    started = time.perf_counter()
+    rolled_up.signal.get(**filters, **aggregates)
+    rollup_time = time.perf_counter() - started
+
+    print(f"client  {client_time:8.3f} s  {len(signals):10d} rows fetched")
+    print(f"server  {server_time:8.3f} s  {len(server):10d} rows fetched")
+    print(f"rollups {rollup_time:8.3f} s")
+    print(
+        f"buckets {len(client.dropna())} on the client, {len(server)} in the database"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Wall time of Signal.get without cache, filling the cache and served from the cache.
+
+Usage: python benchmarks/signal_cache.py SOURCE_NAME VARIABLE_NAME [INSTANCE|-] [START] [END]
+
+Requires a default connection (see `set_defaults`).
+"""
+
+import sys
+import tempfile
+import time
+
+from datapool_client import DataPool
+
+
+def main():
+    source_name, variable_name = sys.argv[1:3]
+    instance = sys.argv[3] if len(sys.argv) > 3 and sys.argv[3] != "-" else None
+    filters = dict(source_name=source_name, variable_name=variable_name)
+    if len(sys.argv) > 4:
+        filters["start"] = sys.argv[4]
+    if len(sys.argv) > 5:
+        filters["end"] = sys.argv[5]
+    else:
+        filters["end"] = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    with tempfile.TemporaryDirectory() as directory:
+        uncached = DataPool(instance=instance, verbose=False)
+        cached = DataPool(instance=instance, verbose=False, cache=directory)
+        for label, dp in [
+            ("database", uncached),
+            ("fill cache", cached),
+            ("cache hit", cached),
+        ]:
+            start = time.perf_counter()
+            data = dp.signal.get(**filters)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<12} {len(data):>10} rows {elapsed:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Time to construct a DataPool with the default connection and to run its first query.
+
+Usage: python benchmarks/startup.py [INSTANCE|-] [REPEAT]
+
+Requires a default connection (see `set_defaults`).
+"""
+
+import sys
+import time
+
+start = time.perf_counter()
+from datapool_client import DataPool  # noqa: E402
+
+imported = time.perf_counter() - start
+
+
+def main():
+    instance = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] != "-" else None
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    start = time.perf_counter()
+    dp = DataPool(instance=instance, verbose=False)
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dp.query("SELECT 1")
+    query = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        DataPool(instance=instance, verbose=False)
+    construct = (time.perf_counter() - start) / repeat
+
+    print(f"import              {imported * 1000:8.1f} ms")
+    print(f"first DataPool()    {first * 1000:8.1f} ms")
+    print(f"first query         {query * 1000:8.1f} ms")
+    print(f"DataPool()          {construct * 1000:8.2f} ms (mean of {repeat})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Wall time and peak memory of Signal.get with a temporary file and streamed parsing.
+
+Usage: python benchmarks/streaming.py SOURCE_NAME [INSTANCE] [BUFFER_SIZE]
+
+Requires a default connection (see `set_defaults`). Run once per mode to keep the
+peak memory figures apart, e.g. with MODE=file or MODE=stream in the environment.
+"""
+
+import os
+import resource
+import sys
+import time
+
+from datapool_client import DataPool
+
+
+def main():
+    source_name = sys.argv[1]
+    instance = sys.argv[2] if len(sys.argv) > 2 else None
+    buffer_size = int(sys.argv[3]) if len(sys.argv) > 3 else 2**20
+    mode = os.environ.get("MODE", "stream")
+
+    dp = DataPool(
+        instance=instance,
+        verbose=False,
+        stream_buffer_size=buffer_size if mode == "stream" else None,
+    )
+
+    start = time.perf_counter()
+    data = dp.signal.get(source_name=source_name, without_flags=True)
+    elapsed = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:<8} {len(data):>10} rows {elapsed:8.2f} s   peak rss {peak:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
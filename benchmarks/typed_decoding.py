@@ -0,0 +1,38 @@
+"""
+Wall time and memory of Signal.get results with strings, typed columns and float32 values.
+
+Usage: python benchmarks/typed_decoding.py SOURCE_NAME [INSTANCE|-] [REPEAT]
+
+Requires a default connection (see `set_defaults`).
+"""
+
+import sys
+import time
+
+from datapool_client import DataPool
+
+
+def main():
+    source_name = sys.argv[1]
+    instance = sys.argv[2] if len(sys.argv) > 2 and sys.argv[2] != "-" else None
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+
+    runs = [
+        ("strings", {}),
+        ("typed", dict(typed=True)),
+        ("typed float32", dict(typed=True, float32=True)),
+        ("typed, joined", dict(typed=True, dimension_ttl=None)),
+    ]
+    for label, options in runs:
+        dp = DataPool(instance=instance, verbose=False, **options)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = dp.signal.get(source_name=source_name)
+            best = min(best, time.perf_counter() - start)
+        size = data.memory_usage(deep=True).sum() / 2**20
+        print(f"{label:<15} {len(data):>10} rows {best:8.2f} s {size:10.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
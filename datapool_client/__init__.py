@@ -3,7 +3,11 @@ import pathlib
 CONFIG_PATH = pathlib.Path.home() / ".datapoolaccess"
 
 from datapool_client.api.api import DataPool
+from datapool_client.api.async_api import AsyncDataPool
 from datapool_client.api.plotter import Plot
 from datapool_client.api.toolbox import ToolBox
+from datapool_client.core.cache import SignalCache
 from datapool_client.core.config import set_defaults
+from datapool_client.core.decimation import decimate
 from datapool_client.core.formatting import format_meta_data, reshape
+from datapool_client.core.pool import configure_pool
@@ -1,3 +1,4 @@
+from datapool_client.api.batch import Batch
 from datapool_client.core.abstractions import (BinaryData,
                                                DataPoolBaseDatabase, LabResult,
                                                MetaActionType, MetaData,
@@ -9,9 +10,36 @@ from datapool_client.core.abstractions import (BinaryData,
                                                Source, SourceType,
                                                SpecialValueDefinition,
                                                Variable)
+from datapool_client.core.cache import SignalCache
+from datapool_client.core.dimensions import Dimensions
+from datapool_client.core.rollups import Rollups
 
 
 class DataPool(DataPoolBaseDatabase):
+    # attribute name -> table class of the table accessors
+    _TABLES = {
+        "variable": Variable,
+        "signal": Signal,
+        "site": Site,
+        "site_field": SiteField,
+        "site_field_value": SiteFieldValues,
+        "source": Source,
+        "source_type": SourceType,
+        "special_value_definition": SpecialValueDefinition,
+        "quality": Quality,
+        "person": Person,
+        "project": Project,
+        "meta_data_history": MetaDataHistory,
+        "meta_flag": MetaFlag,
+        "meta_data": MetaData,
+        "meta_log_type": MetaLogType,
+        "meta_action_type": MetaActionType,
+        "binary_data": BinaryData,
+        "lab_result": LabResult,
+        "picture": Picture,
+        "meta_picture": MetaPicture,
+    }
+
     def __init__(
         self,
         host=None,
@@ -22,7 +50,27 @@ class DataPool(DataPoolBaseDatabase):
         instance=None,
         to_replace={},
         verbose=True,
+        copy_format="csv",
+        stream_buffer_size=None,
+        typed=False,
+        float32=False,
+        cache=None,
+        dimension_ttl=300,
+        rollup_ttl=300,
     ):
+        """
+        cache=<directory> or cache=SignalCache(<directory>, max_bytes=...) keeps the results
+        of signal.get for single sources and variables on disk, see SignalCache.
+
+        dimension_ttl=<seconds> is the time after which the names and ids of variables,
+        sources, sites and source types are reloaded. Signal queries filter on these ids
+        and the names are added to the results locally. dimension_ttl=None joins the
+        names in the database instead.
+
+        rollup_ttl=<seconds> is the time after which it is reloaded which rollups exist and
+        up to where they are complete (see ToolBox.create_rollups), resampled signal queries
+        read the complete buckets from them. rollup_ttl=None always reads the signals.
+        """
         conn_details = dict(
             host=host,
             port=port,
@@ -32,27 +80,83 @@ class DataPool(DataPoolBaseDatabase):
             instance=instance,
             to_replace=to_replace,
             verbose=verbose,
+            copy_format=copy_format,
+            stream_buffer_size=stream_buffer_size,
+            typed=typed,
+            float32=float32,
         )
         super().__init__(**conn_details)
-        self.variable = Variable(**conn_details, check=False)
-        self.signal = Signal(**conn_details, check=False)
-        self.site = Site(**conn_details, check=False)
-        self.site_field = SiteField(**conn_details, check=False)
-        self.site_field_value = SiteFieldValues(**conn_details, check=False)
-        self.source = Source(**conn_details, check=False)
-        self.source_type = SourceType(**conn_details, check=False)
-        self.special_value_definition = SpecialValueDefinition(
-            **conn_details, check=False
+
+        # the tables are created on first access, see __getattr__, with the connection
+        # details resolved above instead of reading the config again
+        self._table_arguments = dict(
+            conn_details,
+            instance=None,
+            check=False,
+            **{
+                key: self._connection_details[key]
+                for key in ["host", "port", "database", "user", "password"]
+            },
         )
-        self.quality = Quality(**conn_details, check=False)
-        self.person = Person(**conn_details, check=False)
-        self.project = Project(**conn_details, check=False)
-        self.meta_data_history = MetaDataHistory(**conn_details, check=False)
-        self.meta_flag = MetaFlag(**conn_details, check=False)
-        self.meta_data = MetaData(**conn_details, check=False)
-        self.meta_log_type = MetaLogType(**conn_details, check=False)
-        self.meta_action_type = MetaActionType(**conn_details, check=False)
-        self.binary_data = BinaryData(**conn_details, check=False)
-        self.lab_result = LabResult(**conn_details, check=False)
-        self.picture = Picture(**conn_details, check=False)
-        self.meta_picture = MetaPicture(**conn_details, check=False)
+
+        if cache is not None and not isinstance(cache, SignalCache):
+            cache = SignalCache(cache)
+        self._cache = cache
+
+        self._dimensions = None
+        if dimension_ttl is not None:
+            self._dimensions = Dimensions(
+                lambda query: self._query(query, to_dataframe=False)["data"],
+                ttl=dimension_ttl,
+            )
+
+        self._rollups = None
+        if rollup_ttl is not None:
+            self._rollups = Rollups(
+                lambda query: self._query(query, to_dataframe=False)["data"],
+                ttl=rollup_ttl,
+            )
+
+    def __getattr__(self, name):
+        # only called if the attribute is missing, i.e. the table has not been created yet
+        if name not in self._TABLES or "_table_arguments" not in self.__dict__:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+
+        table = self._TABLES[name](**self._table_arguments)
+        if name == "signal":
+            table.cache = self._cache
+            table.rollups = self._rollups
+        if name in ("signal", "source"):
+            table.dimensions = self._dimensions
+        setattr(self, name, table)
+        return table
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._TABLES))
+
+    def batch(self, max_queries=100):
+        """
+        Description
+        -----------
+
+        Collects table calls within a `with` block and runs their queries together over
+        a single connection when the block is left. Saves a round trip per call when
+        many small queries are run, e.g. the range of hundreds of sources.
+
+        Parameters
+        ----------
+        max_queries:    int, the number of queries sent in a single statement
+
+        Return
+        ------
+        Batch, with the table accessors of the DataPool, whose calls return futures
+
+        Example
+        -------
+        with dp.batch() as batch:
+            ranges = [batch.source.get_range(name) for name in source_names]
+        ranges = [future.result() for future in ranges]
+        """
+        return Batch(self, max_queries)
@@ -0,0 +1,157 @@
+import asyncio as _asyncio
+import functools as _functools
+import inspect as _inspect
+import threading as _threading
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+
+from datapool_client.api.api import DataPool
+
+_EXHAUSTED = object()
+
+
+class AsyncDataPool:
+    """Awaitable counterpart of DataPool for asyncio applications.
+
+    The table accessors mirror those of DataPool, but their methods have to be
+    awaited and their properties are awaitable:
+
+        adp = AsyncDataPool()
+        ranges = await asyncio.gather(
+            *(adp.source.get_range(name) for name in source_names)
+        )
+        rows = await adp.signal.rows
+
+    psycopg2 cannot COPY in asynchronous mode, so the queries run on a pool of at
+    most `max_workers` threads, each with its own DataPool on the shared connection
+    pool. At most `max_workers` queries are running at once, further calls wait
+    without blocking the event loop. Generators like `signal.iter_chunks` become
+    asynchronous generators.
+    """
+
+    def __init__(
+        self,
+        host=None,
+        port=None,
+        database=None,
+        user=None,
+        password=None,
+        instance=None,
+        to_replace={},
+        copy_format="csv",
+        stream_buffer_size=None,
+        max_workers=10,
+    ):
+        self._connection_details = dict(
+            host=host,
+            port=port,
+            database=database,
+            user=user,
+            password=password,
+            instance=instance,
+            to_replace=to_replace,
+            copy_format=copy_format,
+            stream_buffer_size=stream_buffer_size,
+        )
+        self._executor = _ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="datapool"
+        )
+        self._local = _threading.local()
+
+        for name, table in DataPool._TABLES.items():
+            setattr(self, name, _AsyncTable(self, name, table))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _data_pool(self):
+        """The DataPool of the current worker thread."""
+        data_pool = getattr(self._local, "data_pool", None)
+        if data_pool is None:
+            data_pool = self._local.data_pool = DataPool(
+                **self._connection_details, verbose=False
+            )
+        return data_pool
+
+    async def _run(self, function, *args, **kwargs):
+        loop = _asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, _functools.partial(function, *args, **kwargs)
+        )
+
+    async def _iterate(self, table_name, method_name, *args, **kwargs):
+        # a DataPool of its own, as the generator resumes on changing worker threads
+        data_pool = await self._run(DataPool, **self._connection_details, verbose=False)
+        generator = getattr(getattr(data_pool, table_name), method_name)(
+            *args, **kwargs
+        )
+        try:
+            while True:
+                item = await self._run(next, generator, _EXHAUSTED)
+                if item is _EXHAUSTED:
+                    return
+                yield item
+        finally:
+            await self._run(generator.close)
+
+    async def query(
+        self, query: str, vars=None, show_query=False, allow_modifications=False
+    ):
+        """See DataPool.query"""
+        return await self._run(
+            lambda: self._data_pool().query(
+                query, vars, show_query, allow_modifications
+            )
+        )
+
+    async def query_df(self, query: str, show_query=False, allow_modifications=False):
+        """See DataPool.query_df"""
+        return await self._run(
+            lambda: self._data_pool().query_df(query, show_query, allow_modifications)
+        )
+
+    async def close(self):
+        """Waits for the running queries and stops the worker threads."""
+        loop = _asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+
+
+class _AsyncTable:
+    def __init__(self, async_data_pool, name, table):
+        self._async_data_pool = async_data_pool
+        self._name = name
+        self._table = table
+
+    def __repr__(self):
+        return f"<async {self._table.__name__} accessor>"
+
+    def _table_of_thread(self):
+        return getattr(self._async_data_pool._data_pool(), self._name)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        attribute = getattr(self._table, name)
+        adp = self._async_data_pool
+
+        if isinstance(attribute, property):
+            return adp._run(lambda: getattr(self._table_of_thread(), name))
+
+        if _inspect.isgeneratorfunction(attribute):
+
+            @_functools.wraps(attribute)
+            def iterate(*args, **kwargs):
+                return adp._iterate(self._name, name, *args, **kwargs)
+
+            return iterate
+
+        @_functools.wraps(attribute)
+        async def run(*args, **kwargs):
+            return await adp._run(
+                lambda: getattr(self._table_of_thread(), name)(*args, **kwargs)
+            )
+
+        return run
@@ -0,0 +1,167 @@
+import copy as _copy
+import inspect as _inspect
+from concurrent.futures import Future as _Future
+
+from datapool_client.core.utilities import clean_query_string
+
+
+class _Recorded(BaseException):
+    """Stops a table method at a query that is run with the other queries of a batch.
+
+    A BaseException, so that the `except Exception` of the table methods let it pass.
+    """
+
+
+class Batch:
+    """Collects table calls and runs their queries together over a single connection.
+
+    Created by DataPool.batch, the table accessors mirror those of DataPool, but their
+    methods and properties return futures which are resolved when the `with` block is
+    left:
+
+        with dp.batch() as batch:
+            ranges = {name: batch.source.get_range(name) for name in source_names}
+        ranges = {name: future.result() for name, future in ranges.items()}
+
+    The dataframe queries of up to `max_queries` calls are sent as a single statement,
+    which saves a round trip per call. Every call is run up to its next query, the
+    queries are run together and the calls are continued with their results, so calls
+    running several queries take several round trips and the results are the same as
+    those of the direct calls. Errors of a call are raised by the `result` of its
+    future. Generators like `signal.iter_chunks` can not be batched.
+    """
+
+    def __init__(self, data_pool, max_queries=100):
+        self._data_pool = data_pool
+        self.max_queries = max_queries
+        self._calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.run()
+        else:
+            for call in self._calls:
+                call.future.cancel()
+            self._calls = []
+
+    def __getattr__(self, name):
+        if name not in self._data_pool._TABLES:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        table = _BatchTable(self, getattr(self._data_pool, name))
+        setattr(self, name, table)
+        return table
+
+    def _add(self, table, name, args, kwargs):
+        call = _Call(table, name, args, kwargs)
+        self._calls.append(call)
+        return call.future
+
+    def run(self):
+        """Runs the calls collected so far, the `with` block does this when it is left."""
+        pending, self._calls = self._calls, []
+        for call in pending:
+            call.future.set_running_or_notify_cancel()
+
+        while pending:
+            pending = [call for call in pending if not call.advance()]
+            waiting = []
+            for start in range(0, len(pending), self.max_queries):
+                calls = pending[start : start + self.max_queries]
+                try:
+                    results = self._data_pool._query_batch(
+                        [call.query for call in calls]
+                    )
+                except Exception as e:
+                    for call in calls:
+                        call.future.set_exception(e)
+                    continue
+                for call, result in zip(calls, results):
+                    call.results.append(result)
+                waiting.extend(calls)
+            pending = waiting
+
+
+class _BatchTable:
+    def __init__(self, batch, table):
+        self._batch = batch
+        self._table = table
+
+    def __repr__(self):
+        return f"<batched {type(self._table).__name__} accessor>"
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        attribute = getattr(type(self._table), name)
+        if isinstance(attribute, property):
+            return self._batch._add(self._table, name, None, None)
+
+        if _inspect.isgeneratorfunction(attribute):
+            raise ValueError(f"{name} is a generator and can not be batched")
+
+        def add(*args, **kwargs):
+            return self._batch._add(self._table, name, args, kwargs)
+
+        add.__name__ = name
+        add.__doc__ = attribute.__doc__
+        return add
+
+
+class _Call:
+    """A table method call, run once per query with the results fetched so far."""
+
+    def __init__(self, table, name, args, kwargs):
+        self.table = table
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+        self.results = []
+        self.query = None
+        self.future = _Future()
+
+    def advance(self):
+        """Runs the call up to its next query, returns True once it is done."""
+        fetched = iter(self.results)
+
+        def query(
+            query_str,
+            vrs=None,
+            to_dataframe=True,
+            show_query=False,
+            allow_modifications=False,
+            columns=(),
+        ):
+            result = next(fetched, _Recorded)
+            if result is not _Recorded:
+                return result
+
+            self.query = (
+                clean_query_string(query_str, table._to_replace_in_query),
+                vrs,
+                to_dataframe,
+                show_query,
+                allow_modifications,
+                columns,
+            )
+            raise _Recorded()
+
+        table = _copy.copy(self.table)
+        table._query = query
+        try:
+            if self.args is None:
+                result = getattr(table, self.name)
+            else:
+                result = getattr(table, self.name)(*self.args, **self.kwargs)
+        except _Recorded:
+            return False
+        except Exception as e:
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(result)
+        return True
@@ -1,15 +1,83 @@
-import cufflinks as _cf
+import html as _html
+import os as _os
+import re as _re
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+
 import pandas as pd
-import plotly as _plotly
-from matplotlib import pyplot as _plt
 
 from datapool_client.api.api import DataPool
+from datapool_client.core.column_map import COLUMN_MAP
+from datapool_client.core.decimation import decimate
 from datapool_client.core.formatting import reshape
-from datapool_client.core.plots import generate_meta_plot
-from datapool_client.core.utilities import \
-    determine_additional_meta_info_columns_of_meta_data_history
-
-_cf.go_offline()
+from datapool_client.core.plots import (generate_availability_plot,
+                                        generate_meta_plot)
+from datapool_client.core.utilities import (
+    determine_additional_meta_info_columns_of_meta_data_history, name_list)
+
+# cufflinks is switched to offline mode on the first dynamic plot
+_cufflinks_offline = False
+
+# plot colors of the meta data log types
+META_COLORS = {
+    "source_installation": "#3a86ff",
+    "source_deinstallation": "#3a86ff",
+    "source_maintenance": "#8338ec",
+    "operational_malfunction": "#e5383b",
+    "miscellaneous": "#ffbe0b",
+}
+
+INDEX_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<h1>{title}</h1>
+<ul>
+{entries}
+</ul>
+</body>
+</html>
+"""
+
+
+def _prepare_meta_data(meta_data):
+    """Parses the timeframes of the meta data, returns its additional info columns."""
+    meta_data["start"] = pd.to_datetime(meta_data["start"])
+    meta_data["end"] = pd.to_datetime(meta_data["end"])
+    return determine_additional_meta_info_columns_of_meta_data_history(
+        meta_data.columns
+    )
+
+
+def _render_report(path, data, meta_data, plot_kwargs):
+    """Writes the meta plot of a report, run in a process of the pool of write_reports."""
+    data = reshape(data)
+    if meta_data.empty:
+        # a report shows the signals without meta data as well
+        meta_data = pd.DataFrame(columns=COLUMN_MAP["meta_data_history_get"])
+    additional_meta_columns = _prepare_meta_data(meta_data)
+    fig = generate_meta_plot(
+        data, meta_data, additional_meta_columns, inline=True, **plot_kwargs
+    )
+    # the page refers to the plotly.min.js written once by write_reports
+    fig.write_html(path, include_plotlyjs="directory", full_html=True)
+    return path
+
+
+def _file_name(source_name):
+    """The source name with the characters that are unsafe in file names replaced."""
+    return _re.sub(r"[^\w.-]", "_", source_name)
+
+
+def _import_cufflinks():
+    """Imports cufflinks on first use, it takes long to import."""
+    global _cufflinks_offline
+    import cufflinks as _cf
+
+    if not _cufflinks_offline:
+        _cf.go_offline()
+        _cufflinks_offline = True
+    return _cf
 
 
 class Plot:
@@ -27,6 +95,8 @@ class Plot:
         inline=False,
         filename="plot.html",
         show_query=False,
+        width=None,
+        max_points=None,
         **kw_plot_args,
     ):
         """
@@ -41,6 +111,10 @@ class Plot:
         inline:               bool, return the figure so you can open it in your jupyter notebook
         filename:             str, filename of plot.html if inline is False
         show_query:           bool, specifying whether to print the query
+        width:                int, the width of the plot in pixels, if given only the first, last, min and max
+                              signal per pixel and variable are fetched (see Signal.get_m4)
+        max_points:           int, if given the fetched signals are decimated to about this many points per
+                              variable before plotting (see decimate), the full data is returned
         **kw_plot_args:       key word arguments that will be passed down to plot function. If plot_dynamic=True
                               keyword arguments will be passed to cufflinks (.iplot method) otherwise the arguments
                               will be passed matplotlib/pandas' (.plot method)
@@ -105,7 +179,8 @@ class Plot:
 
         """
 
-        df = self.__dp.signal.get(
+        df = self.__get_signals(
+            width,
             source_name=source_name,
             variable_name=variable_name,
             start=start,
@@ -114,9 +189,19 @@ class Plot:
         )
 
         df_reshaped = reshape(df)
+        plotted = df_reshaped
+        if max_points is not None:
+            plotted = decimate(df_reshaped, max_points)
 
         if plot_dynamic:
-            fig = df_reshaped.iplot(asFigure=True, **kw_plot_args)
+            import plotly as _plotly
+
+            # cufflinks adds the iplot method to the dataframe
+            _import_cufflinks()
+            fig = plotted.iplot(asFigure=True, **kw_plot_args)
+            if width is not None:
+                # the variables have signals at different timestamps
+                fig.update_traces(connectgaps=True)
 
             if inline:
                 return df_reshaped, fig
@@ -124,11 +209,29 @@ class Plot:
                 _plotly.offline.plot(fig, auto_open=auto_open, filename=filename)
 
         else:
-            df_reshaped.plot(**kw_plot_args)
+            from matplotlib import pyplot as _plt
+
+            if width is not None:
+                # the variables have signals at different timestamps
+                connected = plotted.set_axis(pd.to_datetime(plotted.index))
+                connected.interpolate(method="time", limit_area="inside").plot(
+                    **kw_plot_args
+                )
+            else:
+                plotted.plot(**kw_plot_args)
             _plt.show()
 
         return df_reshaped
 
+    def __get_signals(self, width, **kwargs):
+        """The signals to plot, only those of M4 if `width` is given."""
+        if width is None:
+            return self.__dp.signal.get(**kwargs)
+        # a series per variable, as in the reshaped data
+        return self.__dp.signal.get_m4(
+            width, columns=["timestamp", "value", "variable"], **kwargs
+        )
+
     def plot_signal_with_meta(
         self,
         *,
@@ -139,19 +242,15 @@ class Plot:
         end=None,
         to_dataframe=True,
         show_query=False,
-        color_encoding={
-            "source_installation": "#3a86ff",
-            "source_deinstallation": "#3a86ff",
-            "source_maintenance": "#8338ec",
-            "operational_malfunction": "#e5383b",
-            "miscellaneous": "#ffbe0b",
-        },
+        color_encoding=META_COLORS,
         mark_via_key_word=None,
         minimal_meta_info_with_minutes=10,
         plot_title="Signal Meta Plot",
         filename="meta_plot.html",
         auto_open=True,
         inline=False,
+        width=None,
+        max_points=None,
     ):
         """Arguments must be provided with keywords!
 
@@ -172,6 +271,10 @@ class Plot:
         filename:                           Str, filename of plot.html if inline is False
         auto_open:                          bool, open plot in browser automatically if inline if False
         inline:                             bool, return the figure so you can open it in your jupyter notebook
+        width:                              Int, the width of the plot in pixels, if given only the first, last, min
+                                                 and max signal per pixel and variable are fetched (see Signal.get_m4)
+        max_points:                         Int, if given the signals are decimated to about this many points per
+                                                 variable before plotting (see decimate)
 
         Return
         ------
@@ -196,15 +299,26 @@ class Plot:
                 "You must provide at least one of the two: source_name, site_name."
             )
 
-        data = self.__dp.signal.get(
-            source_name=source_name,
-            site_name=site_name,
-            variable_name=variable_name,
-            start=start,
-            end=end,
-            to_dataframe=to_dataframe,
-            show_query=show_query,
-        )
+        if width is None:
+            data = self.__dp.signal.get(
+                source_name=source_name,
+                site_name=site_name,
+                variable_name=variable_name,
+                start=start,
+                end=end,
+                to_dataframe=to_dataframe,
+                show_query=show_query,
+            )
+        else:
+            data = self.__get_signals(
+                width,
+                source_name=source_name,
+                site_name=site_name,
+                variable_name=variable_name,
+                start=start,
+                end=end,
+                show_query=show_query,
+            )
         meta_data = self.__dp.meta_data_history.get(
             source_name=source_name,
             site_name=site_name,
@@ -225,14 +339,7 @@ class Plot:
             return data, meta_data
 
         data = reshape(data)
-        additional_meta_columns = (
-            determine_additional_meta_info_columns_of_meta_data_history(
-                meta_data.columns
-            )
-        )
-
-        meta_data["start"] = pd.to_datetime(meta_data["start"])
-        meta_data["end"] = pd.to_datetime(meta_data["end"])
+        additional_meta_columns = _prepare_meta_data(meta_data)
 
         fig = generate_meta_plot(
             data,
@@ -245,8 +352,217 @@ class Plot:
             auto_open=auto_open,
             inline=inline,
             mark_via_key_word=mark_via_key_word,
+            connect_gaps=width is not None,
+            max_points=max_points,
         )
         if inline:
             return data, meta_data, fig
         else:
             return data, meta_data
+
+    def plot_availability(
+        self,
+        sources,
+        start="1900-01-01 00:00:00",
+        end=None,
+        bucket="1d",
+        plot_title="Data Availability",
+        filename="availability.html",
+        auto_open=True,
+        inline=False,
+        show_query=False,
+    ):
+        """
+        Parameters
+        ----------
+        sources:              str | list, of source name(s)
+        start:                str, specifying a datetime ideally in the format yyyy-mm-dd HH:MM:SS
+        end:                  str, specifying a datetime ideally in the format yyyy-mm-dd HH:MM:SS
+        bucket:               str, the width of the time buckets, e.g. "1h", "1d" or "7d"
+        plot_title:           str, title for plot
+        filename:             str, filename of plot.html if inline is False
+        auto_open:            bool, open plot in browser automatically if inline if False
+        inline:               bool, return the figure so you can open it in your jupyter notebook
+        show_query:           bool, specifying whether to print the query
+
+        Return
+        ------
+        counts: pandas.DataFrame of the number of signals per source (rows) and bucket (columns),
+        fig: plotly.Figure if inline=True
+
+        Counts the signals per source and time bucket in the database (see Signal.resample),
+        reading the rollups for whole hours or days if they exist (see ToolBox.create_rollups),
+        and plots a heatmap of the counts.
+
+        Example
+        -------
+        from datapool_client import Plot
+
+        dp_plot = Plot() # this only works when a default connection has been set!
+        counts = dp_plot.plot_availability(
+            ["bn_r03_rub_morg", "bt_dl927_164_luppmenweg"], start="2020-01-01", end="2024-12-31"
+        )
+        """
+
+        sources = name_list(sources)
+        signals = self.__dp.signal.get(
+            source_name=sources,
+            start=start,
+            end=end,
+            columns=["timestamp", "source", "value"],
+            resample=bucket,
+            agg="count",
+            show_query=show_query,
+        )
+        signals["timestamp"] = pd.to_datetime(signals["timestamp"])
+        counts = signals.pivot_table(
+            index="source",
+            columns="timestamp",
+            values="value",
+            aggfunc="sum",
+            observed=True,
+        )
+        # sources and buckets without signals count as 0
+        buckets = []
+        if not signals.empty:
+            buckets = pd.date_range(
+                signals["timestamp"].min(),
+                signals["timestamp"].max(),
+                freq=pd.Timedelta(bucket),
+            )
+        counts = counts.reindex(index=sources, columns=buckets, fill_value=0)
+        counts = counts.fillna(0).astype("int64")
+        counts.index.name = "source"
+        counts.columns.name = "timestamp"
+
+        fig = generate_availability_plot(
+            counts,
+            plot_title=plot_title,
+            filename=filename,
+            auto_open=auto_open,
+            inline=inline,
+        )
+        if inline:
+            return counts, fig
+        else:
+            return counts
+
+    def write_reports(
+        self,
+        source_names,
+        directory,
+        *,
+        variable_name=None,
+        start="1900-01-01 00:00:00",
+        end=None,
+        width=None,
+        max_points=None,
+        color_encoding=META_COLORS,
+        minimal_meta_info_with_minutes=10,
+        title="Signal Meta Reports",
+        fetch_workers=8,
+        render_processes=None,
+    ):
+        """Arguments but `source_names` and `directory` must be provided with keywords!
+
+        Writes the plot of `plot_signal_with_meta` of every source to `directory`, with an
+        index.html linking them. The signals and meta data of several sources are fetched
+        at once by `fetch_workers` threads and the plots are rendered by a pool of
+        `render_processes` processes while the fetching goes on. The pages share a single
+        plotly.min.js in `directory` instead of embedding a copy each.
+
+        Parameters
+        ----------
+        source_names:                       list of str, of the source names, a plot per source
+        directory:                          str, the directory to write the plots to, created if missing
+        variable_name:                      str | list, of variable name(s), all variables if None
+        start:                              str, specifying a datetime ideally in the format yyyy-mm-dd HH:MM:SS
+        end:                                str, specifying a datetime ideally in the format yyyy-mm-dd HH:MM:SS
+        width:                              int, if given only the M4 signals of a plot this wide are fetched
+                                                 (see plot_signal_with_meta)
+        max_points:                         int, if given the signals are decimated to about this many points per
+                                                 variable before plotting (see decimate)
+        color_encoding:                     dict, specifying plot colors of log types
+        minimal_meta_info_with_minutes:     int, setting the minimal width of meta data area plots in minutes
+        title:                              str, title of the index page
+        fetch_workers:                      int, number of sources fetched at once
+        render_processes:                   int, number of processes rendering plots, the number of CPUs if None
+
+        Return
+        ------
+        dict of source name -> path of its plot, None for sources without signals
+
+        Example
+        -------
+        from datapool_client import Plot
+
+        dp_plot = Plot() # this only works when a default connection has been set!
+        dp_plot.write_reports(
+            ["bn_r03_rub_morg", "bt_dl927_164_luppmenweg"],
+            "reports/2024-w01",
+            start="2024-01-01",
+            end="2024-01-08",
+            width=1600,
+        )
+        """
+        import plotly.offline as _plotly_offline
+
+        _os.makedirs(directory, exist_ok=True)
+        asset = _os.path.join(directory, "plotly.min.js")
+        with open(asset, "w", encoding="utf-8") as f:
+            f.write(_plotly_offline.get_plotlyjs())
+
+        plot_kwargs = dict(
+            color_encoding=color_encoding,
+            minimal_meta_info_with_minutes=minimal_meta_info_with_minutes,
+            connect_gaps=width is not None,
+            max_points=max_points,
+        )
+
+        def fetch(source_name):
+            data = self.__get_signals(
+                width,
+                source_name=source_name,
+                variable_name=variable_name,
+                start=start,
+                end=end,
+            )
+            meta_data = self.__dp.meta_data_history.get(
+                source_name=source_name, start=start, end=end
+            )
+            return data, meta_data
+
+        paths = {}
+        with _ThreadPoolExecutor(max_workers=fetch_workers) as fetcher:
+            with _ProcessPoolExecutor(max_workers=render_processes) as renderer:
+                rendered = {}
+                fetched = {name: fetcher.submit(fetch, name) for name in source_names}
+                # rendering starts while later sources are still fetched
+                for name, future in fetched.items():
+                    data, meta_data = future.result()
+                    if data.empty:
+                        paths[name] = None
+                        continue
+                    path = _os.path.join(directory, f"{_file_name(name)}.html")
+                    rendered[name] = renderer.submit(
+                        _render_report,
+                        path,
+                        data,
+                        meta_data,
+                        dict(plot_kwargs, plot_title=name),
+                    )
+                for name, future in rendered.items():
+                    paths[name] = future.result()
+
+        entries = []
+        for name in source_names:
+            label = _html.escape(name)
+            if paths[name] is None:
+                entries.append(f"<li>{label}: no signals</li>")
+            else:
+                link = _html.escape(_os.path.basename(paths[name]))
+                entries.append(f'<li><a href="{link}">{label}</a></li>')
+        index = INDEX_PAGE.format(title=_html.escape(title), entries="\n".join(entries))
+        with open(_os.path.join(directory, "index.html"), "w", encoding="utf-8") as f:
+            f.write(index)
+        return {name: paths[name] for name in source_names}
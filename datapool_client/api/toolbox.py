@@ -1,7 +1,12 @@
 from datapool_client.core.abstractions import Connector
+from datapool_client.core.rollups import (CREATE_REGISTRY, CREATE_ROLLUP,
+                                          REFRESH_ROLLUP, ROLLUP_WIDTHS,
+                                          rollup_table)
 
 
 class ToolBox(Connector):
+    _prepare = True
+
     def value_in_column_of_table(self, table, column, value, show_query=False):
         """
         Parameters
@@ -15,10 +20,11 @@ class ToolBox(Connector):
         ------
         bool
         """
-        query = (
-            f"SELECT exists (SELECT 1 FROM {table} WHERE {column} = '{value}' LIMIT 1);"
+        # identifiers can not be bound as parameters
+        query = f"SELECT exists (SELECT 1 FROM {table} WHERE {column} = %s LIMIT 1);"
+        result = self._query(
+            query, (value,), to_dataframe=False, show_query=show_query
         )
-        result = self._query(query, to_dataframe=False, show_query=show_query)
         return result["data"][0][0]
 
     def count_values_in_db_group_by_source_and_variable(
@@ -63,3 +69,77 @@ class ToolBox(Connector):
         order by date_trunc desc;
         """
         return self._query(query, to_dataframe=to_dataframe, show_query=show_query)
+
+    def create_rollups(self, names=tuple(ROLLUP_WIDTHS), show_query=False):
+        """
+        Creates the rollup tables holding the count, min, max and sum of the values per
+        source, variable, site and hour or day, which resampled signal queries read
+        instead of the signal table, see `refresh_rollups`. Needs the privilege to create
+        tables, existing rollups are kept.
+
+        Parameters
+        ----------
+        names:          list of str, the rollups to create out of "1h" and "1d"
+        show_query:     bool, specifying whether to print the queries
+
+        Example
+        -------
+        tb = ToolBox()
+        tb.create_rollups()
+        tb.refresh_rollups()
+        """
+        unknown = [name for name in names if name not in ROLLUP_WIDTHS]
+        if unknown:
+            raise ValueError(
+                f"names must be out of {', '.join(ROLLUP_WIDTHS)}, not {unknown}."
+            )
+
+        with self._connection() as con:
+            with con.cursor() as cur:
+                self.__execute(cur, CREATE_REGISTRY, None, show_query)
+                for name in names:
+                    self.__execute(
+                        cur,
+                        CREATE_ROLLUP.format(table=rollup_table(name)),
+                        dict(name=name, width=ROLLUP_WIDTHS[name]),
+                        show_query,
+                    )
+            con.commit()
+
+    def refresh_rollups(self, start=None, end=None, show_query=False):
+        """
+        Aggregates the signals added since the last refresh into the rollups, only
+        complete buckets are aggregated. Signals added to or corrected in buckets that
+        have already been aggregated are not noticed, re-aggregate them by passing the
+        `start` of the changes. Run it regularly, e.g. every night.
+
+        Parameters
+        ----------
+        start:          str, re-aggregates the buckets from the one holding start on
+        end:            str, the buckets up to the one holding end are aggregated, now if not given
+        show_query:     bool, specifying whether to print the queries
+
+        Return
+        ------
+        dict, name of the rollup -> start and end of the aggregated buckets
+        """
+        refreshed = {}
+        with self._connection() as con:
+            with con.cursor() as cur:
+                cur.execute("SELECT name FROM signal_rollup ORDER BY name;")
+                for (name,) in cur.fetchall():
+                    self.__execute(
+                        cur,
+                        REFRESH_ROLLUP.format(table=rollup_table(name)),
+                        dict(name=name, start=start, end=end),
+                        show_query,
+                    )
+                    refreshed[name] = cur.fetchone()
+            con.commit()
+        return refreshed
+
+    @staticmethod
+    def __execute(cur, query_str, vrs, show_query):
+        if show_query:
+            print(cur.mogrify(query_str, vrs).decode())
+        cur.execute(query_str, vrs)
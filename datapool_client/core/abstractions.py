@@ -1,26 +1,107 @@
+import csv as _csv
+import hashlib as _hashlib
+from collections import OrderedDict as _OrderedDict
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+from contextlib import contextmanager as _contextmanager
 from datetime import datetime as _datetime
 from datetime import datetime as _dt
+from io import BytesIO as _BytesIO
+from io import StringIO as _StringIO
 from tempfile import TemporaryFile as _TemporaryFile
 from textwrap import dedent
+from threading import Lock as _Lock
 from warnings import warn
+from weakref import WeakKeyDictionary as _WeakKeyDictionary
 
 import psycopg2 as _psycopg2
+from psycopg2 import extensions as _extensions
 from numpy import arange as _arange
 from numpy import array as _array
 from numpy import zeros as _zeros
 from pandas import DataFrame as _DataFrame
+from pandas import Timedelta as _Timedelta
+from pandas import Timestamp as _Timestamp
+from pandas import concat as _concat
 from pandas import merge as _merge
 from pandas import read_csv as _read_csv
 
-from datapool_client.core.column_map import COLUMN_MAP
-from datapool_client.core.formatting import (format_meta_data, reshape,
-                                             reshape_full_site_query)
+from datapool_client.core.binary_copy import (check_types, query_shape,
+                                              read_binary_copy)
+from datapool_client.core.column_map import (COLUMN_MAP, SIGNAL_AGGREGATES,
+                                             SIGNAL_COLUMN_EXPRESSIONS,
+                                             SIGNAL_COLUMN_IDS,
+                                             SIGNAL_COLUMN_TYPES)
+from datapool_client.core.errors import UnsupportedTypeError
+from datapool_client.core.formatting import (decode_columns, format_meta_data,
+                                             reshape, reshape_full_site_query)
+from datapool_client.core.pool import get_pool
+from datapool_client.core.query_builder import Join, Select
+from datapool_client.core.rollups import BUCKET_ORIGIN, ROLLUP_AGGREGATES
+from datapool_client.core.streaming import read_copy_streamed
 from datapool_client.core.utilities import (
-    choose_arguments_connection_arguments, clean_query_string, parse_dates,
-    replace_in_query)
+    choose_arguments_connection_arguments, clean_query_string, format_timestamp,
+    name_list, parse_dates, positional_parameters)
+
+
+COPY_FORMATS = ("csv", "binary")
+SIGNAL_RESULTS = ("names", "categorical", "normalized")
+
+# the tables signal queries may join, see Select
+SIGNAL_JOINS = [
+    Join("site", "INNER JOIN site ON signal.site_id = site.site_id"),
+    Join("variable", "INNER JOIN variable ON signal.variable_id = variable.variable_id"),
+    Join("source", "INNER JOIN source ON signal.source_id = source.source_id"),
+    Join(
+        "source_type",
+        "INNER JOIN source_type ON source.source_type_id = source_type.source_type_id",
+    ),
+    Join(
+        "signals_signal_quality_association",
+        "LEFT JOIN signals_signal_quality_association ON signals_signal_quality_association.signal_id = signal.signal_id",
+    ),
+    Join(
+        "signal_quality",
+        "LEFT JOIN signal_quality ON signals_signal_quality_association.signal_quality_id = signal_quality.signal_quality_id",
+    ),
+    Join(
+        "quality",
+        "LEFT JOIN quality ON quality.quality_id = signal_quality.quality_id",
+    ),
+]
+
+# start of the time bucket of a signal in resampled queries
+SIGNAL_BUCKET = (
+    f"date_bin(%(bucket)s::interval, signal.timestamp, TIMESTAMP '{BUCKET_ORIGIN}')"
+)
+
+# the first, last, min and max signal of a time bucket as [seconds since start, value]
+# and [value, seconds since start], postgres compares arrays element by element
+_M4_POINT = "extract(epoch FROM signal.timestamp - %(start)s::timestamp)::float8"
+M4_AGGREGATES = {
+    "m4_first": f"min(ARRAY[{_M4_POINT}, signal.value::float8])",
+    "m4_last": f"max(ARRAY[{_M4_POINT}, signal.value::float8])",
+    "m4_min": f"min(ARRAY[signal.value::float8, {_M4_POINT}])",
+    "m4_max": (
+        f"max(ARRAY[signal.value::float8, {_M4_POINT}]) "
+        "FILTER (WHERE signal.value IS NOT NULL)"
+    ),
+}
+
+# type oids and names of binary COPY results, keyed by database and query shape
+MAX_CACHED_DESCRIPTIONS = 256
+_DESCRIPTIONS = _OrderedDict()
+_DESCRIPTIONS_LOCK = _Lock()
+
+# names of the statements prepared on the pooled connections
+MAX_PREPARED_STATEMENTS = 256
+_PREPARED = _WeakKeyDictionary()
+_PREPARED_LOCK = _Lock()
 
 
 class Connector:
+    # whether raw queries are run as prepared statements, see __execute_prepared
+    _prepare = False
+
     def __init__(
         self,
         host=None,
@@ -32,6 +113,10 @@ class Connector:
         check=True,
         to_replace={},
         verbose=True,
+        copy_format="csv",
+        stream_buffer_size=None,
+        typed=False,
+        float32=False,
     ):
         """
         Please provide the connection details.
@@ -43,9 +128,30 @@ class Connector:
         database="mydatabasename"
         user="db_user"
         password="db_userpassword"
+
+        copy_format="binary" transfers dataframe results in postgres' binary COPY
+        format and decodes them with numpy, which is faster for large results.
+        Timestamps are then returned as datetime64 and REAL columns as float32.
+
+        stream_buffer_size=<bytes> parses csv results while they are arriving instead
+        of spooling them to a temporary file first. No more than about that many bytes
+        of the transfer are held in memory at once.
+
+        typed=True returns the timestamps of signals as datetime64 and their names (unit,
+        variable, source, ..., quality_flag) as categoricals instead of strings.
+        float32=True returns the values of signals as float32, the type they are stored as.
         """
 
+        if copy_format not in COPY_FORMATS:
+            raise ValueError(
+                f"copy_format must be one of {', '.join(COPY_FORMATS)}, not '{copy_format}'."
+            )
+
         self._verbose = verbose
+        self._copy_format = copy_format
+        self._stream_buffer_size = stream_buffer_size
+        self._typed = typed
+        self._float32 = float32
 
         self._to_replace_in_query = to_replace
         self._connection_details = choose_arguments_connection_arguments(
@@ -56,30 +162,33 @@ class Connector:
             password=password,
             instance=instance,
         )
+        self._pool = get_pool(self._connection_details)
 
-        if check:
-            self._check_connection()
+        # the connection is checked on the first query, see _connect
+        self._check_pending = check
 
         self.last_query = None
 
-    def _connect(self):
-        self._conn = _psycopg2.connect(
-            host=self._connection_details["host"],
-            port=self._connection_details["port"],
-            database=self._connection_details["database"],
-            user=self._connection_details["user"],
-            password=self._connection_details["password"],
-        )
-        self._cur = self._conn.cursor()
+    @_contextmanager
+    def _connection(self):
+        """A pooled connection, checked out for the current call only.
+
+        Connections are never stored on the instance, so that one instance can be
+        used by several threads at once.
+        """
+        if self._check_pending:
+            self._check_pending = False
+            self._check_connection()
 
-    def _close(self):
-        self._cur.close()
-        self._conn.close()
+        conn = self._pool.get_connection()
+        try:
+            yield conn
+        finally:
+            self._pool.put_connection(conn)
 
     def _check_connection(self):
         try:
-            self._connect()
-            self._close()
+            self._pool.put_connection(self._pool.get_connection())
             if self._verbose:
                 print("You are successfully connected to the database!")
 
@@ -101,47 +210,283 @@ class Connector:
 
         query_str = clean_query_string(query_str, self._to_replace_in_query)
 
-        self.last_query = query_str
-
-        if show_query:
-            print(query_str)
-
         if to_dataframe:
-            result = self.__query_dataframe(query_str[:-1])
+            result = self.__run(
+                self.__copy_bound_dataframe, query_str[:-1], vrs, show_query
+            )
             if columns:
                 result.columns = columns
 
             return result
 
         else:
-            return self.__query_raw(query_str, vrs, allow_modifications)
+            # a modification may already have been applied before the connection broke
+            return self.__run(
+                self.__query_raw,
+                query_str,
+                vrs,
+                allow_modifications,
+                show_query,
+                retry=not allow_modifications,
+            )
+
+    def __bind(self, cur, query_str, vrs, show_query):
+        """The query with its parameters bound client side, kept as last_query."""
+        if vrs is not None:
+            query_str = cur.mogrify(query_str, vrs).decode(
+                _extensions.encodings[cur.connection.encoding]
+            )
+        self.last_query = query_str
+        if show_query:
+            print(query_str)
+        return query_str
+
+    def __copy_bound_dataframe(self, cur, query, vrs, show_query):
+        # COPY can neither take parameters nor run prepared statements, the query
+        # with its placeholders is the shape of the bound query
+        return self.__copy_dataframe(
+            cur, self.__bind(cur, query, vrs, show_query), query
+        )
+
+    def __run(self, run, *args, retry=True):
+        """Calls run(cursor, *args) on a connection of its own.
+
+        With `retry` the call is repeated once on a new connection if the server has
+        dropped the pooled connection.
+        """
+        with self._connection() as conn:
+            try:
+                with conn.cursor() as cur:
+                    return run(cur, *args)
+            except Exception as e:
+                lost = conn.closed and isinstance(
+                    e, (_psycopg2.OperationalError, _psycopg2.InterfaceError)
+                )
+                if not conn.closed:
+                    conn.rollback()
+                if not (lost and retry):
+                    raise e
+
+        # the server dropped the pooled connection, most likely the other idle
+        # connections are gone as well (e.g. after a restart)
+        self._pool.close()
+        return self.__run(run, *args, retry=False)
+
+    def __copy_dataframe(self, cur, query, shape=None):
+        if self._copy_format == "binary":
+            try:
+                return self.__copy_binary(cur, query, shape)
+            except UnsupportedTypeError:
+                pass
+
+        copy_sql = "COPY ({query}) TO STDOUT WITH CSV {head}".format(
+            query=query, head="HEADER"
+        )
+        if self._stream_buffer_size:
+            return read_copy_streamed(
+                cur,
+                copy_sql,
+                lambda stream: _read_csv(stream, parse_dates=True),
+                self._stream_buffer_size,
+            )
+
+        with _TemporaryFile() as tmpfile:
+            cur.copy_expert(copy_sql, tmpfile)
+            tmpfile.seek(0)
+            return _read_csv(tmpfile, parse_dates=True)
+
+    def _query_parallel(self, queries, parallel, show_query=False, vrs=None):
+        """Runs dataframe queries concurrently, each on a connection of its own.
 
-    def __query_dataframe(self, query):
+        `vrs` holds the values of the placeholders of each query. All queries see the
+        same snapshot of the database, which is exported by a coordinating transaction
+        that stays open until all queries are done.
+        """
+        if vrs is None:
+            vrs = [None] * len(queries)
+
+        coordinator = self._pool.get_connection()
+        try:
+            with coordinator.cursor() as cur:
+                queries = [
+                    cur.mogrify(
+                        clean_query_string(query_str, self._to_replace_in_query)[:-1],
+                        query_vrs,
+                    ).decode(_extensions.encodings[coordinator.encoding])
+                    for query_str, query_vrs in zip(queries, vrs)
+                ]
+                self.last_query = ";\n".join(queries) + ";"
+                if show_query:
+                    print(self.last_query)
+
+                cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                cur.execute("SELECT pg_export_snapshot()")
+                (snapshot,) = cur.fetchone()
+
+            with _ThreadPoolExecutor(max_workers=parallel) as executor:
+                futures = [
+                    executor.submit(self.__query_in_snapshot, query, snapshot)
+                    for query in queries
+                ]
+                return [future.result() for future in futures]
+        finally:
+            self._pool.put_connection(coordinator)
+
+    def __query_in_snapshot(self, query, snapshot):
+        conn = self._pool.get_connection()
         try:
-            self._connect()
-            with _TemporaryFile() as tmpfile:
-                copy_sql = "COPY ({query}) TO STDOUT WITH CSV {head}".format(
-                    query=query, head="HEADER"
+            with conn.cursor() as cur:
+                cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                cur.execute("SET TRANSACTION SNAPSHOT %s", (snapshot,))
+                return self.__copy_dataframe(cur, query)
+        finally:
+            self._pool.put_connection(conn)
+
+    def _query_batch(self, queries):
+        """Runs queries recorded by a Batch over a single connection.
+
+        Dataframe queries are sent together in a single statement that returns the rows
+        of each as json arrays of the text of their columns. These are parsed like the
+        csv transfer, so the results match those of `_query`. Other queries are run one
+        after another.
+
+        Parameters
+        ----------
+        queries:    list of the arguments of `_query` (query_str, vrs, to_dataframe,
+                    show_query, allow_modifications, columns), with the query_str
+                    cleaned by clean_query_string
+
+        Return
+        ------
+        list of the results in the order of the queries
+        """
+
+        def run(cur):
+            results = [None] * len(queries)
+            names_of = {}
+            selects = []
+            for i, (query_str, vrs, to_dataframe, show_query, _, _) in enumerate(
+                queries
+            ):
+                if not to_dataframe:
+                    continue
+                query = self.__bind(cur, query_str[:-1], vrs, show_query)
+                _, (_, names), _ = self.__describe(cur, query, query_str[:-1])
+                names_of[i] = names
+                aliases = [f"column_{j}" for j in range(len(names))]
+                texts = ", ".join(f"{alias}::text" for alias in aliases)
+                selects.append(
+                    f"(SELECT json_agg(json_build_array({texts})) "
+                    f"FROM ({query}) AS batched({', '.join(aliases)}))"
                 )
-                self._cur.copy_expert(copy_sql, tmpfile)
-                tmpfile.seek(0)
-                return _read_csv(tmpfile, parse_dates=True)
-        except Exception as e:
-            self._conn.rollback()
-            self._close()
-            raise e
 
-    def __query_raw(self, query_str, vrs, allow_modifications):
+            if selects:
+                self.last_query = "SELECT " + ",\n".join(selects) + ";"
+                cur.execute(self.last_query)
+                rows = iter(cur.fetchone())
+
+            for i, (
+                query_str,
+                vrs,
+                to_dataframe,
+                show_query,
+                allow_modifications,
+                columns,
+            ) in enumerate(queries):
+                if to_dataframe:
+                    text = _StringIO()
+                    writer = _csv.writer(text)
+                    writer.writerow(names_of[i])
+                    writer.writerows(next(rows) or [])
+                    text.seek(0)
+                    results[i] = _read_csv(text, parse_dates=True)
+                    if columns:
+                        results[i].columns = columns
+                else:
+                    results[i] = self.__query_raw(
+                        cur, query_str, vrs, allow_modifications, show_query
+                    )
+            return results
+
+        return self.__run(run, retry=not any(query[4] for query in queries))
+
+    def __describe(self, cur, query, shape=None):
+        """Column type oids and names of the query, cached per query shape.
+
+        `shape` is the query before its parameters were bound, if it had any.
+        """
+        key = (
+            tuple(sorted(self._connection_details.items())),
+            query_shape(query if shape is None else shape),
+        )
+        with _DESCRIPTIONS_LOCK:
+            if key in _DESCRIPTIONS:
+                _DESCRIPTIONS.move_to_end(key)
+                return key, _DESCRIPTIONS[key], True
+
+        cur.execute(f"SELECT * FROM ({query}) AS described LIMIT 0")
+        description = (
+            [column.type_code for column in cur.description],
+            [column.name for column in cur.description],
+        )
+        with _DESCRIPTIONS_LOCK:
+            _DESCRIPTIONS[key] = description
+            while len(_DESCRIPTIONS) > MAX_CACHED_DESCRIPTIONS:
+                _DESCRIPTIONS.popitem(last=False)
+        return key, description, False
+
+    def __copy_binary(self, cur, query, shape=None):
+        # the result description is needed to decode the binary data
+        key, (type_oids, names), cached = self.__describe(cur, query, shape)
+        check_types(type_oids)
+
+        buffer = _BytesIO()
+        cur.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT binary)", buffer)
         try:
-            self._connect()
-            self._cur.execute(query_str, vrs)
-            if allow_modifications:
-                self._conn.commit()
-            return {"descripton": self._cur.description, "data": self._cur.fetchall()}
-        except Exception as e:
-            self._conn.rollback()
-            self._close()
-            raise e
+            return read_binary_copy(buffer.getbuffer(), type_oids, names)
+        except ValueError:
+            if not cached:
+                raise
+            # the schema has changed since the description was cached
+            with _DESCRIPTIONS_LOCK:
+                _DESCRIPTIONS.pop(key, None)
+            return self.__copy_binary(cur, query, shape)
+
+    def __query_raw(self, cur, query_str, vrs, allow_modifications, show_query=False):
+        self.__bind(cur, query_str, vrs, show_query)
+        if self._prepare:
+            self.__execute_prepared(cur, query_str, vrs)
+        else:
+            cur.execute(query_str, vrs)
+        if allow_modifications:
+            cur.connection.commit()
+        return {"descripton": cur.description, "data": cur.fetchall()}
+
+    @staticmethod
+    def __execute_prepared(cur, query_str, vrs):
+        """Executes the query as a statement prepared once per connection.
+
+        Postgres then parses the query only once per connection and reuses its plan
+        unless a plan for the actual parameters promises to be cheaper.
+        """
+        name = "datapool_" + _hashlib.sha1(query_str.encode()).hexdigest()[:24]
+        if vrs is not None:
+            query_str, vrs = positional_parameters(query_str, vrs)
+
+        with _PREPARED_LOCK:
+            prepared = _PREPARED.setdefault(cur.connection, set())
+        if name not in prepared:
+            if len(prepared) >= MAX_PREPARED_STATEMENTS:
+                cur.execute("DEALLOCATE ALL")
+                prepared.clear()
+            # prepared statements survive rollbacks, they are bound to the session
+            cur.execute(f"PREPARE {name} AS {query_str}")
+            prepared.add(name)
+
+        if vrs:
+            cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(vrs))})", vrs)
+        else:
+            cur.execute(f"EXECUTE {name}")
 
 
 class DataPoolBaseDatabase(Connector):
@@ -175,15 +520,17 @@ class DataPoolBaseDatabase(Connector):
 
 
 class DataPoolBaseTable(Connector):
+    _prepare = True
+
     def _columns(self, table: str):
-        query_str = f"SELECT COLUMN_NAME FROM information_schema.COLUMNS WHERE TABLE_NAME = '{table}';"
-        res = self._query(query_str, None, True, False, False, ["cols"])
+        query_str = "SELECT COLUMN_NAME FROM information_schema.COLUMNS WHERE TABLE_NAME = %s;"
+        res = self._query(query_str, (table,), True, False, False, ["cols"])
         return res.cols.tolist()
 
     def _rows(self, table: str):
         """Returns an estimate"""
-        query_str = f"SELECT reltuples::bigint FROM pg_catalog.pg_class WHERE relname = '{table}';"
-        res = self._query(query_str, None, False, False, False)
+        query_str = "SELECT reltuples::bigint FROM pg_catalog.pg_class WHERE relname = %s;"
+        res = self._query(query_str, (table,), False, False, False)
         return res["data"][0][0]
 
     def _all(self, table: str, to_dataframe=True, show_query=False):
@@ -225,11 +572,11 @@ class Variable(DataPoolBaseTable):
 
         """
         query_str = dedent(
-            f"""
+            """
             WITH variable_ids AS (
                 WITH source_ids AS (
                     WITH source_type_ids AS (
-                        SELECT source_type_id::integer FROM source_type WHERE source_type.name = '{source_type}'
+                        SELECT source_type_id::integer FROM source_type WHERE source_type.name = %s
                     )
                     SELECT source_id::integer FROM source WHERE source_type_id = 
                     ANY(ARRAY(SELECT source_type_id::integer FROM source_type_ids))
@@ -245,7 +592,7 @@ class Variable(DataPoolBaseTable):
 
         return self._query(
             query_str,
-            None,
+            (source_type,),
             to_dataframe,
             show_query,
             False,
@@ -377,10 +724,10 @@ class Site(DataPoolBaseTable):
         dp.site.from_source(source_name)
         """
         query_str = dedent(
-            f"""
+            """
             WITH site_ids AS (
                 WITH source_ids AS (
-                    SELECT source_id::integer FROM source WHERE source.name = '{source_name}'
+                    SELECT source_id::integer FROM source WHERE source.name = %s
                 )
                 SELECT DISTINCT site_id::integer FROM signal WHERE source_id = 
                 ANY(ARRAY(SELECT source_id::integer FROM source_ids))
@@ -391,7 +738,7 @@ class Site(DataPoolBaseTable):
         )
         return self._query(
             query_str,
-            None,
+            (source_name,),
             to_dataframe,
             show_query,
             False,
@@ -565,8 +912,8 @@ class MetaData(DataPoolBaseTable):
         """
         Parameters
         ----------
-        source_name:          str, with name of source
-        site_name:            str, with name of site
+        source_name:          str or list of str, with name(s) of source
+        site_name:            str or list of str, with name(s) of site
         format_data:          bool, format meta data -> convert additional info to columns
         to_dataframe:         bool, specifying whether the query output should be formatted as dataframe
         show_query:           bool, specifying whether to print the query
@@ -597,18 +944,21 @@ class MetaData(DataPoolBaseTable):
                     INNER JOIN site ON site.site_id = meta_data.site_id
                     WHERE
                     """
-        if source_name:
-            query_str += f""" source.name = '{source_name}'"""
+        vrs = []
+        if source_name is not None:
+            query_str += """ source.name = ANY(%s::text[])"""
+            vrs.append(name_list(source_name))
 
-        if source_name and site_name:
+        if source_name is not None and site_name is not None:
             query_str += " AND"
 
-        if site_name:
-            query_str += f""" site.name = '{site_name}'"""
+        if site_name is not None:
+            query_str += """ site.name = ANY(%s::text[])"""
+            vrs.append(name_list(site_name))
 
         res = self._query(
             dedent(query_str),
-            None,
+            vrs,
             to_dataframe,
             show_query,
             False,
@@ -683,8 +1033,8 @@ class MetaDataHistory(DataPoolBaseTable):
         """
         Parameters
         ----------
-        source_name:          str, with name of source
-        site_name:            str, with name of site
+        source_name:          str or list of str, with name(s) of source
+        site_name:            str or list of str, with name(s) of site
         start:                str, specifying a datetime ideally in the format yyyy-mm-dd HH:MM:SS
         end:                  str, specifying a datetime ideally in the format yyyy-mm-dd HH:MM:SS
         format_data:          bool, format meta data -> convert additional info to columns
@@ -706,7 +1056,7 @@ class MetaDataHistory(DataPoolBaseTable):
 
         st, en = parse_dates(start, end)
 
-        query_str = f"""
+        query_str = """
                     SELECT 
                         source.name,
                         site.name,
@@ -726,18 +1076,21 @@ class MetaDataHistory(DataPoolBaseTable):
                     INNER JOIN person ON person.person_id = meta_data_history.person_id
                     INNER JOIN source ON source.source_id = meta_data.source_id
                     INNER JOIN site ON site.site_id = meta_data.site_id
-                    WHERE meta_data_history.timestamp_start >= '{st}'
-                    AND meta_data_history.timestamp_end <= '{en}'
+                    WHERE meta_data_history.timestamp_start >= %s::timestamp
+                    AND meta_data_history.timestamp_end <= %s::timestamp
                     """
+        vrs = [st, en]
         if source_name is not None:
-            query_str += f"""AND source.name = '{source_name}'"""
+            query_str += """AND source.name = ANY(%s::text[])\n"""
+            vrs.append(name_list(source_name))
 
         if site_name is not None:
-            query_str += f"""AND site.name = '{site_name}'"""
+            query_str += """AND site.name = ANY(%s::text[])\n"""
+            vrs.append(name_list(site_name))
 
         res = self._query(
             dedent(query_str),
-            None,
+            vrs,
             to_dataframe,
             show_query,
             False,
@@ -782,6 +1135,9 @@ class Picture(DataPoolBaseTable):
 class Source(DataPoolBaseTable):
     __table_name = "source"
 
+    # Dimensions resolving names and ids, see DataPool(dimension_ttl=...)
+    dimensions = None
+
     @property
     def rows(self):
         return self._rows(self.__table_name)
@@ -811,9 +1167,9 @@ class Source(DataPoolBaseTable):
         dp.source.from_variable(variable_name="my_variable_name")
         """
         query_str = dedent(
-            f"""
+            """
             WITH variable_ids as (
-                SELECT variable_id::integer FROM variable WHERE variable.name = '{variable_name}'
+                SELECT variable_id::integer FROM variable WHERE variable.name = %s
             ), source_ids as (
                 SELECT DISTINCT source_id::integer FROM signal 
                 WHERE signal.variable_id IN (
@@ -828,7 +1184,7 @@ class Source(DataPoolBaseTable):
         )
         return self._query(
             query_str,
-            None,
+            (variable_name,),
             to_dataframe,
             show_query,
             False,
@@ -853,9 +1209,9 @@ class Source(DataPoolBaseTable):
         dp.project.from_project(source_name="my_project_name")
         """
         query_str = dedent(
-            f"""
+            """
             WITH project_ids as (
-                SELECT project_id::integer FROM project WHERE project.title = '{project_name}'
+                SELECT project_id::integer FROM project WHERE project.title = %s
             )
             SELECT * from source 
             WHERE source.project_id IN (
@@ -863,7 +1219,7 @@ class Source(DataPoolBaseTable):
             );
             """
         )
-        return self._query(query_str, None, to_dataframe, show_query, False)
+        return self._query(query_str, (project_name,), to_dataframe, show_query, False)
 
     def get_range(self, source_name, to_dataframe=True, show_query=False):
         """Get range of data source
@@ -883,15 +1239,19 @@ class Source(DataPoolBaseTable):
         dp = DataPool()
         dp.source.get_range(source_name="my_source_name")
         """
+        source_filter = """signal.source_id IN (
+                    SELECT source_id::integer FROM source WHERE source.name = %s
+                )"""
+        vrs = (source_name,)
+        if self.dimensions is not None:
+            source_filter = "signal.source_id = ANY(%s::integer[])"
+            vrs = (self.dimensions.ids("source", source_name),)
+
         query_str = dedent(
             f"""
-            WITH source_ids as (
-                SELECT source_id::integer FROM source WHERE source.name = '{source_name}'
-            ), signal_group as (
+            WITH signal_group as (
                 SELECT distinct signal.timestamp::timestamp FROM signal 
-                WHERE signal.source_id IN (
-                    SELECT source_id::integer FROM source_ids
-                )
+                WHERE {source_filter}
             )    
             SELECT DISTINCT MIN(signal_group.timestamp), MAX(signal_group.timestamp) from signal_group
             ORDER BY MIN(signal_group.timestamp), MAX(signal_group.timestamp)
@@ -899,7 +1259,7 @@ class Source(DataPoolBaseTable):
         )
         return self._query(
             query_str,
-            None,
+            vrs,
             to_dataframe,
             show_query,
             False,
@@ -942,16 +1302,16 @@ class SpecialValueDefinition(DataPoolBaseTable):
         """
 
         query_str = dedent(
-            f"""
+            """
             SELECT special_value_definition.numerical_value, special_value_definition.description
             FROM source_type
             LEFT JOIN special_value_definition ON source_type.source_type_id = special_value_definition.source_type_id
-            WHERE source_type.name='{source_type}'
+            WHERE source_type.name=%s
             """
         )
         return self._query(
             query_str,
-            None,
+            (source_type,),
             to_dataframe,
             show_query,
             False,
@@ -994,16 +1354,16 @@ class SourceType(DataPoolBaseTable):
         """
 
         query_str = dedent(
-            f"""
+            """
             SELECT source_type.name
             FROM source
             LEFT JOIN source_type ON source.source_type_id = source_type.source_type_id
-            WHERE source.name='{source_name}'
+            WHERE source.name=%s
             """
         )
         res = self._query(
             query_str,
-            None,
+            (source_name,),
             to_dataframe,
             show_query,
             False,
@@ -1019,6 +1379,13 @@ class SourceType(DataPoolBaseTable):
 class Signal(DataPoolBaseTable):
     __table_name = "signal"
 
+    # SignalCache used by `get`, see DataPool(cache=...)
+    cache = None
+    # Dimensions resolving names and ids, see DataPool(dimension_ttl=...)
+    dimensions = None
+    # Rollups resampled queries read from, see DataPool(rollup_ttl=...)
+    rollups = None
+
     @staticmethod
     def _all():
         raise PermissionError("This method is not available for the signal table!")
@@ -1071,28 +1438,275 @@ class Signal(DataPoolBaseTable):
 
         st, en = parse_dates(start, end)
 
-        query_str = dedent(
-            f"""
-            SELECT signal.timestamp, signal_id
-            FROM signal 
-            INNER JOIN variable ON signal.variable_id = variable.variable_id
-            INNER JOIN source ON signal.source_id = source.source_id
-            WHERE variable.name = '{variable_name}' AND
-            source.name = '{source_name}' AND
-            '{st}'::timestamp <= signal.timestamp AND
-            signal.timestamp <= '{en}'::timestamp
-            ORDER BY signal.timestamp ASC
-            """
-        )
+        query = Select("signal", SIGNAL_JOINS)
+        query.column("signal.timestamp", "timestamp")
+        query.column("signal.signal_id", "id")
+        if self.dimensions is None:
+            query.where("variable.name = %(variable)s").where("source.name = %(source)s")
+            vrs = dict(variable=variable_name, source=source_name)
+        else:
+            query.where("signal.variable_id = ANY(%(variable)s::integer[])")
+            query.where("signal.source_id = ANY(%(source)s::integer[])")
+            vrs = dict(
+                variable=self.dimensions.ids("variable", variable_name),
+                source=self.dimensions.ids("source", source_name),
+            )
+        query.where("%(start)s::timestamp <= signal.timestamp")
+        query.where("signal.timestamp <= %(end)s::timestamp")
+        query.order_by("signal.timestamp")
+        vrs.update(start=st, end=en)
+
+        query_str = query.sql()
         return self._query(
             query_str,
-            None,
+            vrs,
             to_dataframe,
             show_query,
             False,
             COLUMN_MAP["signal_get_if"],
         )
 
+    @staticmethod
+    def __check_filters(source_name, site_name, variable_name, source_type_name):
+        if (
+            (source_name is None)
+            and (site_name is None)
+            and (variable_name is None)
+            and (source_type_name is None)
+        ):
+            raise ValueError(
+                "Please pass a filter! Choose at least one of those 'source_name', 'site_name', "
+                "'source_type_name', 'variable_name'."
+            )
+
+    @staticmethod
+    def __columns(columns, without_flags, minimal):
+        """The columns `get` returns, `columns` if given, else those of `without_flags` and `minimal`."""
+        if columns is None:
+            if minimal:
+                if without_flags:
+                    return COLUMN_MAP["signal_get_without_quality_and_minimal"]
+                return COLUMN_MAP["signal_get_minimal"]
+            if without_flags:
+                return COLUMN_MAP["signal_get_without_quality"]
+            return COLUMN_MAP["signal_get_with_quality"]
+
+        columns = list(columns)
+        unknown = [name for name in columns if name not in SIGNAL_COLUMN_EXPRESSIONS]
+        if unknown or not columns or len(set(columns)) < len(columns):
+            raise ValueError(
+                "columns must be distinct names out of "
+                f"{', '.join(SIGNAL_COLUMN_EXPRESSIONS)}, not {columns}."
+            )
+        return columns
+
+    @staticmethod
+    def __aggregates(agg):
+        """The columns holding the aggregates of `agg`, mapped to their aggregate.
+
+        A single aggregate is returned as the value column, several as a column each.
+        """
+        names = [agg] if isinstance(agg, str) else list(agg)
+        unknown = [name for name in names if name not in SIGNAL_AGGREGATES]
+        if unknown or not names or len(set(names)) < len(names):
+            raise ValueError(
+                "agg must be distinct aggregates out of "
+                f"{', '.join(SIGNAL_AGGREGATES)}, not {agg}."
+            )
+        return {"value": agg} if isinstance(agg, str) else {name: name for name in names}
+
+    @staticmethod
+    def __with_flags(columns):
+        """Whether the columns need the quality tables, which repeat a signal per flag."""
+        return "quality_method" in columns or "quality_flag" in columns
+
+    def __get_query(
+        self,
+        source_name,
+        site_name,
+        variable_name,
+        source_type_name,
+        st,
+        en,
+        columns,
+        page_size=None,
+        after=None,
+        before=None,
+        descending=False,
+        by_id=True,
+        bucket=None,
+        aggregates=None,
+        rollup=None,
+    ):
+        """Builds the query of `get` selecting `columns` (see `__columns`), joining only
+        the tables of the selected columns.
+
+        With `bucket` the values are aggregated per time bucket of this width and the
+        other columns, the timestamp is the start of the bucket and the value is
+        replaced by the `aggregates`, a dict of column -> aggregate expression. The
+        aggregates are read from the `rollup` table instead of the signals if given.
+
+        With `page_size` only the first `page_size` rows after the key `after` are
+        selected. Rows are ordered by their key (timestamp, signal_id) or, with flags,
+        (timestamp, signal_id, signal_quality_id), the key columns but the timestamp
+        are appended to the result. `before` excludes signals at or after the given
+        timestamp. `descending` reverses the order.
+
+        With `by_id` and dimensions set, the query filters on the ids of the names and
+        returns the dimension ids instead of joining the names, see `__resolve`.
+
+        Return
+        ------
+        the query, the values of its %(name)s placeholders and the names of its columns
+        """
+        by_id = by_id and self.dimensions is not None
+        # the rollup stands in for the signal table, its rows are buckets of signals
+        query = Select("signal" if rollup is None else f"{rollup} AS signal", SIGNAL_JOINS)
+        for name in columns:
+            if bucket is not None and name == "timestamp":
+                query.column(SIGNAL_BUCKET, name)
+            elif bucket is not None and name == "value":
+                for column, aggregate in aggregates.items():
+                    query.column(aggregate, column)
+            elif by_id and name in SIGNAL_COLUMN_IDS:
+                id_column = SIGNAL_COLUMN_IDS[name]
+                if id_column not in query.names:
+                    query.column(f"signal.{id_column}", id_column)
+            else:
+                query.column(SIGNAL_COLUMN_EXPRESSIONS[name], name)
+        with_flags = self.__with_flags(columns)
+        columns = query.names
+
+        vrs = dict(start=st, end=en)
+        if by_id:
+            self.__id_filter(
+                query, vrs, source_name, site_name, variable_name, source_type_name
+            )
+        else:
+            self.__name_filter(
+                query, vrs, source_name, site_name, variable_name, source_type_name
+            )
+        query.where("%(start)s::timestamp <= signal.timestamp")
+        query.where("signal.timestamp <= %(end)s::timestamp")
+        if before is not None:
+            query.where("signal.timestamp < %(before)s::timestamp")
+            vrs["before"] = before
+
+        if bucket is not None:
+            query.group_by(SIGNAL_BUCKET)
+            for expression, name in query.columns:
+                if name not in aggregates and expression != SIGNAL_BUCKET:
+                    query.group_by(expression)
+            query.order_by(SIGNAL_BUCKET, descending)
+            vrs["bucket"] = bucket
+        else:
+            query.order_by("signal.timestamp", descending)
+        if page_size is not None:
+            # every row is identified by the signal and its quality association
+            key = [("signal.signal_id", "signal_id")]
+            if with_flags:
+                key.append(
+                    (
+                        "COALESCE(signals_signal_quality_association.signal_quality_id, 0)",
+                        "quality_key",
+                    )
+                )
+            if after is not None:
+                values = ["%(after_0)s::timestamp"]
+                values += [f"%(after_{i})s::integer" for i in range(1, len(after))]
+                vrs.update(
+                    (f"after_{i}", value if i == 0 else int(value))
+                    for i, value in enumerate(after)
+                )
+                expressions = ["signal.timestamp"] + [expression for expression, _ in key]
+                query.where(
+                    f"({', '.join(expressions)}) {'<' if descending else '>'} "
+                    f"({', '.join(values)})"
+                )
+            for expression, name in key:
+                query.column(expression, name).order_by(expression, descending)
+            query.limit_to("%(page_size)s")
+            vrs["page_size"] = int(page_size)
+
+        return query.sql(), vrs, columns
+
+    def __id_filter(
+        self, query, vrs, source_name, site_name, variable_name, source_type_name
+    ):
+        """Filters the query of `__get_query` on the ids of the names."""
+        ids = {}
+        if source_type_name is not None:
+            ids["source"] = self.dimensions.source_ids_of_types(source_type_name)
+        elif source_name is not None:
+            ids["source"] = self.dimensions.ids("source", source_name)
+        if site_name is not None:
+            ids["site"] = self.dimensions.ids("site", site_name)
+        if variable_name is not None:
+            ids["variable"] = self.dimensions.ids("variable", variable_name)
+
+        for kind, kind_ids in ids.items():
+            query.where(f"signal.{kind}_id = ANY(%({kind}_ids)s::integer[])")
+            vrs[f"{kind}_ids"] = kind_ids
+
+    @staticmethod
+    def __name_filter(
+        query, vrs, source_name, site_name, variable_name, source_type_name
+    ):
+        """Filters the query of `__get_query` on the ids of the names by subqueries.
+
+        The subqueries filter the signals before any join, whether the named tables are
+        joined or not. Each filter takes a single name or several, which are bound as
+        one array.
+        """
+        if source_type_name is not None:
+            query.where(
+                "signal.source_id = ANY(ARRAY(SELECT source_id FROM source WHERE source_type_id = "
+                "ANY(ARRAY(SELECT source_type_id FROM source_type "
+                "WHERE name = ANY(%(source_type_names)s::text[])))))"
+            )
+            vrs["source_type_names"] = name_list(source_type_name)
+        elif source_name is not None:
+            query.where(
+                "signal.source_id = ANY(ARRAY(SELECT source_id FROM source "
+                "WHERE name = ANY(%(source_names)s::text[])))"
+            )
+            vrs["source_names"] = name_list(source_name)
+        if site_name is not None:
+            query.where(
+                "signal.site_id = ANY(ARRAY(SELECT site_id FROM site "
+                "WHERE name = ANY(%(site_names)s::text[])))"
+            )
+            vrs["site_names"] = name_list(site_name)
+        if variable_name is not None:
+            query.where(
+                "signal.variable_id = ANY(ARRAY(SELECT variable_id FROM variable "
+                "WHERE name = ANY(%(variable_names)s::text[])))"
+            )
+            vrs["variable_names"] = name_list(variable_name)
+
+    def __resolve(self, signals, result="names", columns=None):
+        """Replaces the dimension ids in the result of an id query as asked for by `result`.
+
+        The ids resolve to all their name columns, of which only `columns` are kept.
+        """
+        if self.dimensions is not None:
+            if result == "normalized":
+                signals, dimensions = self.dimensions.normalize(signals)
+                return self.__decode(signals), dimensions
+            signals = self.dimensions.resolve(
+                signals, categorical=result == "categorical" or self._typed
+            )
+        if columns is not None and list(signals.columns) != list(columns):
+            signals = signals[columns]
+        return self.__decode(signals)
+
+    def __decode(self, signals):
+        """Converts the columns of signals to the types asked for by `typed` and `float32`."""
+        types = SIGNAL_COLUMN_TYPES.copy() if self._typed else {}
+        if self._float32:
+            types["value"] = "float32"
+        return decode_columns(signals, types)
+
     def get(
         self,
         *,
@@ -1104,27 +1718,53 @@ class Signal(DataPoolBaseTable):
         end=None,
         without_flags=True,
         minimal=False,
+        columns=None,
+        resample=None,
+        agg="mean",
         to_dataframe=True,
         show_query=False,
+        parallel=None,
+        result="names",
     ):
         """Arguments must be provided with keywords!
 
         Parameters
         ----------
-        source_name:          str, of the source name
-        site_name:            str, of the site name
-        variable_name:       str, of the variable name
-        source_type_name:     str, of the source type name
+        source_name:          str or list of str, of the source name(s)
+        site_name:            str or list of str, of the site name(s)
+        variable_name:       str or list of str, of the variable name(s)
+        source_type_name:     str or list of str, of the source type name(s)
         start:                str, specifying a datetime ideally in the format yyyy-mm-dd HH:MM:SS
         end:                  str, specifying a datetime ideally in the format yyyy-mm-dd HH:MM:SS
         without_flags:        bool, specifying if quality data should be retrieved. if fast, it will not be.
         minimal:              bool, if True, output of "source.name", "source.serial", "source_type.name", "site.name"will be skipped.
+        columns:              list of str, the columns to return in this order out of "timestamp", "value", "unit",
+                              "variable", "source", "serial", "source_type", "site", "quality_method" and
+                              "quality_flag", only the tables of these columns are joined. Replaces without_flags
+                              and minimal, quality data is retrieved if a quality column is asked for.
+        resample:             str or timedelta, width of time buckets, e.g. "1h", the values are aggregated per
+                              bucket and the other columns in the database. The buckets are aligned to midnight,
+                              the timestamp is the start of the bucket. Can not be combined with quality data.
+                              Complete buckets are read from the rollups if there are any, see ToolBox.create_rollups.
+        agg:                  str or list of str, aggregate(s) of the values of a bucket out of "mean", "min", "max",
+                              "sum", "count", "std", "median", "first" and "last". A single aggregate is returned
+                              as the value column, a list as a column each, named after the aggregate.
         to_dataframe:         bool, specifying whether the query output should be formatted as dataframe
         show_query:           bool, specifying whether to print the query
+        parallel:             int, number of connections fetching consecutive time windows concurrently (only if to_dataframe = True)
+        result:               str, "names" returns the names of variables, sources, sites and source types as strings,
+                              "categorical" as pd.Categorical, "normalized" returns the signals with variable_id,
+                              source_id and site_id instead together with a dict of dataframes holding the names
+                              of these ids (only if to_dataframe = True)
+
+        If a cache is set (see DataPool(cache=...)), requests of a single source_name and
+        variable_name without flags are served from the cache and only missing time ranges are
+        fetched. Cached results carry the timestamps as datetime64.
 
         Return
         ------
-        pd.DataFrame or Tuples containing the signals
+        pd.DataFrame or Tuples containing the signals, with result="normalized" a tuple of
+        pd.DataFrame and dict
 
         Example
         -------
@@ -1133,16 +1773,42 @@ class Signal(DataPoolBaseTable):
         dp = DataPool() # this only works when a default connection has been set!
         df = dp.signal.get(source_name = "bn_r03_rub_morg", variable_name="bucket content",
                            source_type_name="OttPluvioII",site_name="school_chatzenrainstr",start = "2019-11-28")
+
+        signals, dimensions = dp.signal.get(source_type_name="OttPluvioII", result="normalized")
+        signals.join(dimensions["source"], on="source_id")
+
+        df = dp.signal.get(source_type_name="OttPluvioII", columns=["timestamp", "value", "variable"])
+
+        hourly = dp.signal.get(source_type_name="OttPluvioII", resample="1h", agg=["mean", "max"])
         """
-        if (
-            (source_name is None)
-            and (site_name is None)
-            and (variable_name is None)
-            and (source_type_name is None)
-        ):
+        self.__check_filters(source_name, site_name, variable_name, source_type_name)
+        columns = self.__columns(columns, without_flags, minimal)
+        width = bucket = aggregates = None
+        result_columns = columns
+        if resample is not None:
+            width = _Timedelta(resample)
+            if width <= _Timedelta(0):
+                raise ValueError("'resample' must be positive.")
+            bucket = f"{width.total_seconds():f} seconds"
+            aggregates = self.__aggregates(agg)
+            if "value" not in columns or self.__with_flags(columns) or parallel:
+                raise ValueError(
+                    "resample needs the value column and can not be combined with "
+                    "quality data or parallel."
+                )
+            result_columns = [
+                column
+                for name in columns
+                for column in (aggregates if name == "value" else [name])
+            ]
+        if result not in SIGNAL_RESULTS:
             raise ValueError(
-                "Please pass a filter! Choose at least one of those 'source_name', 'site_name', "
-                "'source_type_name', 'variable_name'."
+                f"result must be one of {', '.join(SIGNAL_RESULTS)}, not '{result}'."
+            )
+        if result != "names" and (not to_dataframe or self.dimensions is None):
+            raise ValueError(
+                f"result='{result}' needs to_dataframe=True and the dimension maps, "
+                "see DataPool(dimension_ttl=...)."
             )
 
         if end is None:
@@ -1150,127 +1816,449 @@ class Signal(DataPoolBaseTable):
 
         st, en = parse_dates(start, end)
 
-        source_with = "\n"
-        source_filter = "\n"
-        site_with = "\n"
-        site_filter = "\n"
-        variable_with = "\n"
-        variable_filter = "\n"
+        if (
+            self.cache is not None
+            and to_dataframe
+            and result == "names"
+            and not self.__with_flags(columns)
+            and resample is None
+            and not parallel
+            and isinstance(source_name, str)
+            and isinstance(variable_name, str)
+            and site_name is None
+            and source_type_name is None
+        ):
+            signals = self.cache.get(
+                self._connection_details,
+                source_name,
+                variable_name,
+                st,
+                en,
+                lambda first, last: self.__fetch_series(
+                    source_name, variable_name, first, last, show_query
+                ),
+            )
+            signals = self.__decode(signals)
+            if list(signals.columns) != columns:
+                return signals[columns]
+            return signals
+
+        if parallel is not None and parallel > 1 and to_dataframe:
+            filters = (source_name, site_name, variable_name, source_type_name)
+            return self.__get_parallel(
+                filters, st, en, columns, parallel, show_query, result
+            )
+
+        parts = [(None, st, None)]
+        if resample is not None:
+            parts = self.__route(st, en, width, aggregates)
+        results = []
+        for rollup, part_start, before in parts:
+            expressions = None
+            if aggregates is not None:
+                functions = SIGNAL_AGGREGATES if rollup is None else ROLLUP_AGGREGATES
+                expressions = {
+                    column: functions[aggregate]
+                    for column, aggregate in aggregates.items()
+                }
+            query_str, vrs, query_columns = self.__get_query(
+                source_name,
+                site_name,
+                variable_name,
+                source_type_name,
+                part_start,
+                en,
+                columns,
+                before=before,
+                by_id=to_dataframe,
+                bucket=bucket,
+                aggregates=expressions,
+                rollup=rollup,
+            )
+            results.append(
+                self._query(query_str, vrs, to_dataframe, show_query, False, query_columns)
+            )
+        signals = self.__concat(results, to_dataframe)
+        if to_dataframe:
+            return self.__resolve(signals, result, result_columns)
+        return signals
 
-        if source_type_name is None:
+    def __route(self, st, en, width, aggregates):
+        """The parts (rollup, start, before) of a resampled query from st to en.
 
-            if source_name is not None:
-                source_with = (
-                    "source_ids AS (SELECT source_id::integer FROM source "
-                    f"WHERE source.name = '{source_name}')"
-                )
-                source_filter = "signal.source_id = ANY(ARRAY(SELECT source_id::integer FROM source_ids))"
+        The complete buckets up to where the coarsest suitable rollup is complete are read
+        from it, the buckets cut by `st` before and the ones after it from the signals.
+        """
+        whole = [(None, st, None)]
+        route = None
+        if self.rollups is not None:
+            route = self.rollups.route(width, aggregates.values())
+        if route is None:
+            return whole
+
+        rollup, covered_until = route
+        origin = _Timestamp(BUCKET_ORIGIN)
+        # the first bucket starting at or after st, the one holding the end of the rollup
+        first = origin - (origin - _Timestamp(st)) // width * width
+        last = origin + (min(covered_until, _Timestamp(en)) - origin) // width * width
+        if first >= last:
+            return whole
+
+        parts = [(rollup, format_timestamp(first), format_timestamp(last))]
+        if _Timestamp(st) < first:
+            parts.insert(0, (None, st, format_timestamp(first)))
+        parts.append((None, format_timestamp(last), None))
+        return parts
 
-        else:
+    @staticmethod
+    def __concat(results, to_dataframe):
+        if len(results) == 1:
+            return results[0]
+        if to_dataframe:
+            frames = [result for result in results if len(result)] or results[:1]
+            return _concat(frames, ignore_index=True)
+        return dict(results[0], data=[row for result in results for row in result["data"]])
 
-            if source_type_name is not None:
-                source_with = (
-                    "source_ids AS ("
-                    "WITH source_type_ids AS (SELECT source_type_id::integer FROM source_type "
-                    f"WHERE source_type.name = '{source_type_name}')"
-                    "SELECT source_id::integer FROM source WHERE source_type_id ="
-                    "ANY(ARRAY(SELECT source_type_id::integer FROM source_type_ids))"
-                    ")"
-                )
+    def resample(self, rule, *, agg="mean", **kwargs):
+        """Arguments but `rule` must be provided with keywords!
 
-                source_filter = "signal.source_id = ANY(ARRAY(SELECT source_id::integer FROM source_ids))"
+        Aggregates the signals per time bucket in the database, a shorthand for
+        `get(resample=rule, agg=agg, ...)`.
 
-        if site_name is not None:
-            site_with = (
-                "site_ids AS (SELECT site_id::integer FROM site "
-                f"WHERE site.name = '{site_name}')"
-            )
-            site_filter = (
-                "signal.site_id = ANY(ARRAY(SELECT site_id::integer FROM site_ids))"
-            )
+        Parameters
+        ----------
+        rule:                 str or timedelta, width of the time buckets, e.g. "1h"
+        agg:                  str or list of str, aggregate(s) of the values of a bucket, see `get`
+        kwargs:               the filters and further arguments of `get`
 
-        if variable_name is not None:
-            if not isinstance(variable_name, list):
-                variable_name = [variable_name]
+        Return
+        ------
+        pd.DataFrame or Tuples containing the aggregated signals
+
+        Example
+        -------
+        from datapool_client import DataPool, reshape
 
-            variables = f"""'{{"{'","'.join(variable_name)}"}}'"""
+        dp = DataPool()
+        hourly = dp.signal.resample("1h", source_name="bn_r03_rub_morg", start="2019-11-28")
+        reshape(hourly)
+        """
+        return self.get(resample=rule, agg=agg, **kwargs)
+
+    def get_m4(
+        self,
+        width,
+        *,
+        source_name=None,
+        site_name=None,
+        variable_name=None,
+        source_type_name=None,
+        start="1900-01-01 00:00:00",
+        end=None,
+        columns=None,
+        minimal=False,
+        show_query=False,
+    ):
+        """Arguments but `width` must be provided with keywords!
+
+        Fetches the signals to plot on a plot `width` pixels wide (M4). The time between
+        the first and the last signal is divided into buckets of a pixel each (aligned
+        like those of `resample`) and only the first, last, min and max signal of every
+        bucket per series of the other columns are transferred, at most
+        4 * (width + 1) signals per series. A line plot of them looks the same as one of
+        all signals.
+
+        Parameters
+        ----------
+        width:                int, the width of the plot in pixels
+        source_name:          str or list of str, of the source name(s)
+        site_name:            str or list of str, of the site name(s)
+        variable_name:       str or list of str, of the variable name(s)
+        source_type_name:     str or list of str, of the source type name(s)
+        start:                str, specifying a datetime ideally in the format yyyy-mm-dd HH:MM:SS
+        end:                  str, specifying a datetime ideally in the format yyyy-mm-dd HH:MM:SS
+        columns:              list of str, the columns to return, see `get`, without quality columns
+        minimal:              bool, if True, output of "source.name", "source.serial", "source_type.name", "site.name"will be skipped.
+        show_query:           bool, specifying whether to print the queries
+
+        Return
+        ------
+        pd.DataFrame with the columns of `get`
+
+        Example
+        -------
+        from datapool_client import DataPool, reshape
 
-            variable_with = (
-                "variable_ids AS (SELECT variable_id::integer FROM variable "
-                f"WHERE variable.name = ANY({variables}))"
+        dp = DataPool()
+        signals = dp.signal.get_m4(1200, source_name="bn_r03_rub_morg", start="2015-01-01")
+        reshape(signals).plot()
+        """
+        self.__check_filters(source_name, site_name, variable_name, source_type_name)
+        columns = self.__columns(columns, True, minimal)
+        if int(width) < 1 or self.__with_flags(columns):
+            raise ValueError(
+                "width must be positive and columns can not hold quality data."
             )
-            variable_filter = "signal.variable_id = ANY(ARRAY(SELECT variable_id::integer FROM variable_ids))"
 
-        with_statement = ",\n".join(
-            [
-                statement
-                for statement in [source_with, site_with, variable_with]
-                if statement != "\n"
-            ]
+        if end is None:
+            end = _dt.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        st, en = parse_dates(start, end)
+        filters = (source_name, site_name, variable_name, source_type_name)
+        first = self.__next_timestamp(filters, _Timestamp(st), _Timestamp(en), show_query)
+        last = self.__next_timestamp(
+            filters, _Timestamp(st), _Timestamp(en), show_query, descending=True
         )
-        filter_statement = "AND\n".join(
-            [
-                statement
-                for statement in [source_filter, site_filter, variable_filter]
-                if statement != "\n"
-            ]
+        if first is None:
+            first = last = _Timestamp(st)
+
+        # the last signal starts a bucket of its own
+        bucket = max((last - first) / int(width), _Timedelta(microseconds=1))
+        series = [name for name in columns if name not in ("timestamp", "value")]
+        query_str, vrs, query_columns = self.__get_query(
+            *filters,
+            format_timestamp(first),
+            format_timestamp(last),
+            series + ["value"],
+            bucket=f"{bucket.total_seconds():f} seconds",
+            aggregates=M4_AGGREGATES,
         )
-
+        series = [name for name in query_columns if name not in M4_AGGREGATES]
+        # the distinct points of every bucket
         query_str = dedent(
             f"""
-            WITH 
-            {with_statement}
-            SELECT signal.timestamp, value, variable.unit, variable.name, source.name, source.serial, source_type.name, site.name, quality.method, quality.flag  
-                FROM signal
-                INNER JOIN site ON signal.site_id = site.site_id
-                INNER JOIN variable ON signal.variable_id = variable.variable_id
-                INNER JOIN source ON signal.source_id = source.source_id
-                INNER JOIN source_type ON source.source_type_id = source_type.source_type_id
-                LEFT JOIN signals_signal_quality_association ON signals_signal_quality_association.signal_id = signal.signal_id
-                LEFT JOIN signal_quality ON signals_signal_quality_association.signal_quality_id = signal_quality.signal_quality_id
-                LEFT JOIN quality ON quality.quality_id = signal_quality.quality_id
-                WHERE 
-                {filter_statement}
-                AND '{st}'::timestamp <= signal.timestamp
-                AND signal.timestamp <= '{en}'::timestamp 
-
-                ORDER BY signal.timestamp ASC
+            SELECT
+                %(start)s::timestamp + make_interval(secs => point[1]) AS timestamp,
+                point[2] AS value{"".join(f", {name}" for name in series)}
+            FROM ({query_str}) AS buckets
+            CROSS JOIN LATERAL (
+                SELECT m4_first
+                UNION SELECT m4_last
+                UNION SELECT ARRAY[m4_min[2], m4_min[1]]
+                UNION SELECT ARRAY[m4_max[2], m4_max[1]]
+            ) AS points(point)
+            WHERE point[1] IS NOT NULL
+            ORDER BY 1
             """
         )
+        signals = self._query(
+            query_str, vrs, True, show_query, False, ["timestamp", "value"] + series
+        )
+        return self.__resolve(signals, columns=columns)
 
-        columns = COLUMN_MAP["signal_get_with_quality"]
+    def __fetch_series(self, source_name, variable_name, first, last, show_query):
+        query_str, vrs, columns = self.__get_query(
+            source_name,
+            None,
+            variable_name,
+            None,
+            format_timestamp(first),
+            format_timestamp(last),
+            COLUMN_MAP["signal_get_without_quality"],
+        )
+        return self.__resolve(
+            self._query(query_str, vrs, True, show_query, False, columns)
+        )
 
-        if without_flags and not minimal:
-            to_replace = {
-                ", quality.method, quality.flag": "",
-                "LEFT JOIN signals_signal_quality_association ON signals_signal_quality_association.signal_id = signal.signal_id": "",
-                "LEFT JOIN signal_quality ON signals_signal_quality_association.signal_quality_id = signal_quality.signal_quality_id": "",
-                "LEFT JOIN quality ON quality.quality_id = signal_quality.quality_id": "",
-            }
+    def invalidate_cache(
+        self, source_name=None, variable_name=None, start=None, end=None
+    ):
+        """
+        Parameters
+        ----------
+        source_name:          str, of the source name, all sources if not given
+        variable_name:       str, of the variable name, all variables if not given
+        start:                str, the cached days from the one holding start on are removed
+        end:                  str, the cached days up to the one holding end are removed
 
-            query_str = dedent(replace_in_query(query_str, to_replace))
-            columns = COLUMN_MAP["signal_get_without_quality"]
+        Example
+        -------
+        dp = DataPool(cache="~/.datapool_cache")
+        dp.signal.invalidate_cache(source_name="bn_r03_rub_morg", start="2019-11-28")
+        """
+        if self.cache is not None:
+            self.cache.invalidate(
+                self._connection_details, source_name, variable_name, start, end
+            )
 
-        elif minimal and not without_flags:
-            to_replace = {
-                ", source.name, source.serial, source_type.name, site.name": ""
-            }
-            query_str = dedent(replace_in_query(query_str, to_replace))
+    def __get_parallel(self, filters, st, en, columns, parallel, show_query, result):
+        st, en = _Timestamp(st), _Timestamp(en)
+        first = self.__next_timestamp(filters, st, en, show_query)
+        last = self.__next_timestamp(filters, st, en, show_query, descending=True)
+        if first is None:
+            first = last = st
+
+        # equal time windows between the first and the last signal, all but the last
+        # exclude their upper bound
+        bounds = [first + (last - first) * i / parallel for i in range(1, parallel)]
+        queries = []
+        vrs = []
+        for lower, upper in zip([first] + bounds, bounds + [None]):
+            query_str, query_vrs, query_columns = self.__get_query(
+                *filters,
+                format_timestamp(lower),
+                format_timestamp(last),
+                columns,
+                before=None if upper is None else format_timestamp(upper),
+            )
+            queries.append(query_str)
+            vrs.append(query_vrs)
 
-            columns = COLUMN_MAP["signal_get_minimal"]
+        signals = _concat(
+            self._query_parallel(queries, parallel, show_query, vrs), ignore_index=True
+        )
+        signals.columns = query_columns
+        return self.__resolve(signals, result, columns)
 
-        elif minimal and without_flags:
-            to_replace = {
-                ", quality.method, quality.flag": "",
-                ", source.name, source.serial, source_type.name, site.name": "",
-                "LEFT JOIN signals_signal_quality_association ON signals_signal_quality_association.signal_id = signal.signal_id": "",
-                "LEFT JOIN signal_quality ON signals_signal_quality_association.signal_quality_id = signal_quality.signal_quality_id": "",
-                "LEFT JOIN quality ON quality.quality_id = signal_quality.quality_id": "",
-            }
-            query_str = dedent(replace_in_query(query_str, to_replace))
-            columns = COLUMN_MAP["signal_get_without_quality_and_minimal"]
+    def iter_chunks(
+        self,
+        *,
+        source_name=None,
+        site_name=None,
+        variable_name=None,
+        source_type_name=None,
+        start="1900-01-01 00:00:00",
+        end=None,
+        without_flags=True,
+        minimal=False,
+        columns=None,
+        chunk_rows=None,
+        chunk_interval=None,
+        show_query=False,
+    ):
+        """Arguments must be provided with keywords!
+
+        Yields the result of `get` in consecutive dataframes, so that arbitrarily large
+        ranges can be processed without holding them in memory at once.
+
+        Parameters
+        ----------
+        source_name:          str or list of str, of the source name(s)
+        site_name:            str or list of str, of the site name(s)
+        variable_name:       str or list of str, of the variable name(s)
+        source_type_name:     str or list of str, of the source type name(s)
+        start:                str, specifying a datetime ideally in the format yyyy-mm-dd HH:MM:SS
+        end:                  str, specifying a datetime ideally in the format yyyy-mm-dd HH:MM:SS
+        without_flags:        bool, specifying if quality data should be retrieved. if fast, it will not be.
+        minimal:              bool, if True, output of "source.name", "source.serial", "source_type.name", "site.name"will be skipped.
+        columns:              list of str, the columns to return, see `get`
+        chunk_rows:           int, number of rows per chunk
+        chunk_interval:       str or timedelta, time span covered by each chunk, e.g. "7D"
+        show_query:           bool, specifying whether to print the queries
+
+        Return
+        ------
+        generator of pd.DataFrame with the same columns as returned by `get`
+
+        Example
+        -------
+        from datapool_client import DataPool
 
-        return self._query(query_str, None, to_dataframe, show_query, False, columns)
+        dp = DataPool()
+        for chunk in dp.signal.iter_chunks(source_type_name="OttPluvioII", start="2019-01-01",
+                                           end="2020-01-01", chunk_interval="7D"):
+            process(chunk)
+        """
+        self.__check_filters(source_name, site_name, variable_name, source_type_name)
+        columns = self.__columns(columns, without_flags, minimal)
+
+        if (chunk_rows is None) == (chunk_interval is None):
+            raise ValueError(
+                "Please pass exactly one of 'chunk_rows', 'chunk_interval'."
+            )
+
+        if end is None:
+            end = _dt.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        st, en = parse_dates(start, end)
+        st, en = _Timestamp(st), _Timestamp(en)
+        filters = (source_name, site_name, variable_name, source_type_name)
+
+        if chunk_interval is not None:
+            yield from self.__iter_intervals(
+                filters, st, en, columns, chunk_interval, show_query
+            )
+        else:
+            yield from self.__iter_pages(
+                filters, st, en, columns, chunk_rows, show_query
+            )
+
+    def __iter_intervals(self, filters, st, en, columns, chunk_interval, show_query):
+        interval = _Timedelta(chunk_interval)
+        if interval <= _Timedelta(0):
+            raise ValueError("'chunk_interval' must be positive.")
+
+        window_start = st
+        chunk = None
+        while window_start <= en:
+            if chunk is None or not len(chunk):
+                # jump over windows without signals to the one holding the next signal
+                following = self.__next_timestamp(filters, window_start, en, show_query)
+                if following is None:
+                    return
+                window_start = st + (following - st) // interval * interval
+
+            window_end = window_start + interval
+            query_str, vrs, query_columns = self.__get_query(
+                *filters,
+                format_timestamp(window_start),
+                format_timestamp(en),
+                columns,
+                before=format_timestamp(window_end),
+            )
+            chunk = self._query(query_str, vrs, True, show_query, False, query_columns)
+            if len(chunk):
+                yield self.__resolve(chunk, columns=columns)
+            window_start = window_end
+
+    def __next_timestamp(self, filters, st, en, show_query, descending=False):
+        """Timestamp of the first signal at or after `st`, None if there is none.
+
+        With `descending` the timestamp of the last signal at or before `en`.
+        """
+        query_str, vrs, _ = self.__get_query(
+            *filters,
+            format_timestamp(st),
+            format_timestamp(en),
+            ["timestamp"],
+            page_size=1,
+            descending=descending,
+        )
+        first = self._query(query_str, vrs, False, show_query, False)["data"]
+        return _Timestamp(first[0][0]) if first else None
+
+    def __iter_pages(self, filters, st, en, columns, chunk_rows, show_query):
+        if chunk_rows < 1:
+            raise ValueError("'chunk_rows' must be positive.")
+
+        key_columns = ["signal_id"]
+        if self.__with_flags(columns):
+            key_columns.append("quality_key")
+        # the pages continue after the timestamp of the last row
+        selected = columns if "timestamp" in columns else columns + ["timestamp"]
+        after = None
+        while True:
+            query_str, vrs, query_columns = self.__get_query(
+                *filters,
+                format_timestamp(st),
+                format_timestamp(en),
+                selected,
+                page_size=chunk_rows,
+                after=after,
+            )
+            chunk = self._query(
+                query_str, vrs, True, show_query, False, query_columns + key_columns
+            )
+            if not len(chunk):
+                return
+
+            last = chunk.iloc[-1]
+            after = [format_timestamp(_Timestamp(last.timestamp))]
+            after += [int(last[column]) for column in key_columns]
+            yield self.__resolve(chunk.drop(columns=key_columns), columns=columns)
+
+            if len(chunk) < chunk_rows:
+                return
 
     def newest(self, n, to_dataframe=True, show_query=False):
         """
@@ -1291,7 +2279,7 @@ class Signal(DataPoolBaseTable):
         """
 
         query_str = dedent(
-            f"""
+            """
             SELECT  timestamp, 
                     value, 
                     unit, 
@@ -1318,7 +2306,7 @@ class Signal(DataPoolBaseTable):
                                 INNER JOIN source_type 
                                 ON         source.source_type_id = source_type.source_type_id 
                                 WHERE      timestamp >= (Now() - interval '1 week') 
-                                ORDER BY   signal.timestamp DESC limit '{n}' ) s 
+                                ORDER BY   signal.timestamp DESC limit %s ) s 
             GROUP BY s.timestamp, 
                     s.value, 
                     s.signal_id, 
@@ -1332,7 +2320,7 @@ class Signal(DataPoolBaseTable):
 
         return self._query(
             query_str,
-            None,
+            (int(n),),
             to_dataframe,
             show_query,
             False,
@@ -1406,16 +2394,16 @@ class Signal(DataPoolBaseTable):
         st, en = parse_dates(start, end)
 
         query_str = dedent(
-            f"""
+            """
             WITH signals AS 
             ( 
                     SELECT     signal_id::INTEGER 
                     FROM       signal 
                     inner join site 
                     ON         signal.site_id = site.site_id 
-                    WHERE      site.name = '{site_name}' 
-                    AND        '{st}' :: timestamp <= signal.timestamp 
-                    AND        signal.timestamp <= '{en}' :: timestamp
+                    WHERE      site.name = %s 
+                    AND        %s :: timestamp <= signal.timestamp 
+                    AND        signal.timestamp <= %s :: timestamp
             ), 
     
             signals_with_quality_1 AS 
@@ -1447,7 +2435,7 @@ class Signal(DataPoolBaseTable):
         )
         return self._query(
             query_str,
-            None,
+            (site_name, st, en),
             to_dataframe,
             show_query,
             False,
@@ -1469,13 +2457,41 @@ class Quality(DataPoolBaseTable):
         check=True,
         to_replace={},
         verbose=True,
+        copy_format="csv",
+        stream_buffer_size=None,
+        typed=False,
+        float32=False,
     ):
         super().__init__(
-            host, port, database, user, password, instance, check, to_replace, verbose
+            host,
+            port,
+            database,
+            user,
+            password,
+            instance,
+            check,
+            to_replace,
+            verbose,
+            copy_format,
+            stream_buffer_size,
+            typed,
+            float32,
         )
 
         self.__signal = Signal(
-            host, port, database, user, password, instance, False, to_replace, verbose
+            host,
+            port,
+            database,
+            user,
+            password,
+            instance,
+            False,
+            to_replace,
+            verbose,
+            copy_format,
+            stream_buffer_size,
+            typed,
+            float32,
         )
 
     @property
@@ -1521,14 +2537,14 @@ class Quality(DataPoolBaseTable):
     def __get_quality_id(self):
 
         query = dedent(
-            f"""
+            """
             SELECT quality_id, flag
             FROM quality 
-            WHERE method = '{self.method}' 
+            WHERE method = %s 
             """
         )
 
-        self.quality_id = self._query(query)
+        self.quality_id = self._query(query, (self.method,))
 
         if self.quality_id.empty:
             raise ValueError("No matching quality found!")
@@ -1548,15 +2564,17 @@ class Quality(DataPoolBaseTable):
         self.timestamp = _datetime.now().strftime("%Y-%m-%d")
 
         query = dedent(
-            f"""SELECT signal_quality_id, signal_quality.quality_id, timestamp, author
+            """SELECT signal_quality_id, signal_quality.quality_id, timestamp, author
             FROM signal_quality
             INNER JOIN quality ON signal_quality.quality_id = quality.quality_id                 
-            WHERE timestamp = '{self.timestamp}' AND
-            author = '{self.author}' AND
-            method = '{self.method}'"""
+            WHERE timestamp = %s AND
+            author = %s AND
+            method = %s"""
         )
 
-        self.signal_quality_id = self._query(query)
+        self.signal_quality_id = self._query(
+            query, (self.timestamp, self.author, self.method)
+        )
 
         if self.signal_quality_id.empty:
 
@@ -1581,12 +2599,12 @@ class Quality(DataPoolBaseTable):
 
     def get_signal_quality_id(self, method_name):
         query = dedent(
-            f"""SELECT signal_quality_id, signal_quality.quality_id, timestamp, author
+            """SELECT signal_quality_id, signal_quality.quality_id, timestamp, author
             FROM signal_quality
             INNER JOIN quality ON signal_quality.quality_id = quality.quality_id                 
-            WHERE method = '{method_name}'"""
+            WHERE method = %s"""
         )
-        return self.query(query)
+        return self._query(query, (method_name,), False)
 
     def __match_id_2_flag(self):
 
@@ -1621,28 +2639,25 @@ class Quality(DataPoolBaseTable):
 
         if answer.lower() in ["y", "yes"]:
 
-            self._connect()
-            con = self._conn
-
-            if self.add_signal_quality_id:
-                self.signal_quality_id.to_sql(
-                    "signal_quality", con, if_exists="append", index=False
-                )
-                print("signal quality added")
+            with self._connection() as con:
 
-            try:
-                self.signals_signal_quality_association.to_sql(
-                    "signals_signal_quality_association",
-                    con,
-                    if_exists="append",
-                    index=False,
-                )
-                print("flag added")
-            except Exception as e:
-                print("flags weren't added!")
-                print(e)
-
-            con.close()
+                if self.add_signal_quality_id:
+                    self.signal_quality_id.to_sql(
+                        "signal_quality", con, if_exists="append", index=False
+                    )
+                    print("signal quality added")
+
+                try:
+                    self.signals_signal_quality_association.to_sql(
+                        "signals_signal_quality_association",
+                        con,
+                        if_exists="append",
+                        index=False,
+                    )
+                    print("flag added")
+                except Exception as e:
+                    print("flags weren't added!")
+                    print(e)
 
         else:
 
@@ -1760,12 +2775,8 @@ class Quality(DataPoolBaseTable):
 
         if answer.lower() in ["y", "yes"]:
 
-            self._connect()
-            con = self._conn
-
-            self.quality_df.to_sql("quality", con, if_exists="append", index=False)
-
-            con.close()
+            with self._connection() as con:
+                self.quality_df.to_sql("quality", con, if_exists="append", index=False)
 
         else:
             print("aborted")
@@ -1788,12 +2799,12 @@ class Quality(DataPoolBaseTable):
 
         for i in id_list:
             query = dedent(
-                f"""
+                """
                 DELETE FROM quality
-                WHERE quality.quality_id = '{i}'
+                WHERE quality.quality_id = %s
                 """
             )
-            self.query(query, allow_modifications=True)
+            self._query(query, (int(i),), False, False, True)
 
     def delete_quality_flags(self, method, source, variable, start, end):
         """
@@ -1821,11 +2832,9 @@ class Quality(DataPoolBaseTable):
             query = """SELECT signal_quality.signal_quality_id, signals_signal_quality_association.signal_id FROM signals_signal_quality_association
                     INNER JOIN signal_quality ON signals_signal_quality_association.signal_quality_id = signal_quality.signal_quality_id
                     INNER JOIN quality ON signal_quality.quality_id = quality.quality_id
-                    WHERE quality.method = '{}' AND signal_id IN ({})""".format(
-                method, ",".join([str(i) for i in s_ids])
-            )
+                    WHERE quality.method = %s AND signal_id = ANY(%s::integer[])"""
 
-            candidates_list = list(self.query(query, allow_modifications=True))[1]
+            candidates_list = self._query(query, (method, list(s_ids)), False)["data"]
 
             if candidates_list == []:
 
@@ -1833,10 +2842,14 @@ class Quality(DataPoolBaseTable):
 
             else:
                 for i in range(len(candidates_list)):
-                    query_delete = """DELETE FROM signals_signal_quality_association WHERE signal_quality_id = '{}' AND signal_id = '{}'""".format(
-                        candidates_list[i][0], candidates_list[i][1]
+                    query_delete = """DELETE FROM signals_signal_quality_association WHERE signal_quality_id = %s AND signal_id = %s"""
+                    self._query(
+                        query_delete,
+                        (candidates_list[i][0], candidates_list[i][1]),
+                        False,
+                        False,
+                        True,
                     )
-                    self.query(query_delete, allow_modifications=True)
 
                 print("Entries deleted")
 
@@ -1854,7 +2867,7 @@ class Quality(DataPoolBaseTable):
         """
 
         query = dedent(
-            f"""
+            """
             SELECT 
                 signal.signal_id, 
                 signal.timestamp, 
@@ -1874,11 +2887,11 @@ class Quality(DataPoolBaseTable):
             FULL OUTER JOIN quality 
             ON quality.quality_id = signal_quality.quality_id
             
-            WHERE source.name = '{source_name}'
-            AND variable.name = '{variable_name}'
+            WHERE source.name = %s
+            AND variable.name = %s
             AND quality.flag IS NULL
             
             ORDER BY signal.timestamp ASC;
             """
         )
-        return self.query_df(query)
+        return self._query(query, (source_name, variable_name))
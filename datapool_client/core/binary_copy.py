@@ -0,0 +1,348 @@
+"""Decoder for the output of postgres' COPY ... TO STDOUT WITH (FORMAT binary).
+
+The format is documented under https://www.postgresql.org/docs/current/sql-copy.html.
+Every tuple consists of an int16 field count followed by an int32 length and the
+raw bytes of each field (length -1 marks a NULL). All numbers are big-endian.
+
+The buffer is decoded column by column with numpy. Only if the start of the tuples
+cannot be determined that way, the buffer is walked tuple by tuple.
+"""
+
+import re as _re
+import struct as _struct
+
+import numpy as _np
+import pandas as _pd
+
+from datapool_client.core.errors import UnsupportedTypeError
+
+SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+TRAILER = b"\xff\xff"
+HEADER_LENGTH = len(SIGNATURE) + 8
+
+POSTGRES_EPOCH = _np.datetime64("2000-01-01T00:00:00", "us")
+
+BOOL, INT8, INT2, INT4, OID = 16, 20, 21, 23, 26
+FLOAT4, FLOAT8 = 700, 701
+DATE, TIMESTAMP, TIMESTAMPTZ = 1082, 1114, 1184
+TEXT, NAME, BPCHAR, VARCHAR, JSON = 25, 19, 1042, 1043, 114
+
+# type oid -> big-endian numpy dtype of the field
+FIXED_WIDTH_TYPES = {
+    BOOL: _np.dtype("?"),
+    INT2: _np.dtype(">i2"),
+    INT4: _np.dtype(">i4"),
+    INT8: _np.dtype(">i8"),
+    OID: _np.dtype(">u4"),
+    FLOAT4: _np.dtype(">f4"),
+    FLOAT8: _np.dtype(">f8"),
+    DATE: _np.dtype(">i4"),
+    TIMESTAMP: _np.dtype(">i8"),
+    TIMESTAMPTZ: _np.dtype(">i8"),
+}
+TEXT_TYPES = {TEXT, NAME, BPCHAR, VARCHAR, JSON}
+
+# texts longer than this are decoded value by value
+MAX_VECTORISED_TEXT_LENGTH = 256
+
+_INT16 = _struct.Struct(">h")
+_INT32 = _struct.Struct(">i")
+_LENGTH = _np.dtype(">i4")
+_STRING_LITERAL = _re.compile(r"'(?:[^']|'')*'")
+
+
+def query_shape(query):
+    """The query with its string literals blanked out.
+
+    Queries of the same shape differ only in filter values, their results have the
+    same column types.
+    """
+    return _STRING_LITERAL.sub("''", query)
+
+
+def check_types(type_oids):
+    unsupported = [
+        oid
+        for oid in type_oids
+        if oid not in FIXED_WIDTH_TYPES and oid not in TEXT_TYPES
+    ]
+    if unsupported:
+        raise UnsupportedTypeError(
+            f"The binary COPY decoder does not support the type oids {unsupported}."
+        )
+
+
+def _strip_envelope(buffer):
+    if buffer[: len(SIGNATURE)] != SIGNATURE:
+        raise ValueError("The buffer does not contain binary COPY data.")
+
+    (extension_length,) = _INT32.unpack_from(buffer, len(SIGNATURE) + 4)
+    body_start = HEADER_LENGTH + extension_length
+
+    if buffer[-2:] != TRAILER:
+        raise ValueError("The binary COPY data is incomplete.")
+
+    return buffer[body_start:-2]
+
+
+def _fixed_layout(body, type_oids):
+    """Views the body as a structured array if every tuple has the same layout.
+
+    That is the case if all columns are of fixed width and contain no NULLs.
+    """
+    if not all(oid in FIXED_WIDTH_TYPES for oid in type_oids):
+        return None
+
+    fields = [("count", ">i2")]
+    for i, oid in enumerate(type_oids):
+        fields += [(f"length_{i}", ">i4"), (f"value_{i}", FIXED_WIDTH_TYPES[oid])]
+    layout = _np.dtype(fields)
+
+    if len(body) % layout.itemsize:
+        return None
+
+    tuples = _np.frombuffer(body, dtype=layout)
+    if (tuples["count"] != len(type_oids)).any():
+        return None
+
+    for i, oid in enumerate(type_oids):
+        if (tuples[f"length_{i}"] != FIXED_WIDTH_TYPES[oid].itemsize).any():
+            return None
+
+    return tuples
+
+
+def _unaligned_view(raw, dtype):
+    """View in which element i is the value of `dtype` stored at byte offset i."""
+    return _np.ndarray(
+        shape=(len(raw) - dtype.itemsize + 1,), dtype=dtype, buffer=raw, strides=(1,)
+    )
+
+
+def _gather(raw, offsets, dtype):
+    """Reads one value of `dtype` at each of the offsets at once."""
+    return _unaligned_view(raw, dtype)[offsets]
+
+
+def _walk_fields(raw, starts, type_oids, body_length):
+    """Follows the fields of the tuples beginning at `starts` all at once.
+
+    Returns the offsets of the length word of every field, the position after the
+    last field and whether the starts look like the beginning of a valid tuple.
+    """
+    offsets = _np.empty((len(starts), len(type_oids)), dtype=_np.int64)
+    valid = _np.ones(len(starts), dtype=bool)
+    position = starts + 2
+
+    for i, oid in enumerate(type_oids):
+        position = _np.minimum(position, body_length)
+        offsets[:, i] = position
+        length = _gather(raw, position, _LENGTH).astype(_np.int64)
+
+        valid &= length >= -1
+        if oid in FIXED_WIDTH_TYPES:
+            valid &= (length == FIXED_WIDTH_TYPES[oid].itemsize) | (length == -1)
+
+        position = position + 4 + _np.maximum(length, 0)
+        valid &= position <= body_length
+
+    return offsets, position, valid
+
+
+def _is_member(values, sorted_array):
+    if not len(sorted_array):
+        return _np.zeros(len(values), dtype=bool)
+    index = _np.searchsorted(sorted_array, values)
+    index[index == len(sorted_array)] = 0
+    return sorted_array[index] == values
+
+
+def _tuple_offsets(raw, type_oids, body_length):
+    """Finds the fields of all tuples without walking the buffer tuple by tuple.
+
+    Every position carrying the field count is a candidate for the start of a tuple.
+    Candidates that do not parse as a tuple, do not follow another tuple or are not
+    followed by one are dropped. What remains must chain seamlessly from the first to
+    the last byte, otherwise None is returned.
+    """
+    if not body_length:
+        return _np.empty((0, len(type_oids)), dtype=_np.int64)
+
+    count = len(type_oids).to_bytes(2, "big")
+    candidates = _np.flatnonzero(
+        (raw[: body_length - 1] == count[0]) & (raw[1:body_length] == count[1])
+    )
+    # cheap check of the first field before following all fields
+    first_length = _gather(raw, _np.minimum(candidates + 2, body_length), _LENGTH)
+    if type_oids[0] in FIXED_WIDTH_TYPES:
+        width = FIXED_WIDTH_TYPES[type_oids[0]].itemsize
+        candidates = candidates[(first_length == width) | (first_length == -1)]
+    else:
+        candidates = candidates[
+            (first_length >= -1) & (first_length <= body_length - candidates)
+        ]
+
+    offsets, ends, valid = _walk_fields(raw, candidates, type_oids, body_length)
+    candidates, ends, offsets = candidates[valid], ends[valid], offsets[valid]
+
+    while len(candidates):
+        follows = (candidates == 0) | _is_member(candidates, _np.sort(ends))
+        followed = (ends == body_length) | _is_member(ends, candidates)
+        keep = follows & followed
+        if keep.all():
+            break
+        candidates, ends, offsets = candidates[keep], ends[keep], offsets[keep]
+
+    if (
+        len(candidates)
+        and candidates[0] == 0
+        and ends[-1] == body_length
+        and (ends[:-1] == candidates[1:]).all()
+    ):
+        return offsets
+
+    return None
+
+
+def _field_offsets(body, n_fields):
+    """Positions of the length word of every field, shape (n_tuples, n_fields)."""
+    offsets = []
+    append = offsets.append
+    unpack = _INT32.unpack_from
+    position, end = 0, len(body)
+    while position < end:
+        (count,) = _INT16.unpack_from(body, position)
+        if count != n_fields:
+            raise ValueError("The binary COPY data does not match the column types.")
+        position += 2
+        for _ in range(n_fields):
+            append(position)
+            (length,) = unpack(body, position)
+            position += 4 + max(length, 0)
+
+    return _np.array(offsets, dtype=_np.int64).reshape(-1, n_fields)
+
+
+def _to_column(values, oid, nulls=None):
+    if oid in (TIMESTAMP, TIMESTAMPTZ):
+        column = POSTGRES_EPOCH + values.astype("timedelta64[us]")
+        column = column.astype("datetime64[ns]")
+        if nulls is not None:
+            column[nulls] = _np.datetime64("NaT")
+        column = _pd.Series(column)
+        if oid == TIMESTAMPTZ:
+            column = column.dt.tz_localize("UTC")
+        return column
+
+    if oid == DATE:
+        column = POSTGRES_EPOCH.astype("datetime64[D]") + values.astype(
+            "timedelta64[D]"
+        )
+        column = column.astype("datetime64[ns]")
+        if nulls is not None:
+            column[nulls] = _np.datetime64("NaT")
+        return _pd.Series(column)
+
+    column = values.astype(values.dtype.newbyteorder("="))
+    if nulls is not None and nulls.any():
+        column = column.astype(object if oid == BOOL else _np.float64)
+        column[nulls] = None if oid == BOOL else _np.nan
+    return _pd.Series(column)
+
+
+def _text_codes(raw, starts, lengths):
+    """Assigns the same code to equal texts by comparing them eight bytes at a time."""
+    words = _unaligned_view(raw, _np.dtype("<u8"))
+    codes = (lengths < 0).astype(_np.int64)
+
+    for offset in range(0, max(int(lengths.max()), 0), 8):
+        word = words[_np.minimum(starts + offset, len(words) - 1)]
+        n_bytes = _np.clip(lengths - offset, 0, 8).astype(_np.uint64)
+        # keep the bytes belonging to the text, texts never contain zero bytes
+        word &= _np.where(
+            n_bytes == 8,
+            _np.uint64(0xFFFFFFFFFFFFFFFF),
+            (_np.uint64(1) << (n_bytes * _np.uint64(8))) - _np.uint64(1),
+        )
+        word_codes, uniques = _pd.factorize(word)
+        codes, _ = _pd.factorize(codes * len(uniques) + word_codes)
+
+    return codes
+
+
+def _decode_text(raw, body, starts, lengths):
+    """Decodes a text column, every distinct value is only decoded once."""
+    if not len(lengths) or lengths.max() > MAX_VECTORISED_TEXT_LENGTH:
+        return _pd.Series(
+            [
+                _np.nan if length < 0 else body[start : start + length].decode()
+                for start, length in zip(starts.tolist(), lengths.tolist())
+            ],
+            dtype=object,
+        )
+
+    # factorize numbers the codes in order of their first appearance
+    codes, _ = _pd.factorize(_text_codes(raw, starts, lengths))
+    seen = _np.maximum.accumulate(codes)
+    first = _np.flatnonzero(_np.r_[True, seen[1:] > seen[:-1]])
+
+    values = _np.empty(len(first), dtype=object)
+    for code, row in enumerate(first.tolist()):
+        start, length = int(starts[row]), int(lengths[row])
+        values[code] = _np.nan if length < 0 else body[start : start + length].decode()
+
+    return _pd.Series(values[codes], dtype=object)
+
+
+def read_binary_copy(buffer, type_oids, column_names):
+    """
+    Parameters
+    ----------
+    buffer:         bytes, output of COPY ... TO STDOUT WITH (FORMAT binary)
+    type_oids:      list, postgres type oids of the columns (cursor.description type codes)
+    column_names:   list, names of the columns
+
+    Return
+    ------
+    pd.DataFrame
+    """
+    check_types(type_oids)
+    body = _strip_envelope(bytes(buffer))
+
+    tuples = _fixed_layout(body, type_oids)
+    if tuples is not None:
+        columns = [
+            _to_column(tuples[f"value_{i}"], oid) for i, oid in enumerate(type_oids)
+        ]
+    else:
+        # padding keeps reads behind the last field in bounds
+        raw = _np.frombuffer(body + bytes(8), dtype=_np.uint8)
+        offsets = _tuple_offsets(raw, type_oids, len(body))
+        if offsets is None:
+            offsets = _field_offsets(body, len(type_oids))
+
+        columns = []
+        for i, oid in enumerate(type_oids):
+            lengths = _gather(raw, offsets[:, i], _LENGTH).astype(_np.int64)
+            nulls = lengths < 0
+
+            if oid in TEXT_TYPES:
+                columns.append(_decode_text(raw, body, offsets[:, i] + 4, lengths))
+                continue
+
+            if ((lengths != FIXED_WIDTH_TYPES[oid].itemsize) & ~nulls).any():
+                raise ValueError(
+                    "The binary COPY data does not match the column types."
+                )
+
+            # NULL fields have no payload, read from the field start instead
+            positions = _np.where(nulls, offsets[:, i], offsets[:, i] + 4)
+            values = _gather(raw, positions, FIXED_WIDTH_TYPES[oid])
+            columns.append(_to_column(values, oid, nulls))
+
+    if not columns:
+        return _pd.DataFrame(columns=column_names)
+
+    result = _pd.concat(columns, axis=1, ignore_index=True)
+    result.columns = column_names
+    return result
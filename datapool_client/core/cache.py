@@ -0,0 +1,349 @@
+"""Persistent local cache of signals of single source/variable combinations.
+
+Every source/variable combination ("series") gets a directory holding one `.npy`
+file per day with the columns `timestamp` (int64 microseconds since the epoch),
+`value` and `site` (index into the site names) plus a `series.json` with the names
+belonging to the series and the time intervals that have already been fetched.
+Only the missing parts of a requested range are fetched from the database.
+"""
+
+import hashlib as _hashlib
+import json as _json
+import os as _os
+import shutil as _shutil
+import threading as _threading
+import time as _time
+from pathlib import Path as _Path
+from urllib.parse import quote as _quote
+
+import numpy as _np
+import pandas as _pd
+
+DAY = 86_400_000_000  # microseconds
+
+# columns of the day files, the site is an index into the site names of the series
+DAY_DTYPE = _np.dtype([("timestamp", "<i8"), ("value", "<f8"), ("site", "<i4")])
+
+SERIES_COLUMNS = [
+    "timestamp",
+    "value",
+    "unit",
+    "variable",
+    "source",
+    "serial",
+    "source_type",
+    "site",
+]
+
+
+def _to_json(value):
+    if _pd.isna(value):
+        return None
+    return value.item() if isinstance(value, _np.generic) else value
+
+
+def to_microseconds(timestamp):
+    return _pd.Timestamp(timestamp).value // 1000
+
+
+def from_microseconds(microseconds):
+    return _pd.Timestamp(int(microseconds) * 1000)
+
+
+def add_interval(intervals, start, end):
+    """Adds the closed interval [start, end] to the sorted, disjoint intervals."""
+    merged = []
+    for interval_start, interval_end in intervals:
+        if interval_end + 1 < start or end + 1 < interval_start:
+            merged.append([interval_start, interval_end])
+        else:
+            start, end = min(start, interval_start), max(end, interval_end)
+    merged.append([start, end])
+    return sorted(merged)
+
+
+def remove_interval(intervals, start, end):
+    """Removes the closed interval [start, end] from the intervals."""
+    remaining = []
+    for interval_start, interval_end in intervals:
+        if interval_start < start:
+            remaining.append([interval_start, min(interval_end, start - 1)])
+        if end < interval_end:
+            remaining.append([max(interval_start, end + 1), interval_end])
+    return remaining
+
+
+def missing_intervals(intervals, start, end):
+    """The parts of the closed interval [start, end] not covered by the intervals."""
+    missing = []
+    for interval_start, interval_end in intervals:
+        if interval_end < start:
+            continue
+        if end < interval_start:
+            break
+        if start < interval_start:
+            missing.append([start, interval_start - 1])
+        start = interval_end + 1
+    if start <= end:
+        missing.append([start, end])
+    return missing
+
+
+class SignalCache:
+    """
+    Description
+    -----------
+
+    Keeps signals fetched with `Signal.get(source_name=..., variable_name=...)` on disk
+    and tops them up with the missing time ranges only.
+
+    The cache does not notice signals that are added to or changed in already cached
+    ranges after they have been fetched, use `invalidate` for that. Ranges in the future
+    are never marked as cached.
+
+    Parameters
+    ----------
+    directory:      str or Path, directory of the cache
+    max_bytes:      int, size of the cache on disk, least recently used days are evicted beyond
+    """
+
+    def __init__(self, directory, max_bytes=2**30):
+        self.directory = _Path(directory).expanduser()
+        self.max_bytes = max_bytes
+        self._lock = _threading.RLock()
+
+    def _database_directory(self, connection_details):
+        database = "{host}:{port}/{database}".format(**connection_details)
+        return self.directory / _hashlib.sha1(database.encode()).hexdigest()[:16]
+
+    def _series_directory(self, connection_details, source_name, variable_name):
+        return (
+            self._database_directory(connection_details)
+            / _quote(source_name, safe="")
+            / _quote(variable_name, safe="")
+        )
+
+    @staticmethod
+    def _read_series(series_directory):
+        path = series_directory / "series.json"
+        if not path.exists():
+            return {"names": None, "sites": [], "intervals": []}
+        return _json.loads(path.read_text())
+
+    @staticmethod
+    def _write_series(series_directory, series):
+        series_directory.mkdir(parents=True, exist_ok=True)
+        path = series_directory / "series.json"
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(_json.dumps(series))
+        _os.replace(temporary, path)
+
+    @staticmethod
+    def _day_path(series_directory, day):
+        return series_directory / f"{from_microseconds(day):%Y-%m-%d}.npy"
+
+    @staticmethod
+    def _write_day(path, rows):
+        temporary = path.with_name(path.name + ".tmp")
+        with open(temporary, "wb") as file:
+            _np.save(file, rows)
+        _os.replace(temporary, path)
+
+    def get(self, connection_details, source_name, variable_name, start, end, fetch):
+        """
+        Parameters
+        ----------
+        connection_details:     dict, identifying the database
+        source_name:            str, of the source name
+        variable_name:          str, of the variable name
+        start:                  str or Timestamp, first timestamp (inclusive)
+        end:                    str or Timestamp, last timestamp (inclusive)
+        fetch:                  callable, fetch(start, end) returns the signals of the series between
+                                the timestamps as formatted by Signal.get (without flags, not minimal)
+
+        Return
+        ------
+        pd.DataFrame with the columns of Signal.get without flags
+        """
+        start, end = to_microseconds(start), to_microseconds(end)
+        series_directory = self._series_directory(
+            connection_details, source_name, variable_name
+        )
+
+        with self._lock:
+            series = self._read_series(series_directory)
+            # the future can not be cached yet, signals might still be added
+            covered_end = min(end, to_microseconds(_pd.Timestamp.now()))
+            uncovered = []
+            for missing_start, missing_end in missing_intervals(
+                series["intervals"], start, end
+            ):
+                fetched = fetch(
+                    from_microseconds(missing_start), from_microseconds(missing_end)
+                )
+                fetched = fetched.assign(timestamp=_pd.to_datetime(fetched.timestamp))
+                stored = fetched.timestamp <= from_microseconds(covered_end)
+                self._store(series_directory, series, fetched[stored])
+                uncovered.append(fetched[~stored])
+
+                if missing_start <= covered_end:
+                    series["intervals"] = add_interval(
+                        series["intervals"],
+                        missing_start,
+                        min(missing_end, covered_end),
+                    )
+                self._write_series(series_directory, series)
+
+            result = self._load(series_directory, series, start, min(end, covered_end))
+
+        self._evict()
+        if any(len(part) for part in uncovered):
+            result = _pd.concat([result] + uncovered, ignore_index=True)
+            result["value"] = result.value.astype(_np.float64)
+        return result
+
+    def _store(self, series_directory, series, fetched):
+        if fetched.empty:
+            return
+
+        if series["names"] is None:
+            first = fetched.iloc[0]
+            series["names"] = {
+                column: _to_json(first[column])
+                for column in ["unit", "variable", "source", "serial", "source_type"]
+            }
+
+        sites = series["sites"]
+        for site in _pd.unique(fetched.site):
+            if _to_json(site) not in sites:
+                sites.append(_to_json(site))
+
+        fetched = fetched.sort_values("timestamp", kind="stable")
+        rows = _np.empty(len(fetched), dtype=DAY_DTYPE)
+        rows["timestamp"] = fetched.timestamp.values.astype("datetime64[us]").astype(
+            _np.int64
+        )
+        rows["value"] = fetched.value.to_numpy(dtype=_np.float64)
+        rows["site"] = _pd.Index(sites).get_indexer(fetched.site.map(_to_json))
+
+        days, first_rows = _np.unique(rows["timestamp"] // DAY * DAY, return_index=True)
+        series_directory.mkdir(parents=True, exist_ok=True)
+        for day, day_rows in zip(days, _np.split(rows, first_rows[1:])):
+            path = self._day_path(series_directory, day)
+            if path.exists():
+                day_rows = _np.concatenate([_np.load(path), day_rows])
+                day_rows = day_rows[_np.argsort(day_rows["timestamp"], kind="stable")]
+            self._write_day(path, day_rows)
+
+    def _load(self, series_directory, series, start, end):
+        first_day = self._day_path(series_directory, start // DAY * DAY)
+        last_day = self._day_path(series_directory, end // DAY * DAY)
+        paths = [
+            path
+            for path in sorted(series_directory.glob("*.npy"))
+            if first_day.name <= path.name <= last_day.name
+        ]
+
+        now = _time.time()
+        parts = []
+        for path in paths:
+            # the modification time serves as time of the last use
+            _os.utime(path, (now, now))
+            parts.append(_np.load(path))
+
+        rows = _np.concatenate(parts) if parts else _np.empty(0, dtype=DAY_DTYPE)
+        rows = rows[(start <= rows["timestamp"]) & (rows["timestamp"] <= end)]
+
+        names = series["names"] or {}
+        result = _pd.DataFrame(
+            {
+                "timestamp": rows["timestamp"]
+                .astype("datetime64[us]")
+                .astype("datetime64[ns]"),
+                "value": rows["value"],
+            }
+        )
+        for column in ["unit", "variable", "source", "serial", "source_type"]:
+            result[column] = names.get(column)
+        result["site"] = _np.array(series["sites"] + [None], dtype=object)[rows["site"]]
+        return result[SERIES_COLUMNS]
+
+    def size(self):
+        """Size of all cached days in bytes."""
+        return sum(path.stat().st_size for path in self.directory.rglob("*.npy"))
+
+    def _evict(self):
+        with self._lock:
+            days = [(path.stat(), path) for path in self.directory.rglob("*.npy")]
+            total = sum(stat.st_size for stat, _ in days)
+            if total <= self.max_bytes:
+                return
+
+            for stat, path in sorted(days, key=lambda day: day[0].st_mtime):
+                if total <= self.max_bytes:
+                    break
+                series_directory = path.parent
+                series = self._read_series(series_directory)
+                day = to_microseconds(path.name[: -len(".npy")])
+                series["intervals"] = remove_interval(
+                    series["intervals"], day, day + DAY - 1
+                )
+                self._write_series(series_directory, series)
+                path.unlink()
+                total -= stat.st_size
+
+    def invalidate(
+        self,
+        connection_details=None,
+        source_name=None,
+        variable_name=None,
+        start=None,
+        end=None,
+    ):
+        """
+        Description
+        -----------
+
+        Removes cached signals, so that they are fetched again on the next request.
+        Without arguments the whole cache is cleared.
+
+        Parameters
+        ----------
+        connection_details:     dict, identifying the database, all databases if not given
+        source_name:            str, of the source name, all sources if not given
+        variable_name:          str, of the variable name, all variables if not given
+        start:                  str, the days from the one holding start on are removed
+        end:                    str, the days up to the one holding end are removed
+        """
+        with self._lock:
+            if connection_details is None:
+                directories = [self.directory]
+            else:
+                directories = [self._database_directory(connection_details)]
+            for name in [source_name, variable_name]:
+                if name is None:
+                    break
+                directories = [
+                    directory / _quote(name, safe="") for directory in directories
+                ]
+
+            for directory in directories:
+                if not directory.exists():
+                    continue
+                if start is None and end is None:
+                    _shutil.rmtree(directory)
+                    continue
+                self._invalidate_range(directory, start, end)
+
+    def _invalidate_range(self, directory, start, end):
+        first = to_microseconds(start or "1900-01-01") // DAY * DAY
+        last = to_microseconds(end or "2200-01-01") // DAY * DAY + DAY - 1
+        for path in list(directory.rglob("series.json")):
+            series_directory = path.parent
+            series = self._read_series(series_directory)
+            series["intervals"] = remove_interval(series["intervals"], first, last)
+            self._write_series(series_directory, series)
+            for day_path in series_directory.glob("*.npy"):
+                day = to_microseconds(day_path.name[: -len(".npy")])
+                if first <= day <= last:
+                    day_path.unlink()
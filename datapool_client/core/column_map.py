@@ -75,3 +75,53 @@ COLUMN_MAP = {
         "source_instance",
     ],
 }
+
+# types of the columns of signals in COLUMN_MAP, see decode_columns
+SIGNAL_COLUMN_TYPES = {
+    "timestamp": "datetime64[ns]",
+    "unit": "category",
+    "variable": "category",
+    "source": "category",
+    "serial": "category",
+    "source_type": "category",
+    "site": "category",
+    "quality_method": "category",
+    "quality_flag": "category",
+}
+
+# expressions selecting the columns of signals in COLUMN_MAP, see Signal.get(columns=...)
+SIGNAL_COLUMN_EXPRESSIONS = {
+    "timestamp": "signal.timestamp",
+    "value": "signal.value",
+    "unit": "variable.unit",
+    "variable": "variable.name",
+    "source": "source.name",
+    "serial": "source.serial",
+    "source_type": "source_type.name",
+    "site": "site.name",
+    "quality_method": "quality.method",
+    "quality_flag": "quality.flag",
+}
+
+# dimension ids the name columns of signals are resolved from, see Dimensions.resolve
+SIGNAL_COLUMN_IDS = {
+    "unit": "variable_id",
+    "variable": "variable_id",
+    "source": "source_id",
+    "serial": "source_id",
+    "source_type": "source_id",
+    "site": "site_id",
+}
+
+# aggregates of the values of signals per time bucket, see Signal.get(resample=...)
+SIGNAL_AGGREGATES = {
+    "mean": "avg(signal.value)",
+    "min": "min(signal.value)",
+    "max": "max(signal.value)",
+    "sum": "sum(signal.value::double precision)",
+    "count": "count(signal.value)",
+    "std": "stddev_samp(signal.value)",
+    "median": "percentile_cont(0.5) WITHIN GROUP (ORDER BY signal.value)",
+    "first": "(array_agg(signal.value ORDER BY signal.timestamp))[1]",
+    "last": "(array_agg(signal.value ORDER BY signal.timestamp DESC))[1]",
+}
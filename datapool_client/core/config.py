@@ -1,12 +1,15 @@
 import configparser as _configparser
 import os as _os
-
-from sqlalchemy import create_engine
+import threading as _threading
 
 from datapool_client import CONFIG_PATH
 
 DEFAULT_INSTANCE_NAME = "DEFAULT"
 
+# parsed config files by path, with the modification time and size they were read at
+_CONFIGS = {}
+_CONFIGS_LOCK = _threading.Lock()
+
 
 def read_config(config_file_path):
     config = _configparser.ConfigParser()
@@ -14,6 +17,21 @@ def read_config(config_file_path):
     return config
 
 
+def _read_config_cached(config_file_path):
+    """Like read_config, but parses the file only again after it has changed.
+
+    The returned config is shared, it must not be modified.
+    """
+    stat = _os.stat(config_file_path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    key = _os.path.abspath(config_file_path)
+    with _CONFIGS_LOCK:
+        cached = _CONFIGS.get(key)
+        if cached is None or cached[0] != version:
+            cached = _CONFIGS[key] = (version, read_config(config_file_path))
+        return cached[1]
+
+
 def write_config(config_file_path, config):
     with open(config_file_path, "w") as ncf:
         config.write(ncf)
@@ -27,7 +45,7 @@ def _import_defaults(instance=None, filepath=CONFIG_PATH):
             "Please pass all connection details or set a default connection!"
         )
 
-    config = read_config(filepath)
+    config = _read_config_cached(filepath)
 
     if instance is None:
         return dict(config.defaults())
@@ -44,6 +62,9 @@ def _import_defaults(instance=None, filepath=CONFIG_PATH):
 
 
 def test_connection(host, port, user, password, database):
+    # sqlalchemy is imported on first use, it takes long to import
+    from sqlalchemy import create_engine
+
     try:
         engine = create_engine(
             f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{database}"
@@ -0,0 +1,173 @@
+"""Decimation of series to the points a line plot of them needs."""
+
+import numpy as _np
+import pandas as _pd
+
+
+def _bucket_starts(x, count):
+    """The positions at which the non-empty ones of `count` buckets of equal width
+    between x[0] and x[-1] start, `x` must be sorted."""
+    edges = _np.linspace(x[0], x[-1], count + 1)[:-1]
+    starts = _np.unique(_np.searchsorted(x, edges, side="left"))
+    return starts[starts < len(x)]
+
+
+def lttb(x, y, max_points):
+    """
+    Description
+    -----------
+
+    Largest-Triangle-Three-Buckets: keeps the first and the last point and of every
+    bucket in between the point spanning the largest triangle with the point kept
+    from the previous bucket and the mean of the next bucket. The buckets are of
+    equal width on x, so irregular sampling does not shift them.
+
+    Parameters
+    ----------
+    x:              np.ndarray of float, sorted, without NaN
+    y:              np.ndarray of float, without NaN
+    max_points:     int, number of points to keep, at least 3
+
+    Return
+    ------
+    np.ndarray, the sorted positions of the kept points
+    """
+    n = len(x)
+    if n <= max_points:
+        return _np.arange(n)
+
+    starts = _bucket_starts(x[1:-1], max_points - 2) + 1
+    ends = _np.append(starts[1:], n - 1)
+
+    # the means of the buckets, each the "next bucket" of the one before it
+    x_sums = _np.concatenate(([0.0], _np.cumsum(x)))
+    y_sums = _np.concatenate(([0.0], _np.cumsum(y)))
+    counts = ends - starts
+    next_x = _np.append(((x_sums[ends] - x_sums[starts]) / counts)[1:], x[-1])
+    next_y = _np.append(((y_sums[ends] - y_sums[starts]) / counts)[1:], y[-1])
+
+    kept = _np.empty(len(starts) + 2, dtype=_np.int64)
+    kept[0] = previous = 0
+    kept[-1] = n - 1
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        # twice the area of the triangles, the factor does not change the largest
+        areas = _np.abs(
+            (x[previous] - next_x[i]) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y[i] - y[previous])
+        )
+        previous = start + int(_np.argmax(areas))
+        kept[i + 1] = previous
+    return kept
+
+
+def min_max(x, y, max_points):
+    """
+    Description
+    -----------
+
+    Keeps the first and the last point and the min and max point of every bucket of
+    equal width on x, (max_points - 2) // 2 buckets.
+
+    Parameters
+    ----------
+    x:              np.ndarray of float, sorted, without NaN
+    y:              np.ndarray of float, without NaN
+    max_points:     int, number of points to keep at most, at least 3
+
+    Return
+    ------
+    np.ndarray, the sorted positions of the kept points
+    """
+    n = len(x)
+    if n <= max_points:
+        return _np.arange(n)
+
+    starts = _bucket_starts(x, max(1, (max_points - 2) // 2))
+    counts = _np.diff(_np.append(starts, n))
+    buckets = _np.repeat(_np.arange(len(starts)), counts)
+
+    kept = [[0, n - 1]]
+    for extremes in (_np.minimum.reduceat(y, starts), _np.maximum.reduceat(y, starts)):
+        # the first point of every bucket that is at its extreme
+        hits = _np.flatnonzero(y == _np.repeat(extremes, counts))
+        first = _np.diff(buckets[hits], prepend=-1) != 0
+        kept.append(hits[first])
+    return _np.unique(_np.concatenate(kept))
+
+
+DECIMATORS = {"lttb": lttb, "min_max": min_max}
+
+
+def _axis(index):
+    """The index as sorted floats, timestamps as seconds since the first."""
+    if _pd.api.types.is_numeric_dtype(index):
+        return _np.asarray(index, dtype=float)
+    nanoseconds = _pd.to_datetime(index).asi8
+    return (nanoseconds - nanoseconds[0]) / 1e9
+
+
+def _decimate_values(x, y, decimator, max_points):
+    gaps = _np.isnan(y)
+    valid = _np.flatnonzero(~gaps)
+    kept = valid[decimator(x[valid], y[valid], max_points)]
+    gaps = _np.flatnonzero(gaps)
+    if len(gaps):
+        # a NaN per bucket with gaps keeps the line interrupted there
+        edges = _np.linspace(x[0], x[-1], max_points + 1)
+        buckets = _np.searchsorted(edges, x[gaps], side="right")
+        first = _np.diff(buckets, prepend=-1) != 0
+        kept = _np.union1d(kept, gaps[first])
+    return kept
+
+
+def decimate(data, max_points, method="lttb"):
+    """
+    Description
+    -----------
+
+    Reduces a series or the columns of a dataframe to about `max_points` points each,
+    which draw the same line plot. The index is the x axis (e.g. the timestamps of a
+    reshaped signal query) and must be sorted. Rows kept for one column keep the
+    values of all columns. NaN are gaps of the lines, a NaN per bucket holding any is
+    kept in addition to the `max_points` points.
+
+    Parameters
+    ----------
+    data:           pd.Series or pd.DataFrame, of numeric columns
+    max_points:     int, number of points to keep per column, at least 3
+    method:         str, "lttb" (Largest-Triangle-Three-Buckets) or "min_max"
+
+    Return
+    ------
+    the rows of `data` kept
+
+    Example
+    -------
+    from datapool_client import DataPool, decimate, reshape
+
+    dp = DataPool()
+    signals = reshape(dp.signal.get(source_name="bn_r03_rub_morg"))
+    decimate(signals, 2000).plot()
+    """
+    if method not in DECIMATORS:
+        raise ValueError(f"method must be one of {', '.join(DECIMATORS)}.")
+    if int(max_points) < 3:
+        raise ValueError("max_points must be at least 3.")
+    if len(data) <= max_points:
+        return data
+
+    x = _axis(data.index)
+    if isinstance(data, _pd.Series):
+        columns = [data]
+    else:
+        columns = [data.iloc[:, i] for i in range(data.shape[1])]
+    kept = [
+        _decimate_values(
+            x,
+            column.to_numpy(dtype=float, na_value=_np.nan),
+            DECIMATORS[method],
+            int(max_points),
+        )
+        for column in columns
+    ]
+    return data.iloc[_np.unique(_np.concatenate(kept))]
@@ -0,0 +1,186 @@
+"""Name <-> id maps of the dimension tables signals refer to."""
+
+import threading as _threading
+import time as _time
+
+import numpy as _np
+import pandas as _pd
+
+KINDS = ("variable", "source", "site", "source_type")
+
+# all dimensions in a single round trip, `detail` is the unit of variables and the
+# serial of sources, `parent` the source type of sources
+DIMENSIONS_QUERY = """
+    SELECT 'variable', variable_id, name, unit, NULL::integer FROM variable
+    UNION ALL SELECT 'source', source_id, name, serial, source_type_id FROM source
+    UNION ALL SELECT 'site', site_id, name, NULL, NULL FROM site
+    UNION ALL SELECT 'source_type', source_type_id, name, NULL, NULL FROM source_type;
+"""
+
+
+class Dimensions:
+    """
+    Description
+    -----------
+
+    Keeps the names of variables, sources, sites and source types by id, so that signal
+    queries can filter on ids and the names do not have to be joined to every row.
+
+    The maps are loaded with a single query and reloaded once they are older than `ttl`
+    seconds, or when a name or id is looked up that they do not know yet.
+
+    Parameters
+    ----------
+    load:       callable, runs a query and returns its rows as tuples
+    ttl:        float, seconds after which the maps are reloaded
+    """
+
+    def __init__(self, load, ttl=300):
+        self._load = load
+        self.ttl = ttl
+        self._tables = None
+        self._loaded_at = None
+        self._lock = _threading.Lock()
+
+    def _maps(self, stale_since=None):
+        """The maps, reloaded if they are older than `ttl` or loaded before `stale_since`."""
+        with self._lock:
+            if (
+                self._tables is None
+                or _time.monotonic() - self._loaded_at > self.ttl
+                or (stale_since is not None and self._loaded_at <= stale_since)
+            ):
+                rows = _pd.DataFrame(
+                    self._load(DIMENSIONS_QUERY),
+                    columns=["kind", "id", "name", "detail", "parent"],
+                )
+                self._tables = {
+                    kind: rows[rows.kind == kind].set_index("id")[
+                        ["name", "detail", "parent"]
+                    ]
+                    for kind in KINDS
+                }
+                self._loaded_at = _time.monotonic()
+            return self._tables, self._loaded_at
+
+    def refresh(self):
+        """Reloads the maps, e.g. after sources or variables have been added."""
+        self._maps(stale_since=_time.monotonic())
+
+    def ids(self, kind, names):
+        """
+        Parameters
+        ----------
+        kind:       str, one of "variable", "source", "site", "source_type"
+        names:      str or list of str, the names to look up
+
+        Return
+        ------
+        sorted list of the ids of the names, unknown names are left out
+        """
+        if isinstance(names, str):
+            names = [names]
+
+        started = _time.monotonic()
+        tables, loaded_at = self._maps()
+        table = tables[kind]
+        if not set(names) <= set(table.name) and loaded_at < started:
+            # the name might have been added since the maps were loaded
+            table = self._maps(stale_since=loaded_at)[0][kind]
+        return sorted(int(id_) for id_ in table.index[table.name.isin(names)])
+
+    def source_ids_of_types(self, source_type_names):
+        """Sorted list of the ids of the sources of the given source types."""
+        source_type_ids = self.ids("source_type", source_type_names)
+        sources = self._maps()[0]["source"]
+        return sorted(
+            int(id_) for id_ in sources.index[sources.parent.isin(source_type_ids)]
+        )
+
+    def _lookup(self, kind, column, ids, categorical=False):
+        started = _time.monotonic()
+        tables, loaded_at = self._maps()
+        positions = tables[kind].index.get_indexer(ids)
+        if ((positions < 0) & _pd.notna(ids)).any() and loaded_at < started:
+            # the id might have been added since the maps were loaded
+            tables, _ = self._maps(stale_since=loaded_at)
+            positions = tables[kind].index.get_indexer(ids)
+
+        if categorical:
+            codes, categories = _pd.factorize(
+                tables[kind][column].to_numpy(dtype=object)
+            )
+            # the last code is the one of unknown ids
+            codes = _np.append(codes, -1)
+            categorical = _pd.Categorical.from_codes(codes[positions], categories)
+            return categorical.remove_unused_categories()
+
+        # the last value is the one of unknown ids
+        values = _np.append(tables[kind][column].to_numpy(dtype=object), None)
+        missing = _pd.isna(values)
+        if len(positions) and missing[positions].all():
+            # as if read from csv, columns without any value are float
+            return _np.full(len(positions), _np.nan)
+        values[missing] = _np.nan
+        return values[positions]
+
+    def resolve(self, frame, categorical=False):
+        """
+        Parameters
+        ----------
+        frame:          pd.DataFrame, with the columns variable_id, source_id and site_id or some of them
+        categorical:    bool, if True, the names are returned as pd.Categorical
+
+        Return
+        ------
+        pd.DataFrame where the id columns are replaced by the columns of Signal.get
+        (variable_id by unit and variable, source_id by source, serial and source_type,
+        site_id by site)
+        """
+        columns = {}
+        for name, column in frame.items():
+            if name == "variable_id":
+                columns["unit"] = self._lookup(
+                    "variable", "detail", column, categorical
+                )
+                columns["variable"] = self._lookup(
+                    "variable", "name", column, categorical
+                )
+            elif name == "source_id":
+                columns["source"] = self._lookup("source", "name", column, categorical)
+                columns["serial"] = self._lookup(
+                    "source", "detail", column, categorical
+                )
+                source_type_ids = self._lookup("source", "parent", column)
+                columns["source_type"] = self._lookup(
+                    "source_type", "name", _pd.to_numeric(source_type_ids), categorical
+                )
+            elif name == "site_id":
+                columns["site"] = self._lookup("site", "name", column, categorical)
+            else:
+                columns[name] = column
+        return _pd.DataFrame(columns, index=frame.index)
+
+    def normalize(self, frame):
+        """
+        Parameters
+        ----------
+        frame:      pd.DataFrame, with the columns variable_id, source_id and site_id or some of them
+
+        Return
+        ------
+        the frame with the ids as int32 and a dict of pd.DataFrame with the names of the
+        "variable", "source" and "site" ids in the frame, indexed by the id
+        """
+        frame = frame.copy()
+        dimensions = {}
+        for column in ["variable_id", "source_id", "site_id"]:
+            if column not in frame.columns:
+                continue
+            frame[column] = frame[column].astype(_np.int32)
+            ids = _np.sort(_pd.unique(frame[column]))
+            names = self.resolve(_pd.DataFrame({column: ids}))
+            dimensions[column[: -len("_id")]] = names.set_index(
+                _pd.Index(ids, name=column)
+            )
+        return frame, dimensions
@@ -1,2 +1,6 @@
 class WritingDefaultError(Exception):
     pass
+
+
+class UnsupportedTypeError(Exception):
+    pass
@@ -51,7 +51,36 @@ def format_meta_data(meta_data_dataframe: pd.DataFrame):
     return pd.DataFrame(formatted)
 
 
-def reshape(dataframe: pd.DataFrame, only_values=True):
+def decode_columns(dataframe: pd.DataFrame, types: dict):
+    """Converts the columns of a query result to the given types.
+
+    Parameters
+    ----------
+    dataframe:
+        pd.DataFrame, as read from the csv or binary transfer.
+    types:
+        dict, column name -> dtype, columns that are missing or already have the type are skipped.
+
+    Return
+    ------
+    pd.DataFrame
+    """
+    columns = {}
+    for column, dtype in types.items():
+        if column not in dataframe.columns or dataframe[column].dtype == dtype:
+            continue
+        values = dataframe[column]
+        if dtype == "datetime64[ns]" and values.dtype == object:
+            try:
+                # numpy parses the fixed ISO format of postgres much faster than pandas
+                values = values.to_numpy().astype("datetime64[ns]")
+            except ValueError:
+                values = pd.to_datetime(values)
+        columns[column] = pd.Series(values, index=dataframe.index).astype(dtype)
+    return dataframe.assign(**columns) if columns else dataframe
+
+
+def reshape(dataframe: pd.DataFrame, only_values=True, values="value"):
     """Reshapes data returned by DataPool.signal.get query.
 
     Parameters
@@ -60,6 +89,9 @@ def reshape(dataframe: pd.DataFrame, only_values=True):
         pd.DataFrame, to be reshaped.
     only_values:
         bool, omitting the quality information on reshape.
+    values:
+        str or list of str, the column(s) to reshape if only_values, e.g. the aggregates of
+        a resampled query. A list gives a column per column and variable.
 
     Return
     ------
@@ -68,14 +100,23 @@ def reshape(dataframe: pd.DataFrame, only_values=True):
     dataframe.copy()
     if only_values:
         df = pd.pivot_table(
-            dataframe, values=["value"], index="timestamp", columns="variable"
+            dataframe,
+            values=[values] if isinstance(values, str) else list(values),
+            index="timestamp",
+            columns="variable",
+            observed=True,
         )
-        df.columns = df.columns.droplevel()
-        df.columns.name = ""
+        if isinstance(values, str):
+            df.columns = df.columns.droplevel()
+            df.columns.name = ""
         return df
     else:
         values = pd.pivot_table(
-            dataframe, values="value", index="timestamp", columns="variable"
+            dataframe,
+            values="value",
+            index="timestamp",
+            columns="variable",
+            observed=True,
         )
 
         flags = pd.pivot_table(
@@ -84,6 +125,7 @@ def reshape(dataframe: pd.DataFrame, only_values=True):
             index="timestamp",
             columns="quality_method",
             aggfunc=lambda x: " ".join(str(v) for v in x),
+            observed=True,
         )
         res = pd.concat([values, flags], axis=1)
         return res
@@ -1,11 +1,10 @@
 from datetime import timedelta
 
-import plotly.graph_objects as go
-import plotly.offline as py
-from pandas import isna
-from plotly.subplots import make_subplots
+import numpy as np
+from pandas import Series, isna
 
 from datapool_client.core.column_map import COLUMN_MAP
+from datapool_client.core.decimation import decimate
 
 
 def subdivide_comment(comment, limit=50):
@@ -93,11 +92,118 @@ def format_tag(row, additional_meta_info_cols):
     return tag_txt.replace("\n", "<br>")
 
 
+def format_tags(meta, additional_meta_info_cols):
+    """The hover texts of `format_tag` for all rows of `meta`, built column by column."""
+    header = TITLE_NAMES["header"] + meta["log_type"].map(str)
+    action = meta["action_type"]
+    header = header.where(action.isna(), header + " -> " + action.map(str))
+    timeframe = (
+        TITLE_NAMES["timeframe"] + meta["start"].map(str) + " - " + meta["end"].map(str)
+    )
+    comments = meta["comment"].map(format_comment)
+    flag = TITLE_NAMES["flag"] + meta["meta_flag"].map(str)
+    person = TITLE_NAMES["person"] + meta["person"].map(str)
+    add_meta_info = TITLE_NAMES["add_meta_info"]
+    for key in additional_meta_info_cols:
+        value = meta[key]
+        add_meta_info = add_meta_info + (f"{key}: " + value.map(str) + "\n").where(
+            value.notna(), ""
+        )
+
+    tags = (
+        header
+        + "\n\n"
+        + timeframe
+        + "\n\n"
+        + comments
+        + "\n\n"
+        + flag
+        + "\n\n"
+        + person
+        + "\n\n"
+        + add_meta_info
+    )
+    return tags.str.replace("\n", "<br>", regex=False)
+
+
 def determine_additional_meta_info_columns_of_meta_data_history(meta):
     meta_cols = COLUMN_MAP["meta_data_history_get"]
     return list(set(meta.columns) - set(meta_cols))
 
 
+def _meta_area_traces(go, meta, tags, color_encoding, minimal_meta_info_with_minutes):
+    """The areas of the meta data rows as a filled trace of polygons separated by
+    gaps and an invisible trace of points carrying the hover texts per log type."""
+    meta_rows = meta.shape[0]
+    start = meta["start"]
+    # areas of rows without duration get the minimal width
+    end = meta["end"].where(
+        meta["end"] != start,
+        meta["end"] + timedelta(minutes=minimal_meta_info_with_minutes),
+    )
+    middle = (start + (end - start) / 2).astype(str).to_numpy()
+    # strings, as plotly copies the arrays of a trace and timestamp objects copy slowly
+    start = start.astype(str).to_numpy()
+    end = end.astype(str).to_numpy()
+    low = np.arange(meta_rows) / meta_rows
+    high = (np.arange(meta_rows) + 1) / meta_rows
+
+    traces = []
+    for log_type, rows in meta.groupby("log_type", sort=False).indices.items():
+        color = color_encoding[log_type]
+        gap = np.full(len(rows), None, dtype=object)
+        x = np.column_stack(
+            [start[rows], start[rows], end[rows], end[rows], start[rows], gap]
+        )
+        y = np.column_stack(
+            [low[rows], high[rows], high[rows], low[rows], low[rows], gap]
+        )
+        traces.append(
+            go.Scatter(
+                x=x.ravel(),
+                y=y.ravel(),
+                showlegend=False,
+                name=f"meta_info_{log_type}",
+                mode="lines",
+                fill="toself",
+                fillcolor=color,
+                opacity=0.3,
+                line={"width": 1, "color": "black"},
+                hoverinfo="skip",
+            )
+        )
+        traces.append(
+            go.Scattergl(
+                x=middle[rows],
+                y=(low[rows] + high[rows]) / 2,
+                showlegend=False,
+                name=f"meta_info_{log_type}",
+                mode="markers",
+                marker=dict(color=color, opacity=0.0),
+                text=tags.to_numpy()[rows],
+                hovertemplate="<b>%{text} </b><br><br>" + "<extra></extra>",
+            )
+        )
+    return traces
+
+
+def _meta_marker_traces(go, meta, colors, y, symbol):
+    """Markers at the start of the meta data rows, a trace per color."""
+    start = meta["start"].astype(str).to_numpy()
+    return [
+        go.Scattergl(
+            x=start[rows],
+            y=np.full(len(rows), y),
+            showlegend=False,
+            name=f"meta_marker_{color}",
+            mode="markers",
+            marker=dict(color=color, symbol=symbol, size=9),
+            hoverinfo="skip",
+        )
+        for color, rows in colors.groupby(colors, sort=False).indices.items()
+    ]
+
+
 def generate_meta_plot(
     dataframe,
     meta,
@@ -109,7 +215,13 @@ def generate_meta_plot(
     auto_open=True,
     inline=False,
     mark_via_key_word=None,
+    connect_gaps=False,
+    max_points=None,
 ):
+    # plotly is imported on first use, it takes long to import
+    import plotly.graph_objects as go
+    import plotly.offline as py
+    from plotly.subplots import make_subplots
 
     if mark_via_key_word is None:
         mark_via_key_word = {}
@@ -117,88 +229,35 @@ def generate_meta_plot(
     if len(mark_via_key_word) > 1:
         raise ValueError("At the moment only one keyword is supported!")
 
-    values = dataframe.values
-
     max_spacer = 0.1
-    mx = values.max()
+    mx = dataframe.max().max()
     top_annotation_position = mx * (1 + max_spacer) if mx > 0 else mx * (1 - max_spacer)
 
     min_spacer = 0.05
-    mn = values.min()
+    mn = dataframe.min().min()
     bottom_annotation_position = (
         mn * (1 - min_spacer) if abs(mn) < 1 else mn * (1 + min_spacer)
     )
 
-    meta_rows = meta.shape[0]
-
-    annotations = []
-    highlighted_area = []
-    for i, (_, row) in enumerate(meta.iterrows()):
-
-        st = row["start"]
-        en = row["end"]
-
-        row_formatted = format_tag(row, additional_meta_info_cols)
-
-        if st == en:
-            en += timedelta(minutes=minimal_meta_info_with_minutes)
-
-        low = i / meta_rows
-        high = (i + 1) / meta_rows
-
-        highlighted_area.append(
-            go.Scatter(
-                x=[st, st, en, en, st],
-                y=[low, high, high, low, low],
-                showlegend=False,
-                name=f"meta_info_{i}",
-                marker=dict(color=color_encoding[row["log_type"]], opacity=0.0),
-                fill="toself",
-                fillcolor=color_encoding[row["log_type"]],
-                opacity=0.3,
-                line={"width": 1, "color": "black"},
-                text=row_formatted,
-                hoveron="fills",
-                hovertemplate="<b>%{text} </b><br><br>" + "<extra></extra>",
-            )
-        )
-
-        annotations.append(
-            dict(
-                x=row["start"],
-                y=top_annotation_position,
-                textangle=90,
-                ax=0,
-                ay=-20,
-                font=dict(color=color_encoding[row["log_type"]], size=12),
-                arrowcolor=color_encoding[row["log_type"]],
-                arrowsize=1,
-                arrowwidth=1.4,
-                arrowhead=1,
-            )
+    tags = format_tags(meta, additional_meta_info_cols)
+    # markers instead of an annotation per meta data row, which plotly validates slowly
+    markers = _meta_marker_traces(
+        go,
+        meta,
+        meta["log_type"].map(color_encoding),
+        top_annotation_position,
+        "triangle-down",
+    )
+    for key, color in mark_via_key_word.items():
+        marked = tags.str.contains(key, regex=False).to_numpy()
+        markers += _meta_marker_traces(
+            go,
+            meta[marked],
+            Series(color, index=meta.index[marked]),
+            bottom_annotation_position,
+            "triangle-up",
         )
 
-        to_mark = []
-        for key, settings in mark_via_key_word.items():
-            if key in row_formatted:
-                to_mark.append(settings)
-
-        for color in to_mark:
-
-            annotations.append(
-                dict(
-                    x=row["start"],
-                    y=bottom_annotation_position,
-                    textangle=90,
-                    ax=0,
-                    ay=20,
-                    arrowcolor=color,
-                    arrowsize=1,
-                    arrowwidth=1.4,
-                    arrowhead=1,
-                )
-            )
-
     fig = make_subplots(
         rows=2,
         cols=1,
@@ -206,15 +265,25 @@ def generate_meta_plot(
         shared_xaxes=True,
     )
 
-    for trace in highlighted_area:
+    for trace in _meta_area_traces(
+        go, meta, tags, color_encoding, minimal_meta_info_with_minutes
+    ):
         fig.add_trace(trace, row=2, col=1)
 
+    for trace in markers:
+        fig.add_trace(trace, row=1, col=1)
+
     for param in dataframe.columns:
+        series = dataframe[param]
+        if max_points is not None:
+            series = decimate(series, max_points)
+        # WebGL draws long series much faster than SVG
         fig.add_trace(
-            go.Scatter(
-                x=dataframe.index,
-                y=dataframe[param].values,
+            go.Scattergl(
+                x=series.index.to_numpy(),
+                y=series.values,
                 name=param,
+                connectgaps=connect_gaps,
                 # line=dict(color=line_color, width=1.5),
             ),
             row=1,
@@ -227,7 +296,6 @@ def generate_meta_plot(
             "y": 0.95,
             "x": 0.5,
         },
-        annotations=annotations,
         yaxis2=dict(domain=[0, 0.12]),
         yaxis1=dict(domain=[0.14, 1]),
     )
@@ -239,3 +307,42 @@ def generate_meta_plot(
 
     else:
         py.plot(fig, filename=filename, auto_open=auto_open)
+
+
+def generate_availability_plot(
+    counts,
+    plot_title="Data Availability",
+    filename="availability.html",
+    auto_open=True,
+    inline=False,
+):
+    """A heatmap of `counts`, a dataframe of the number of signals with a row per
+    source and a column per time bucket."""
+    import plotly.graph_objects as go
+    import plotly.offline as py
+
+    fig = go.Figure(
+        go.Heatmap(
+            z=counts.to_numpy(),
+            x=counts.columns.astype(str).to_numpy(),
+            y=counts.index.astype(str).to_numpy(),
+            colorscale="Viridis",
+            colorbar=dict(title="signals"),
+            hovertemplate="%{y}<br>%{x}<br>%{z} signals<extra></extra>",
+        )
+    )
+    fig.update_layout(
+        title={
+            "text": f'<span style="font-size: 20px;"><b>{plot_title}</b></span>',
+            "y": 0.95,
+            "x": 0.5,
+        },
+        height=max(400, 20 * counts.shape[0] + 200),
+    )
+    fig.update_yaxes(autorange="reversed")
+
+    if inline:
+        return fig
+
+    else:
+        py.plot(fig, filename=filename, auto_open=auto_open)
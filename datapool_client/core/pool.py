@@ -0,0 +1,176 @@
+import atexit as _atexit
+import threading as _threading
+import time as _time
+from collections import deque as _deque
+
+import psycopg2 as _psycopg2
+from psycopg2 import extensions as _extensions
+
+POOL_SETTINGS = {
+    # maximal number of idle connections kept per set of connection details
+    "max_size": 10,
+    # seconds after which an idle connection is closed
+    "max_idle_time": 300,
+    # seconds of idleness after which a connection is pinged on checkout
+    "health_check_after": 30,
+}
+
+
+class ConnectionPool:
+    """Keeps idle psycopg2 connections of one set of connection details for reuse.
+
+    Connections are handed out with `get_connection` and must be given back with
+    `put_connection`. Connections that have been idle for a while are pinged before
+    they are handed out again, connections idle longer than `max_idle_time` are closed
+    and no more than `max_size` idle connections are kept. The pool never blocks:
+    if no idle connection is available a new one is opened.
+    """
+
+    def __init__(self, connection_details):
+        self._connection_details = connection_details
+        self._idle = _deque()
+        self._lock = _threading.Lock()
+
+    def __len__(self):
+        return len(self._idle)
+
+    def _new_connection(self):
+        return _psycopg2.connect(
+            host=self._connection_details["host"],
+            port=self._connection_details["port"],
+            database=self._connection_details["database"],
+            user=self._connection_details["user"],
+            password=self._connection_details["password"],
+        )
+
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.close()
+        except _psycopg2.Error:
+            pass
+
+    @staticmethod
+    def _is_healthy(conn, idle_since):
+        if conn.closed:
+            return False
+
+        if conn.get_transaction_status() != _extensions.TRANSACTION_STATUS_IDLE:
+            return False
+
+        if _time.monotonic() - idle_since < POOL_SETTINGS["health_check_after"]:
+            return True
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+        except _psycopg2.Error:
+            return False
+
+        return True
+
+    def _evict_idle(self):
+        """Removes connections idle for too long, must be called holding the lock."""
+        deadline = _time.monotonic() - POOL_SETTINGS["max_idle_time"]
+        expired = []
+        # the oldest connections sit on the left side of the deque
+        while self._idle and self._idle[0][1] < deadline:
+            expired.append(self._idle.popleft()[0])
+        return expired
+
+    def get_connection(self):
+        while True:
+            with self._lock:
+                expired = self._evict_idle()
+                conn, idle_since = self._idle.pop() if self._idle else (None, None)
+
+            for old in expired:
+                self._discard(old)
+
+            if conn is None:
+                return self._new_connection()
+
+            if self._is_healthy(conn, idle_since):
+                return conn
+
+            self._discard(conn)
+
+    def put_connection(self, conn):
+        if conn.closed:
+            return
+
+        try:
+            if conn.get_transaction_status() != _extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except _psycopg2.Error:
+            self._discard(conn)
+            return
+
+        with self._lock:
+            if len(self._idle) < POOL_SETTINGS["max_size"]:
+                self._idle.append((conn, _time.monotonic()))
+                return
+
+        self._discard(conn)
+
+    def close(self):
+        with self._lock:
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+
+        for conn in idle:
+            self._discard(conn)
+
+
+_POOLS = {}
+_POOLS_LOCK = _threading.Lock()
+
+
+def _pool_key(connection_details):
+    return tuple(sorted((key, str(val)) for key, val in connection_details.items()))
+
+
+def get_pool(connection_details):
+    """Returns the process wide pool belonging to the connection details."""
+    key = _pool_key(connection_details)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = ConnectionPool(dict(connection_details))
+    return pool
+
+
+def configure_pool(*, max_size=None, max_idle_time=None, health_check_after=None):
+    """
+    Description
+    -----------
+
+    Changes the settings of all connection pools.
+
+    Parameter
+    ---------
+
+    max_size:               int, maximal number of idle connections kept per database, 0 disables pooling
+    max_idle_time:          float, seconds after which an idle connection is closed
+    health_check_after:     float, seconds of idleness after which a connection is checked before reuse
+    """
+    settings = dict(
+        max_size=max_size,
+        max_idle_time=max_idle_time,
+        health_check_after=health_check_after,
+    )
+    POOL_SETTINGS.update({key: val for key, val in settings.items() if val is not None})
+
+
+def close_pools():
+    """Closes all idle connections of all pools."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+
+    for pool in pools:
+        pool.close()
+
+
+_atexit.register(close_pools)
@@ -0,0 +1,134 @@
+"""SELECT statements that join only the tables their columns, filters and order use."""
+
+import re as _re
+
+# `table.` in front of a column, values are bound as parameters, so there are no
+# string literals to trip over
+_TABLE_REFERENCE = _re.compile(r"\b([a-z_][a-z0-9_]*)\.[a-z_]")
+
+
+def referenced_tables(expression):
+    """The tables whose columns the expression refers to as `table.column`."""
+    return set(_TABLE_REFERENCE.findall(expression))
+
+
+class Join:
+    """
+    Description
+    -----------
+
+    A join of a Select, it is only added if the statement uses the joined table.
+
+    Parameters
+    ----------
+    table:      str, the joined table
+    clause:     str, the join clause, e.g. "INNER JOIN site ON signal.site_id = site.site_id",
+                the other tables it refers to are joined as well
+    """
+
+    def __init__(self, table, clause):
+        self.table = table
+        self.clause = clause
+        self.requires = referenced_tables(clause) - {table}
+
+
+class Select:
+    """
+    Description
+    -----------
+
+    Builds a SELECT statement on `table` step by step. The joins are given up front
+    as a graph and only those of the tables used by the columns, filters and order of
+    the statement (and the ones these joins depend on) end up in the statement.
+
+    Tables that are only needed to filter should be referred to by a subquery on
+    unqualified columns, e.g. "signal.site_id = ANY(ARRAY(SELECT site_id FROM site WHERE
+    name = %(site_name)s))", which filters the rows of `table` before any join.
+
+    Parameters
+    ----------
+    table:      str, the table selected from
+    joins:      list of Join, in an order in which every join comes after the ones it requires
+
+    Example
+    -------
+    query = Select("signal", [Join("site", "INNER JOIN site ON signal.site_id = site.site_id")])
+    query.column("signal.value", "value").column("site.name", "site")
+    query.where("signal.timestamp >= %(start)s::timestamp").order_by("signal.timestamp")
+    query.sql()
+    """
+
+    def __init__(self, table, joins=()):
+        self.table = table
+        self.joins = {join.table: join for join in joins}
+        self.columns = []
+        self.filters = []
+        self.groups = []
+        self.order = []
+        self.limit = None
+
+    def column(self, expression, name):
+        """Adds `expression AS name` to the selected columns."""
+        self.columns.append((expression, name))
+        return self
+
+    def where(self, predicate):
+        """Adds the predicate to the filters, which are combined by AND."""
+        self.filters.append(predicate)
+        return self
+
+    def group_by(self, expression):
+        """Groups the rows by the expression, the columns that are no groups must aggregate."""
+        self.groups.append(expression)
+        return self
+
+    def order_by(self, expression, descending=False):
+        self.order.append(f"{expression} {'DESC' if descending else 'ASC'}")
+        return self
+
+    def limit_to(self, limit):
+        """Limits the number of rows, limit is a number or a placeholder."""
+        self.limit = limit
+        return self
+
+    @property
+    def names(self):
+        """The names of the selected columns."""
+        return [name for _, name in self.columns]
+
+    def tables(self):
+        """The joined tables the statement needs."""
+        used = set()
+        for expression in [
+            *(expression for expression, _ in self.columns),
+            *self.filters,
+            *self.groups,
+            *self.order,
+        ]:
+            used |= referenced_tables(expression)
+
+        needed = set()
+        pending = used & set(self.joins)
+        while pending:
+            table = pending.pop()
+            needed.add(table)
+            pending |= (self.joins[table].requires & set(self.joins)) - needed
+        return needed
+
+    def sql(self):
+        tables = self.tables()
+        lines = [
+            "SELECT "
+            + ", ".join(f"{expression} AS {name}" for expression, name in self.columns),
+            f"FROM {self.table}",
+        ]
+        lines += [join.clause for table, join in self.joins.items() if table in tables]
+        if self.filters:
+            lines.append("WHERE " + "\nAND ".join(self.filters))
+        if self.groups:
+            lines.append("GROUP BY " + ", ".join(self.groups))
+        if self.order:
+            lines.append("ORDER BY " + ", ".join(self.order))
+        if self.limit is not None:
+            lines.append(f"LIMIT {self.limit}")
+        return "\n".join(lines)
@@ -0,0 +1,176 @@
+"""Rollup tables holding the aggregates of the signals per hour or day."""
+
+import threading as _threading
+import time as _time
+
+import pandas as _pd
+
+# origin of the time buckets of resampled queries and rollups, i.e. they are aligned
+# to midnight
+BUCKET_ORIGIN = "2000-01-01"
+
+# name -> width of the rollups ToolBox.create_rollups can create, the table of a
+# rollup is signal_rollup_<name>
+ROLLUP_WIDTHS = {"1h": "1 hour", "1d": "1 day"}
+
+# the rollups and up to which timestamp (exclusive) their buckets are complete
+CREATE_REGISTRY = """
+    CREATE TABLE IF NOT EXISTS signal_rollup (
+        name text PRIMARY KEY,
+        width interval NOT NULL,
+        covered_until timestamp
+    );
+"""
+
+# the columns of the rollup take the types of the signal table, rows with a NULL value
+# are counted by neither count nor sum
+CREATE_ROLLUP = """
+    CREATE TABLE IF NOT EXISTS {table} AS
+    SELECT
+        timestamp,
+        source_id,
+        variable_id,
+        site_id,
+        count(value) AS count,
+        min(value) AS min,
+        max(value) AS max,
+        sum(value::double precision) AS sum
+    FROM signal
+    GROUP BY timestamp, source_id, variable_id, site_id
+    WITH NO DATA;
+    CREATE INDEX IF NOT EXISTS {table}_source_timestamp ON {table} (source_id, timestamp);
+    INSERT INTO signal_rollup (name, width) VALUES (%(name)s, %(width)s::interval)
+    ON CONFLICT (name) DO NOTHING;
+"""
+
+# re-aggregates the complete buckets from the bucket of `start` (or where the last
+# refresh stopped) up to the bucket of `end`
+REFRESH_ROLLUP = f"""
+    WITH bounds AS (
+        SELECT
+            date_bin(width, COALESCE(
+                LEAST(%(start)s::timestamp, covered_until),
+                (SELECT min(timestamp) FROM signal)
+            ), TIMESTAMP '{BUCKET_ORIGIN}') AS start,
+            date_bin(width, COALESCE(%(end)s::timestamp, LOCALTIMESTAMP), TIMESTAMP '{BUCKET_ORIGIN}') AS end,
+            width
+        FROM signal_rollup
+        WHERE name = %(name)s
+        FOR UPDATE
+    ), removed AS (
+        DELETE FROM {{table}}
+        WHERE timestamp >= (SELECT start FROM bounds)
+    ), added AS (
+        INSERT INTO {{table}}
+        SELECT
+            date_bin(bounds.width, signal.timestamp, TIMESTAMP '{BUCKET_ORIGIN}'),
+            signal.source_id,
+            signal.variable_id,
+            signal.site_id,
+            count(signal.value),
+            min(signal.value),
+            max(signal.value),
+            sum(signal.value::double precision)
+        FROM signal, bounds
+        WHERE signal.timestamp >= bounds.start
+        AND signal.timestamp < bounds.end
+        GROUP BY 1, 2, 3, 4
+    )
+    UPDATE signal_rollup
+    SET covered_until = bounds.end
+    FROM bounds
+    WHERE signal_rollup.name = %(name)s
+    RETURNING bounds.start, bounds.end;
+"""
+
+REGISTRY_EXISTS = "SELECT to_regclass('signal_rollup') IS NOT NULL;"
+
+ROLLUPS_QUERY = """
+    SELECT name, extract(epoch FROM width), covered_until
+    FROM signal_rollup
+    WHERE covered_until IS NOT NULL;
+"""
+
+# aggregates of the values of signals per time bucket from the rows of a rollup, see
+# SIGNAL_AGGREGATES
+ROLLUP_AGGREGATES = {
+    "mean": "sum(signal.sum) / sum(signal.count)",
+    "min": "min(signal.min)",
+    "max": "max(signal.max)",
+    "sum": "sum(signal.sum)",
+    "count": "sum(signal.count)::bigint",
+}
+
+
+def rollup_table(name):
+    return f"signal_rollup_{name}"
+
+
+class Rollups:
+    """
+    Description
+    -----------
+
+    Keeps which rollups exist and up to where they are complete, so that resampled
+    signal queries can read the aggregates of complete buckets from the coarsest
+    suitable rollup instead of the signal table. The registry is reloaded once it is
+    older than `ttl` seconds.
+
+    Parameters
+    ----------
+    load:       callable, runs a query and returns its rows as tuples
+    ttl:        float, seconds after which the registry is reloaded
+    """
+
+    def __init__(self, load, ttl=300):
+        self._load = load
+        self.ttl = ttl
+        self._rollups = None
+        self._loaded_at = None
+        self._lock = _threading.Lock()
+
+    def _registry(self):
+        with self._lock:
+            if self._rollups is None or _time.monotonic() - self._loaded_at > self.ttl:
+                rows = []
+                if self._load(REGISTRY_EXISTS)[0][0]:
+                    rows = self._load(ROLLUPS_QUERY)
+                self._rollups = [
+                    (
+                        rollup_table(name),
+                        _pd.Timedelta(seconds=float(width)),
+                        _pd.Timestamp(covered_until),
+                    )
+                    for name, width, covered_until in rows
+                ]
+                self._loaded_at = _time.monotonic()
+            return self._rollups
+
+    def refresh(self):
+        """Reloads the registry, e.g. after the rollups have been refreshed."""
+        with self._lock:
+            self._rollups = None
+
+    def route(self, bucket, aggregates):
+        """
+        Parameters
+        ----------
+        bucket:         pd.Timedelta, width of the time buckets of a resampled query
+        aggregates:     iterable of str, the aggregates of the query
+
+        Return
+        ------
+        the table and the covered_until of the coarsest rollup whose buckets add up to
+        those of the query, None if there is none
+        """
+        if not set(aggregates) <= set(ROLLUP_AGGREGATES):
+            return None
+        suitable = [
+            (width, table, covered_until)
+            for table, width, covered_until in self._registry()
+            if bucket % width == _pd.Timedelta(0)
+        ]
+        if not suitable:
+            return None
+        _, table, covered_until = max(suitable)
+        return table, covered_until
@@ -0,0 +1,121 @@
+import io as _io
+import threading as _threading
+from collections import deque as _deque
+
+
+class CopyPipe(_io.RawIOBase):
+    """Connects the output of a COPY with a reader without spooling it to disk.
+
+    The COPY writes into the pipe from a background thread while the reader is
+    consuming it. The writer blocks as soon as `buffer_size` bytes are waiting, so
+    no more than about `buffer_size` bytes are held in memory at any time. COPY
+    writes row by row, rows are collected into chunks of up to `CHUNK_SIZE` bytes
+    before they are handed over to the reader.
+    """
+
+    CHUNK_SIZE = 2**16
+
+    def __init__(self, buffer_size):
+        super().__init__()
+        self._buffer_size = buffer_size
+        self._chunk_size = min(buffer_size, self.CHUNK_SIZE)
+        self._pending = bytearray()
+        self._chunks = _deque()
+        self._size = 0
+        self._condition = _threading.Condition()
+        self._finished = False
+        self._error = None
+
+    def readable(self):
+        return True
+
+    def write(self, data):
+        self._pending += data
+        if len(self._pending) >= self._chunk_size:
+            self._flush()
+        return len(data)
+
+    def _flush(self):
+        if not self._pending:
+            return
+
+        with self._condition:
+            while self._size >= self._buffer_size and not self.closed:
+                self._condition.wait()
+
+            if self.closed:
+                raise ValueError("The reading side of the pipe has been closed.")
+
+            self._chunks.append(bytes(self._pending))
+            self._size += len(self._pending)
+            self._pending.clear()
+            self._condition.notify_all()
+
+    def finish(self, error=None):
+        with self._condition:
+            self._finished = True
+            self._error = error
+            self._condition.notify_all()
+
+    def readinto(self, buffer):
+        with self._condition:
+            while not self._chunks and not self._finished:
+                self._condition.wait()
+
+            if not self._chunks:
+                if self._error is not None:
+                    raise self._error
+                return 0
+
+            n_bytes = 0
+            view = memoryview(buffer)
+            while self._chunks and n_bytes < len(view):
+                chunk = self._chunks.popleft()
+                taken = chunk[: len(view) - n_bytes]
+                view[n_bytes : n_bytes + len(taken)] = taken
+                n_bytes += len(taken)
+                if len(taken) < len(chunk):
+                    self._chunks.appendleft(chunk[len(taken) :])
+
+            self._size -= n_bytes
+            self._condition.notify_all()
+            return n_bytes
+
+    def close(self):
+        with self._condition:
+            super().close()
+            self._chunks.clear()
+            self._condition.notify_all()
+
+
+def read_copy_streamed(cursor, copy_sql, parse, buffer_size):
+    """
+    Parameters
+    ----------
+    cursor:         psycopg2 cursor, running the COPY ... TO STDOUT statement
+    copy_sql:       str, the COPY statement
+    parse:          callable, receiving a binary file object that yields the COPY output
+    buffer_size:    int, maximal number of bytes held between the COPY and the parser
+
+    Return
+    ------
+    the result of parse
+    """
+    pipe = CopyPipe(buffer_size)
+
+    def copy():
+        try:
+            cursor.copy_expert(copy_sql, pipe)
+            pipe._flush()
+        except BaseException as error:
+            pipe.finish(error)
+        else:
+            pipe.finish()
+
+    thread = _threading.Thread(target=copy, daemon=True)
+    thread.start()
+    try:
+        return parse(_io.BufferedReader(pipe, buffer_size=min(buffer_size, 2**18)))
+    finally:
+        pipe.close()
+        thread.join()
@@ -1,3 +1,4 @@
+import re as _re
 from datetime import datetime as _dt
 
 from datapool_client import CONFIG_PATH
@@ -50,6 +51,11 @@ def parse_dates(start, end):
     return st.strftime("%Y-%m-%d %H:%M:%S"), en.strftime("%Y-%m-%d %H:%M:%S")
 
 
+def format_timestamp(timestamp):
+    """Formats a datetime like the results of parse_dates, keeping fractions of seconds."""
+    return timestamp.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
 def replace_in_query(query, items_to_replace):
     for old_term, new_term in items_to_replace.items():
         query = query.replace(old_term, new_term)
@@ -65,6 +71,42 @@ def clean_query_string(query_str, to_replace):
     return replace_in_query(query_str, to_replace)
 
 
+def name_list(names):
+    """The names as list, names are a single str or an iterable like a list or set of them."""
+    if isinstance(names, str):
+        return [names]
+    return list(names)
+
+
+def positional_parameters(query_str, vrs):
+    """
+    Parameters
+    ----------
+    query_str:      str, query with the %s or %(name)s placeholders of psycopg2
+    vrs:            sequence or dict, the values of the placeholders
+
+    Return
+    ------
+    the query with the $1, $2, ... placeholders of postgres and the values in their order
+    """
+    positions = {}
+    values = []
+
+    def replace(match):
+        if match.group() == "%%":
+            return "%"
+        name = match.group(1)
+        if name is None:
+            values.append(vrs[len(values)])
+            return f"${len(values)}"
+        if name not in positions:
+            values.append(vrs[name])
+            positions[name] = len(values)
+        return f"${positions[name]}"
+
+    return _re.sub(r"%%|%\((\w+)\)s|%s", replace, query_str), values
+
+
 def determine_additional_meta_info_columns_of_meta_data_history(meta_columns):
     meta_cols = COLUMN_MAP["meta_data_history_get"]
     return list(set(meta_columns) - set(meta_cols))
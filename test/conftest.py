@@ -38,6 +38,19 @@ def dp(postgresql_proc):
     )
 
 
+@pytest.fixture(scope="session")
+def dp_binary(postgresql_proc):
+    return DataPool(
+        user=postgresql_proc.user,
+        host=postgresql_proc.host,
+        port=postgresql_proc.port,
+        database=postgresql_proc.dbname,
+        password=postgresql_proc.password,
+        verbose=False,
+        copy_format="binary",
+    )
+
+
 @pytest.fixture(scope="session")
 def toolbox(postgresql_proc):
     return ToolBox(
@@ -0,0 +1,75 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from datapool_client import AsyncDataPool
+
+
+def run(dp, coroutine_function):
+    async def main():
+        async with AsyncDataPool(**dp._connection_details, max_workers=4) as adp:
+            return await coroutine_function(adp)
+
+    return asyncio.run(main())
+
+
+def test_signal_get(setup_postgres, dp):
+    async def get(adp):
+        return await adp.signal.get(source_name="source_1_1", without_flags=False)
+
+    pd.testing.assert_frame_equal(
+        run(dp, get), dp.signal.get(source_name="source_1_1", without_flags=False)
+    )
+
+
+def test_gather(setup_postgres, dp):
+    sources = dp.source.all().name.tolist()
+
+    async def gather(adp):
+        return await asyncio.gather(
+            *(adp.source.get_range(source) for source in sources * 5)
+        )
+
+    ranges = run(dp, gather)
+    for source, result in zip(sources * 5, ranges):
+        pd.testing.assert_frame_equal(result, dp.source.get_range(source))
+
+
+def test_tables_and_queries(setup_postgres, dp):
+    async def query(adp):
+        return await asyncio.gather(
+            adp.signal.columns,
+            adp.meta_data_history.get(source_name="source_1_1"),
+            adp.quality.all(),
+            adp.query("SELECT 1"),
+            adp.query_df("SELECT 1 AS one"),
+        )
+
+    columns, history, quality, raw, df = run(dp, query)
+    assert columns == dp.signal.columns
+    assert len(history) == len(dp.meta_data_history.get(source_name="source_1_1"))
+    assert len(quality) == len(dp.quality.all())
+    assert raw["data"] == [(1,)]
+    assert df.one.tolist() == [1]
+
+
+def test_iter_chunks(setup_postgres, dp):
+    async def iterate(adp):
+        return [
+            chunk
+            async for chunk in adp.signal.iter_chunks(
+                source_type_name="source_type_1", chunk_rows=2
+            )
+        ]
+
+    chunks = run(dp, iterate)
+    assert len(chunks) > 1
+    expected = dp.signal.get(source_type_name="source_type_1")
+    assert len(pd.concat(chunks)) == len(expected)
+
+
+def test_unknown_attribute(setup_postgres, dp):
+    adp = AsyncDataPool(**dp._connection_details)
+    with pytest.raises(AttributeError):
+        adp.signal.not_existing
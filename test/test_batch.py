@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+from datapool_client.core.pool import ConnectionPool
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    checked_out = []
+    get_connection = ConnectionPool.get_connection
+
+    def count(pool):
+        checked_out.append(pool)
+        return get_connection(pool)
+
+    monkeypatch.setattr(ConnectionPool, "get_connection", count)
+    return checked_out
+
+
+def test_results_match_direct_calls(setup_postgres, dp, connections):
+    sources = dp.source.all().name.tolist()
+    expected = [
+        (
+            dp.source.get_range(source),
+            dp.site.from_source(source),
+            dp.source_type.from_source(source),
+        )
+        for source in sources
+    ]
+    expected_definitions = dp.special_value_definition.from_source_type("source_type_1")
+
+    connections.clear()
+    with dp.batch(max_queries=4) as batch:
+        results = [
+            (
+                batch.source.get_range(source),
+                batch.site.from_source(source),
+                batch.source_type.from_source(source),
+            )
+            for source in sources
+        ]
+        definitions = batch.special_value_definition.from_source_type("source_type_1")
+        columns = batch.signal.columns
+    # a connection per statement of at most 4 queries
+    assert len(connections) == -(-(3 * len(sources) + 2) // 4)
+
+    for (range_, site, source_type), (
+        expected_range,
+        expected_site,
+        expected_source_type,
+    ) in zip(results, expected):
+        pd.testing.assert_frame_equal(range_.result(), expected_range)
+        pd.testing.assert_frame_equal(site.result(), expected_site)
+        assert source_type.result() == expected_source_type
+    pd.testing.assert_frame_equal(definitions.result(), expected_definitions)
+    assert columns.result() == dp.signal.columns
+
+
+def test_errors(setup_postgres, dp):
+    with dp.batch() as batch:
+        unknown = batch.source.get_range("unknown_source")
+        failing = batch.signal.get(source_name="source_1_1", result="unknown")
+        signals = batch.signal.get(source_name="source_1_1")
+
+    pd.testing.assert_frame_equal(
+        unknown.result(), dp.source.get_range("unknown_source")
+    )
+    with pytest.raises(ValueError):
+        failing.result()
+    pd.testing.assert_frame_equal(
+        signals.result(), dp.signal.get(source_name="source_1_1")
+    )
+
+    with pytest.raises(ValueError):
+        dp.batch().signal.iter_chunks(source_name="source_1_1")
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from datapool_client import DataPool
+from datapool_client.core import abstractions, binary_copy
+
+
+def test_invalid_copy_format(setup_postgres, dp):
+    with pytest.raises(ValueError):
+        DataPool(**dp._connection_details, verbose=False, copy_format="xml")
+
+
+def test_signal_get(setup_postgres, dp, dp_binary):
+    csv = dp.signal.get(source_name="source_1_1", without_flags=False)
+    binary = dp_binary.signal.get(source_name="source_1_1", without_flags=False)
+
+    assert list(binary.columns) == list(csv.columns)
+    assert binary.timestamp.dtype == "datetime64[ns]"
+    assert binary.value.dtype == np.float32
+    pd.testing.assert_series_equal(
+        binary.timestamp, pd.to_datetime(csv.timestamp), check_names=False
+    )
+    np.testing.assert_allclose(binary.value, csv.value)
+    for column in ["unit", "variable", "source", "site", "quality_flag"]:
+        pd.testing.assert_series_equal(binary[column], csv[column], check_dtype=False)
+
+
+def test_fixed_width_columns(setup_postgres, dp_binary):
+    data = dp_binary.query_df(
+        "SELECT signal_id, value::float8, timestamp FROM signal ORDER BY signal_id"
+    )
+    assert data.signal_id.dtype == np.int32
+    assert data.value.dtype == np.float64
+    assert data.timestamp.iloc[0] == pd.Timestamp("2000-01-01 10:00:00")
+
+
+def test_nulls(setup_postgres, dp_binary):
+    data = dp_binary.query_df(
+        "SELECT * FROM (VALUES "
+        "(1::int8, 1.5::float8, 'a'::text, '2020-01-01'::date, true, '2020-01-01 01:00'::timestamptz), "
+        "(NULL, NULL, NULL, NULL, NULL, NULL)"
+        ") AS v(i, f, t, d, b, tz)"
+    )
+    assert data.i.isna().tolist() == [False, True]
+    assert data.f.isna().tolist() == [False, True]
+    assert data.t.isna().tolist() == [False, True]
+    assert data.d.iloc[0] == pd.Timestamp("2020-01-01")
+    assert pd.isna(data.d.iloc[1])
+    assert data.b.tolist() == [True, None]
+    assert str(data.tz.dt.tz) == "UTC"
+
+
+def test_empty_result(setup_postgres, dp_binary):
+    data = dp_binary.signal.get(source_name="not_existing")
+    assert data.empty
+
+
+def test_unsupported_types_fall_back_to_csv(setup_postgres, dp_binary):
+    data = dp_binary.query_df("SELECT 1.5::numeric AS n, interval '1 day' AS i")
+    assert data.n.iloc[0] == 1.5
+
+
+def test_text_and_nulls_match_csv(setup_postgres, dp, dp_binary):
+    query = (
+        "SELECT i, CASE WHEN i % 3 = 0 THEN NULL ELSE repeat('ab', 1 + i % 20) END AS t, "
+        "CASE WHEN i % 5 = 0 THEN NULL ELSE i / 7.0 END::float8 AS f "
+        "FROM generate_series(1, 1000) i"
+    )
+    csv = dp.query_df(query)
+    binary = dp_binary.query_df(query)
+
+    pd.testing.assert_frame_equal(binary, csv, check_dtype=False)
+
+
+def test_sequential_walk_matches_vectorised(setup_postgres, dp_binary, monkeypatch):
+    query = (
+        "SELECT i, CASE WHEN i % 3 = 0 THEN NULL ELSE repeat('ab', 1 + i % 20) END AS t "
+        "FROM generate_series(1, 1000) i"
+    )
+    vectorised = dp_binary.query_df(query)
+
+    monkeypatch.setattr(binary_copy, "_tuple_offsets", lambda *args: None)
+    sequential = dp_binary.query_df(query)
+
+    pd.testing.assert_frame_equal(sequential, vectorised)
+
+
+def test_description_is_cached_per_query_shape(setup_postgres, dp_binary):
+    abstractions._DESCRIPTIONS.clear()
+    dp_binary.signal.get(source_name="source_1_1", end="2021-01-01")
+    dp_binary.signal.get(source_name="source_2_1", end="2021-02-01")
+
+    assert len(abstractions._DESCRIPTIONS) == 1
+
+
+def test_stale_description_is_replaced(setup_postgres, dp, dp_binary):
+    query = "SELECT signal_id, value::float8 FROM signal ORDER BY signal_id"
+    dp_binary.query_df(query)
+    (key,) = [key for key in abstractions._DESCRIPTIONS if key[1] == query]
+    # as if the column had been int8 when the description was cached
+    abstractions._DESCRIPTIONS[key] = ([20, 701], ["signal_id", "value"])
+
+    data = dp_binary.query_df(query)
+
+    pd.testing.assert_frame_equal(data, dp.query_df(query), check_dtype=False)
@@ -0,0 +1,106 @@
+import pandas as pd
+import pytest
+
+from datapool_client import DataPool, SignalCache
+from datapool_client.core.cache import (add_interval, missing_intervals,
+                                        remove_interval)
+
+RANGE = dict(source_name="source_1_1", variable_name="variable_1")
+
+
+@pytest.fixture
+def dp_cached(dp, tmp_path):
+    return DataPool(**dp._connection_details, verbose=False, cache=tmp_path)
+
+
+@pytest.fixture
+def queries(dp_cached, monkeypatch):
+    queries = []
+    query = dp_cached.signal._query
+
+    def count_queries(*args, **kwargs):
+        queries.append(args[0])
+        return query(*args, **kwargs)
+
+    monkeypatch.setattr(dp_cached.signal, "_query", count_queries)
+    return queries
+
+
+def expected(dp, **kwargs):
+    result = dp.signal.get(**RANGE, **kwargs)
+    return result.assign(timestamp=pd.to_datetime(result.timestamp))
+
+
+def test_intervals():
+    intervals = add_interval(add_interval([], 10, 20), 30, 40)
+    assert intervals == [[10, 20], [30, 40]]
+    assert missing_intervals(intervals, 0, 50) == [[0, 9], [21, 29], [41, 50]]
+    assert missing_intervals(intervals, 12, 18) == []
+    assert add_interval(intervals, 21, 29) == [[10, 40]]
+    assert remove_interval(intervals, 15, 35) == [[10, 14], [36, 40]]
+
+
+def test_cache_hit(setup_postgres, dp, dp_cached, queries):
+    first = dp_cached.signal.get(**RANGE, start="2000-01-01", end="2001-01-01")
+    second = dp_cached.signal.get(**RANGE, start="2000-01-01", end="2001-01-01")
+
+    assert len(queries) == 1
+    pd.testing.assert_frame_equal(first, second)
+    pd.testing.assert_frame_equal(
+        first,
+        expected(dp, start="2000-01-01", end="2001-01-01"),
+        check_dtype=False,
+    )
+
+
+def test_top_up(setup_postgres, dp, dp_cached, queries):
+    dp_cached.signal.get(**RANGE, start="2000-01-01", end="2000-01-02")
+    result = dp_cached.signal.get(**RANGE, start="1999-12-31", end="2000-01-05")
+    assert len(queries) == 3
+
+    pd.testing.assert_frame_equal(
+        result,
+        expected(dp, start="1999-12-31", end="2000-01-05"),
+        check_dtype=False,
+    )
+    minimal = dp_cached.signal.get(
+        **RANGE, start="2000-01-01", end="2000-01-03", minimal=True
+    )
+    assert len(queries) == 3
+    assert list(minimal.columns) == ["timestamp", "value", "unit", "variable"]
+
+
+def test_future_is_not_cached(setup_postgres, dp_cached, queries):
+    dp_cached.signal.get(**RANGE, start="2000-01-01", end="2200-01-01")
+    dp_cached.signal.get(**RANGE, start="2000-01-01", end="2200-01-01")
+    assert len(queries) == 2
+
+
+def test_eviction(setup_postgres, dp_cached, tmp_path, queries):
+    dp_cached.signal.cache = SignalCache(tmp_path, max_bytes=0)
+    result = dp_cached.signal.get(**RANGE, start="2000-01-01", end="2001-01-01")
+    assert len(result) > 0
+    assert dp_cached.signal.cache.size() == 0
+
+    dp_cached.signal.get(**RANGE, start="2000-01-01", end="2001-01-01")
+    assert len(queries) == 2
+
+
+def test_invalidate(setup_postgres, dp_cached, queries):
+    dp_cached.signal.get(**RANGE, start="2000-01-01", end="2001-01-01")
+    dp_cached.signal.invalidate_cache(source_name="source_1_1", start="2000-01-02")
+    dp_cached.signal.get(**RANGE, start="2000-01-01", end="2000-01-01 23:00")
+    assert len(queries) == 1
+    dp_cached.signal.get(**RANGE, start="2000-01-01", end="2001-01-01")
+    assert len(queries) == 2
+
+    dp_cached.signal.invalidate_cache()
+    dp_cached.signal.get(**RANGE, start="2000-01-01", end="2001-01-01")
+    assert len(queries) == 3
+
+
+def test_uncacheable_requests_bypass_cache(setup_postgres, dp, dp_cached, queries):
+    dp_cached.signal.get(**RANGE, without_flags=False)
+    dp_cached.signal.get(source_name="source_1_1")
+    assert len(queries) == 2
+    assert dp_cached.signal.cache.size() == 0
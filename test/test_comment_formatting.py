@@ -1,7 +1,27 @@
 import numpy as np
+import pandas as pd
 
-from datapool_client.core.plots import format_comment
+from datapool_client.core.plots import format_comment, format_tag, format_tags
 
 
 def test_format_comment():
     format_comment(np.nan)
+
+
+def test_format_tags():
+    meta = pd.DataFrame(
+        {
+            "log_type": ["source_maintenance", "miscellaneous"],
+            "action_type": ["cleaning", np.nan],
+            "start": pd.to_datetime(["2020-01-01 10:00", "2020-01-02"]),
+            "end": pd.to_datetime(["2020-01-01 12:00", "2020-01-02"]),
+            "comment": ["a comment; " + "long " * 30, np.nan],
+            "meta_flag": ["green", None],
+            "person": ["someone", "someone else"],
+            "depth": [1.5, np.nan],
+            "remark": [np.nan, "remark"],
+        }
+    )
+    tags = format_tags(meta, ["depth", "remark"])
+    expected = meta.apply(format_tag, axis=1, args=(["depth", "remark"],))
+    pd.testing.assert_series_equal(tags, expected)
@@ -1,6 +1,7 @@
 import pytest
 
-from datapool_client.core.config import read_config, set_defaults
+from datapool_client.core import config
+from datapool_client.core.config import _import_defaults, read_config, set_defaults
 
 
 def test_set_defaults_raises(tmp_path):
@@ -59,3 +60,31 @@ def test_set_defaults_too_few_args(tmp_path):
 
     with pytest.raises(TypeError):
         set_defaults(host="", port="", filepath=config_file)
+
+
+def test_config_is_parsed_once(tmp_path, monkeypatch):
+    config_file = tmp_path / "config.ini"
+    conn_details = dict(
+        host="host", port="port", user="user", database="dbname", password="password"
+    )
+    set_defaults(**conn_details, filepath=config_file, test_conn=False)
+
+    parsed = []
+    monkeypatch.setattr(
+        config, "read_config", lambda path: parsed.append(path) or read_config(path)
+    )
+    assert _import_defaults(filepath=config_file) == conn_details
+    assert _import_defaults(filepath=config_file) == conn_details
+    assert len(parsed) == 1
+
+    # a changed file is parsed again
+    set_defaults(
+        **dict(conn_details, host="other_host"),
+        filepath=config_file,
+        test_conn=False,
+        overwrite=True,
+        instance="DEFAULT",
+    )
+    parsed.clear()
+    assert _import_defaults(filepath=config_file)["host"] == "other_host"
+    assert len(parsed) == 1
@@ -1,6 +1,9 @@
 import pandas as pd
+import psycopg2
 import pytest
 
+from datapool_client import DataPool
+
 
 def test_dp_query(setup_postgres, dp):
     data = dp.query("Select * from source;")
@@ -16,3 +19,21 @@ def test_dp_query_df(setup_postgres, dp):
 
     with pytest.raises(AttributeError):
         dp.signal.query_df("Select * from source;")
+
+
+def test_tables_are_created_on_access(setup_postgres, dp):
+    data_pool = DataPool(**dp._connection_details, verbose=False)
+    assert "signal" not in vars(data_pool)
+    assert "signal" in dir(data_pool)
+
+    signal = data_pool.signal
+    assert data_pool.signal is signal
+    assert signal.dimensions is data_pool.source.dimensions
+    with pytest.raises(AttributeError):
+        data_pool.no_table
+
+
+def test_connection_is_checked_on_first_query(dp):
+    data_pool = DataPool(**dict(dp._connection_details, port=1), verbose=False)
+    with pytest.raises(psycopg2.OperationalError):
+        data_pool.query("SELECT 1")
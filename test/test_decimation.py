@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from datapool_client import decimate
+from datapool_client.core.decimation import lttb, min_max
+
+
+def reference_lttb(x, y, max_points):
+    """LTTB point by point, on the buckets of `lttb`."""
+    edges = np.linspace(x[1], x[-2], max_points - 1)
+    buckets = [[] for _ in range(max_points - 2)]
+    for i in range(1, len(x) - 1):
+        bucket = min(np.searchsorted(edges, x[i], side="right") - 1, max_points - 3)
+        buckets[bucket].append(i)
+    buckets = [bucket for bucket in buckets if bucket]
+
+    kept = [0]
+    for i, bucket in enumerate(buckets):
+        following = buckets[i + 1] if i + 1 < len(buckets) else [len(x) - 1]
+        mean_x, mean_y = np.mean(x[following]), np.mean(y[following])
+        a = kept[-1]
+        areas = [
+            abs((x[a] - mean_x) * (y[c] - y[a]) - (x[a] - x[c]) * (mean_y - y[a]))
+            for c in bucket
+        ]
+        kept.append(bucket[int(np.argmax(areas))])
+    return kept + [len(x) - 1]
+
+
+@pytest.fixture
+def irregular():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(0, 1000, 5000))
+    y = np.sin(x / 20) + rng.normal(0, 0.1, len(x))
+    return x, y
+
+
+def test_lttb(irregular):
+    x, y = irregular
+    kept = lttb(x, y, 100)
+    assert len(kept) <= 100
+    assert kept[0] == 0 and kept[-1] == len(x) - 1
+    assert np.all(np.diff(kept) > 0)
+    assert list(kept) == reference_lttb(x, y, 100)
+
+
+def test_min_max(irregular):
+    x, y = irregular
+    kept = min_max(x, y, 100)
+    assert len(kept) <= 100
+    assert kept[0] == 0 and kept[-1] == len(x) - 1
+    assert np.argmin(y) in kept and np.argmax(y) in kept
+
+
+@pytest.mark.parametrize("decimator", [lttb, min_max])
+def test_few_points(decimator):
+    x = np.arange(5.0)
+    assert list(decimator(x, x, 10)) == list(range(5))
+
+
+@pytest.mark.parametrize("method", ["lttb", "min_max"])
+def test_decimate(method):
+    index = pd.date_range("2020-01-01", periods=10000, freq="1min")
+    frame = pd.DataFrame(
+        {"a": np.sin(np.arange(10000) / 100), "b": np.cos(np.arange(10000) / 50)},
+        index=index.strftime("%Y-%m-%d %H:%M:%S"),
+    )
+    frame.iloc[4000:5000, 0] = np.nan
+
+    decimated = decimate(frame, 200, method=method)
+    assert len(decimated) <= 2 * 200 + 200
+    assert decimated.index.is_monotonic_increasing
+    assert decimated.index[0] == frame.index[0]
+    assert decimated.index[-1] == frame.index[-1]
+    # the gap stays a gap
+    assert decimated.a.isna().any()
+    if method == "min_max":
+        assert decimated.a.max() == frame.a.max()
+
+    series = decimate(frame.b, 200, method=method)
+    assert len(series) <= 200
+    pd.testing.assert_series_equal(series, frame.b.loc[series.index])
+
+
+@pytest.mark.parametrize("kwargs", [dict(max_points=2), dict(method="nope")])
+def test_decimate_invalid(kwargs):
+    kwargs = dict(dict(max_points=100), **kwargs)
+    with pytest.raises(ValueError):
+        decimate(pd.Series(np.arange(1000.0)), **kwargs)
@@ -0,0 +1,126 @@
+import pandas as pd
+import pytest
+
+from datapool_client import DataPool
+from datapool_client.core.dimensions import Dimensions
+
+FILTERS = [
+    dict(source_name="source_1_1"),
+    dict(variable_name="variable_1"),
+    dict(variable_name=["variable_1", "variable_2"]),
+    dict(site_name="site_1"),
+    dict(source_type_name="source_type_1"),
+    dict(source_name="source_1_1", variable_name="variable_1", site_name="site_1"),
+    dict(source_name="unknown_source"),
+    dict(source_name=["source_1_1", "source_2_1", "unknown_source"]),
+    dict(site_name={"site_1", "site_2"}, source_type_name=("source_type_1",)),
+    dict(source_type_name=["source_type_1", "source_type_2"]),
+]
+
+
+@pytest.fixture
+def dp_joined(dp):
+    return DataPool(**dp._connection_details, verbose=False, dimension_ttl=None)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("without_flags", [True, False])
+@pytest.mark.parametrize("minimal", [True, False])
+def test_get_matches_joined_names(
+    setup_postgres, dp, dp_joined, filters, without_flags, minimal
+):
+    kwargs = dict(filters, without_flags=without_flags, minimal=minimal)
+    result = dp.signal.get(**kwargs)
+    expected = dp_joined.signal.get(**kwargs)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_get_filters_on_ids(setup_postgres, dp):
+    dp.signal.get(source_name="source_1_1", site_name="site_1")
+    assert "JOIN" not in dp.signal.last_query
+    assert "signal.source_id = ANY(ARRAY[" in dp.signal.last_query
+
+
+def test_get_id_and_range(setup_postgres, dp, dp_joined):
+    pd.testing.assert_frame_equal(
+        dp.signal.get_id(source_name="source_1_1", variable_name="variable_1"),
+        dp_joined.signal.get_id(source_name="source_1_1", variable_name="variable_1"),
+    )
+    pd.testing.assert_frame_equal(
+        dp.source.get_range("source_1_1"), dp_joined.source.get_range("source_1_1")
+    )
+
+
+def test_reload(setup_postgres, dp):
+    loads = []
+
+    def load(query):
+        loads.append(query)
+        return dp.query(query)["data"]
+
+    dimensions = Dimensions(load, ttl=300)
+    source_ids = dimensions.ids("source", "source_1_1")
+    assert len(source_ids) == 1 and len(loads) == 1
+
+    assert dimensions.ids("source", "source_1_1") == source_ids
+    assert len(loads) == 1
+
+    # unknown names might have been added in the meantime
+    assert dimensions.ids("source", "unknown_source") == []
+    assert len(loads) == 2
+
+    dimensions.ttl = 0
+    dimensions.ids("source", "source_1_1")
+    assert len(loads) == 3
+
+
+@pytest.mark.parametrize("without_flags", [True, False])
+def test_get_categorical(setup_postgres, dp, without_flags):
+    expected = dp.signal.get(
+        source_type_name="source_type_1", without_flags=without_flags
+    )
+    result = dp.signal.get(
+        source_type_name="source_type_1",
+        without_flags=without_flags,
+        result="categorical",
+    )
+
+    assert isinstance(result.source.dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(
+        result.astype(expected.dtypes.to_dict()), expected, check_categorical=False
+    )
+
+
+def test_get_normalized(setup_postgres, dp):
+    expected = dp.signal.get(source_type_name="source_type_1")
+    signals, dimensions = dp.signal.get(
+        source_type_name="source_type_1", result="normalized"
+    )
+
+    assert list(signals.columns) == [
+        "timestamp",
+        "value",
+        "variable_id",
+        "source_id",
+        "site_id",
+    ]
+    assert signals.source_id.dtype == "int32"
+    assert set(dimensions) == {"variable", "source", "site"}
+    assert set(dimensions["source"].index) == set(signals.source_id)
+
+    joined = (
+        signals.join(dimensions["variable"], on="variable_id")
+        .join(dimensions["source"], on="source_id")
+        .join(dimensions["site"], on="site_id")
+    )
+    pd.testing.assert_frame_equal(joined[expected.columns], expected)
+
+
+def test_get_result_arguments(setup_postgres, dp, dp_joined):
+    with pytest.raises(ValueError):
+        dp.signal.get(source_name="source_1_1", result="unknown")
+    with pytest.raises(ValueError):
+        dp.signal.get(source_name="source_1_1", result="normalized", to_dataframe=False)
+    with pytest.raises(ValueError):
+        dp_joined.signal.get(source_name="source_1_1", result="categorical")
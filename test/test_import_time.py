@@ -0,0 +1,40 @@
+import pathlib
+import subprocess
+import sys
+
+import datapool_client
+
+# modules only needed for plotting or set_defaults, which take long to import
+HEAVY_MODULES = ["cufflinks", "plotly", "matplotlib", "sqlalchemy"]
+
+
+def imported_modules(statement):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=pathlib.Path(datapool_client.__file__).parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.split("|")[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+def test_import_does_not_load_plotting():
+    imported = imported_modules("import datapool_client")
+
+    assert "datapool_client.core.abstractions" in imported
+    for module in HEAVY_MODULES:
+        assert module not in imported
+
+
+def test_plot_loads_plotting_on_first_use():
+    imported = imported_modules(
+        "from datapool_client.api import plotter; plotter._import_cufflinks()"
+    )
+
+    assert "cufflinks" in imported
+    assert "plotly" in imported
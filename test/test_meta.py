@@ -24,6 +24,17 @@ def test_meta_data_get(setup_postgres, dp):
     dp.meta_data.get(source_name="source_1_1", site_name="site_1")
 
 
+def test_meta_data_get_several_names(setup_postgres, dp):
+    expected = dp.meta_data.get(source_name="source_1_1")
+    assert len(expected)
+    result = dp.meta_data.get(source_name=["source_1_1", "source_1_2"])
+    assert result.equals(expected)
+    result = dp.meta_data.get(
+        source_name={"source_1_1"}, site_name=("site_1", "site_2")
+    )
+    assert result.equals(expected)
+
+
 def test_meta_data_history_get(setup_postgres, dp):
     dp.meta_data_history.get(source_name="source_1_1")
     dp.meta_data_history.get(site_name="site_1")
@@ -40,3 +51,13 @@ def test_meta_data_history_get(setup_postgres, dp):
         start="2021-01-01",
         end="2021-12-01",
     )
+
+
+def test_meta_data_history_get_several_names(setup_postgres, dp):
+    expected = dp.meta_data_history.get(source_name="source_1_1", site_name="site_1")
+    assert len(expected)
+    result = dp.meta_data_history.get(
+        source_name=["source_1_1", "source_2_1"], site_name={"site_1", "site_2"}
+    )
+    assert result.equals(expected)
+    assert dp.meta_data_history.get(source_name=[]).empty
@@ -1,4 +1,5 @@
 import matplotlib
+import pandas as pd
 import pytest
 
 matplotlib.use("Agg")
@@ -71,6 +72,23 @@ def test_plot_with_meta_inline(setup_postgres, plot):
         site_name="site_1",
         inline=True,
     )
+    # an area trace and a hover trace per log type
+    areas = [trace for trace in fig.data if trace.name.startswith("meta_info_")]
+    assert len(areas) == 2 * meta.log_type.nunique()
+    hovers = [trace for trace in areas if trace.mode == "markers"]
+    assert sum(len(trace.text) for trace in hovers) == len(meta)
+    assert [trace.type for trace in fig.data if trace.name in data] == ["scattergl"]
+
+
+def test_plot_with_meta_mark_via_key_word(setup_postgres, plot):
+    data, meta, fig = plot.plot_signal_with_meta(
+        source_name="source_1_1",
+        mark_via_key_word={"comment": "#000000"},
+        inline=True,
+    )
+    markers = [trace for trace in fig.data if trace.name.startswith("meta_marker_")]
+    # a marker at the top per row and one at the bottom per marked row
+    assert sum(len(trace.x) for trace in markers) == 2 * len(meta)
 
 
 def test_plot_with_meta_not_inline(setup_postgres, plot, tmp_path):
@@ -99,3 +117,62 @@ def test_plot_with_meta_only_site(setup_postgres, plot, tmp_path):
         filename=str(tmp_path / "plot_meta_site.html"),
         auto_open=False,
     )
+
+
+def test_plot_width(setup_postgres, plot):
+    data, fig = plot.plot_signal(source_name="source_1_1", width=10, inline=True)
+    assert 0 < data.count().sum() <= 4 * 11 * data.shape[1]
+    assert all(trace.connectgaps for trace in fig.data)
+    plot.plot_signal(source_name="source_1_1", width=10, plot_dynamic=False)
+
+
+def test_plot_with_meta_width(setup_postgres, plot):
+    data, meta, fig = plot.plot_signal_with_meta(
+        source_name="source_1_1", width=10, inline=True
+    )
+    assert 0 < data.count().sum() <= 4 * 11 * data.shape[1]
+
+
+def test_plot_max_points(setup_postgres, plot):
+    data, fig = plot.plot_signal(source_name="source_1_1", max_points=3, inline=True)
+    assert all(len(trace.x) <= len(data) for trace in fig.data)
+    plot.plot_signal(source_name="source_1_1", max_points=3, plot_dynamic=False)
+    data, meta, fig = plot.plot_signal_with_meta(
+        source_name="source_1_1", max_points=3, inline=True
+    )
+    assert all(len(trace.x) <= len(data) for trace in fig.data if trace.name in data)
+
+
+def test_plot_availability(setup_postgres, plot, dp):
+    sources = ["source_1_1", "source_1_2", "no_signals"]
+    counts, fig = plot.plot_availability(sources, bucket="1d", inline=True)
+
+    signals = dp.signal.get(source_name=sources[:2], columns=["timestamp", "source"])
+    expected = signals.groupby(
+        ["source", pd.to_datetime(signals.timestamp).dt.floor("1d")]
+    ).size()
+    assert list(counts.index) == sources
+    assert (counts.loc["no_signals"] == 0).all()
+    assert counts.sum().sum() == len(signals)
+    for (source, day), count in expected.items():
+        assert counts.loc[source, day] == count
+    assert fig.data[0].type == "heatmap"
+    assert fig.data[0].z.shape == counts.shape
+
+
+def test_write_reports(setup_postgres, plot, tmp_path):
+    sources = ["source_1_1", "source_2_1", "no/signals"]
+    paths = plot.write_reports(
+        sources, str(tmp_path), width=100, fetch_workers=2, render_processes=2
+    )
+
+    assert list(paths) == sources
+    assert paths["no/signals"] is None
+    assert (tmp_path / "plotly.min.js").exists()
+    index = (tmp_path / "index.html").read_text()
+    for name in sources[:2]:
+        assert paths[name] == str(tmp_path / f"{name}.html")
+        page = (tmp_path / f"{name}.html").read_text()
+        assert '<script src="plotly.min.js"' in page
+        assert f'href="{name}.html"' in index
+    assert "no/signals: no signals" in index
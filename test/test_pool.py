@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from psycopg2 import extensions
+
+from datapool_client.core.pool import POOL_SETTINGS, configure_pool, get_pool
+
+
+@pytest.fixture
+def pool_settings():
+    settings = POOL_SETTINGS.copy()
+    yield
+    POOL_SETTINGS.update(settings)
+
+
+def test_tables_share_pool(setup_postgres, dp, toolbox):
+    assert dp.signal._pool is dp.source._pool
+    assert dp.signal._pool is toolbox._pool
+    assert dp._pool is get_pool(dp._connection_details)
+
+
+def test_connection_is_reused(setup_postgres, dp):
+    pool = dp._pool
+    conn = pool.get_connection()
+    pool.put_connection(conn)
+
+    dp.source.get_range("source_1_1")
+
+    assert pool.get_connection() is conn
+    pool.put_connection(conn)
+
+
+def test_closed_connection_is_discarded(setup_postgres, dp):
+    pool = dp._pool
+    conn = pool.get_connection()
+    pool.put_connection(conn)
+    conn.close()
+
+    new_conn = pool.get_connection()
+    assert new_conn is not conn
+    assert not new_conn.closed
+    pool.put_connection(new_conn)
+
+
+def test_health_check(setup_postgres, dp, pool_settings):
+    configure_pool(health_check_after=0)
+    pool = dp._pool
+    conn = pool.get_connection()
+    pool.put_connection(conn)
+
+    assert pool.get_connection() is conn
+    pool.put_connection(conn)
+
+
+def test_idle_eviction(setup_postgres, dp, pool_settings):
+    pool = dp._pool
+    conn = pool.get_connection()
+    pool.put_connection(conn)
+
+    configure_pool(max_idle_time=0)
+    new_conn = pool.get_connection()
+    assert new_conn is not conn
+    assert conn.closed
+    pool.put_connection(new_conn)
+
+
+def test_max_size(setup_postgres, dp, pool_settings):
+    configure_pool(max_size=1)
+    pool = dp._pool
+    pool.close()
+    first, second = pool.get_connection(), pool.get_connection()
+    pool.put_connection(first)
+    pool.put_connection(second)
+
+    assert len(pool) == 1
+    assert second.closed
+
+    configure_pool(max_size=0)
+    dp.site.all()
+    assert len(pool) == 0
+
+
+def test_lost_connection_is_replaced(setup_postgres, dp):
+    pool = dp._pool
+    conn = pool.get_connection()
+    pid = conn.get_backend_pid()
+    pool.put_connection(conn)
+
+    other = pool._new_connection()
+    with other.cursor() as cur:
+        cur.execute("SELECT pg_terminate_backend(%s)", (pid,))
+    other.close()
+
+    assert len(dp.site.all()) > 0
+    assert dp.query("SELECT 1")["data"] == [(1,)]
+    assert conn.closed
+
+
+def test_shared_data_pool_in_threads(setup_postgres, dp):
+    sources = ["source_1_1", "source_1_2", "source_2_1"]
+    expected = {
+        source: (
+            dp.signal.get(source_name=source, without_flags=False),
+            dp.source.get_range(source),
+        )
+        for source in sources
+    }
+
+    def hammer(i):
+        source = sources[i % len(sources)]
+        for _ in range(10):
+            signals = dp.signal.get(source_name=source, without_flags=False)
+            source_range = dp.source.get_range(source)
+            pd.testing.assert_frame_equal(signals, expected[source][0])
+            pd.testing.assert_frame_equal(source_range, expected[source][1])
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        for future in [executor.submit(hammer, i) for i in range(32)]:
+            future.result()
+
+    pool = dp._pool
+    assert len(pool) <= POOL_SETTINGS["max_size"]
+    idle = [pool.get_connection() for _ in range(len(pool))]
+    for conn in idle:
+        assert conn.get_transaction_status() == extensions.TRANSACTION_STATUS_IDLE
+        pool.put_connection(conn)
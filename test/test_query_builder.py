@@ -0,0 +1,73 @@
+import pytest
+
+from datapool_client.core.abstractions import SIGNAL_JOINS
+from datapool_client.core.query_builder import Select, referenced_tables
+
+
+def test_referenced_tables():
+    assert referenced_tables(
+        "COALESCE(signals_signal_quality_association.signal_quality_id, 0)"
+    ) == {"signals_signal_quality_association"}
+    assert referenced_tables("%(start)s::timestamp <= signal.timestamp") == {"signal"}
+    assert referenced_tables("value > 1.5") == set()
+
+
+@pytest.mark.parametrize(
+    "columns, expected",
+    [
+        (["signal.value"], set()),
+        (["variable.name"], {"variable"}),
+        (["source_type.name"], {"source", "source_type"}),
+        (
+            ["quality.flag"],
+            {"signals_signal_quality_association", "signal_quality", "quality"},
+        ),
+    ],
+)
+def test_joins_only_used_tables(columns, expected):
+    query = Select("signal", SIGNAL_JOINS)
+    for i, column in enumerate(columns):
+        query.column(column, f"column_{i}")
+    query.where(
+        "signal.site_id = ANY(ARRAY(SELECT site_id FROM site WHERE name = %(site)s))"
+    )
+
+    assert query.tables() == expected
+    sql = query.sql()
+    assert sql.count("JOIN") == len(expected)
+    # the joins are in the order of the graph
+    joined = [line.split()[2] for line in sql.splitlines() if " JOIN " in line]
+    assert joined == [join.table for join in SIGNAL_JOINS if join.table in expected]
+
+
+def test_sql():
+    query = (
+        Select("signal", SIGNAL_JOINS)
+        .column("signal.timestamp", "timestamp")
+        .column("site.name", "site")
+        .where("signal.timestamp >= %(start)s::timestamp")
+        .order_by("signal.timestamp", descending=True)
+        .limit_to("%(page_size)s")
+    )
+
+    assert query.names == ["timestamp", "site"]
+    assert query.sql() == (
+        "SELECT signal.timestamp AS timestamp, site.name AS site\n"
+        "FROM signal\n"
+        "INNER JOIN site ON signal.site_id = site.site_id\n"
+        "WHERE signal.timestamp >= %(start)s::timestamp\n"
+        "ORDER BY signal.timestamp DESC\n"
+        "LIMIT %(page_size)s"
+    )
+
+
+def test_group_by():
+    query = (
+        Select("signal", SIGNAL_JOINS)
+        .column("variable.name", "variable")
+        .column("max(signal.value)", "value")
+        .group_by("variable.name")
+    )
+
+    assert query.tables() == {"variable"}
+    assert query.sql().endswith("\nGROUP BY variable.name")
@@ -0,0 +1,85 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from datapool_client import DataPool, Plot
+from datapool_client.core.rollups import REGISTRY_EXISTS, Rollups
+
+
+@pytest.fixture
+def rollups(setup_postgres, toolbox):
+    toolbox.create_rollups()
+    yield
+    with toolbox._connection() as con:
+        with con.cursor() as cur:
+            cur.execute("DROP TABLE signal_rollup, signal_rollup_1h, signal_rollup_1d;")
+        con.commit()
+
+
+def test_route():
+    def load(query):
+        if query == REGISTRY_EXISTS:
+            return [(True,)]
+        return [
+            ("1h", 3600.0, datetime(2001, 1, 1)),
+            ("1d", 86400.0, datetime(2000, 6, 1)),
+        ]
+
+    rollups = Rollups(load)
+    assert rollups.route(pd.Timedelta("2D"), ["mean", "count"]) == (
+        "signal_rollup_1d",
+        pd.Timestamp("2000-06-01"),
+    )
+    assert rollups.route(pd.Timedelta("3h"), ["max"])[0] == "signal_rollup_1h"
+    assert rollups.route(pd.Timedelta("30min"), ["max"]) is None
+    assert rollups.route(pd.Timedelta("1D"), ["median"]) is None
+
+
+def test_no_rollups(setup_postgres, dp):
+    assert (
+        Rollups(lambda query: dp.query(query)["data"]).route(
+            pd.Timedelta("1D"), ["mean"]
+        )
+        is None
+    )
+
+
+@pytest.mark.parametrize("rule", ["1h", "1D", "2D", "30min"])
+def test_resample_reads_rollups(rollups, toolbox, dp, capsys, rule):
+    refreshed = toolbox.refresh_rollups(end="2000-01-02 12:30:00")
+    assert refreshed["1h"][1] == datetime(2000, 1, 2, 12)
+    assert refreshed["1d"][1] == datetime(2000, 1, 2)
+
+    routed = DataPool(**dp._connection_details, verbose=False, rollup_ttl=0)
+    signals = DataPool(**dp._connection_details, verbose=False, rollup_ttl=None)
+    kwargs = dict(
+        source_type_name=["source_type_1", "source_type_2"],
+        start="2000-01-01 10:30:00",
+        resample=rule,
+        agg=["mean", "min", "max", "count", "sum"],
+    )
+    expected = signals.signal.get(**kwargs)
+    sort = ["timestamp", "variable", "source"]
+
+    for start in [None, "2000-01-01"]:
+        # re-aggregating from start gives the same rollups
+        toolbox.refresh_rollups(start=start)
+        result = routed.signal.get(**kwargs, show_query=True)
+        assert ("FROM signal_rollup_" in capsys.readouterr().out) == (rule != "30min")
+        pd.testing.assert_frame_equal(
+            result.sort_values(sort).reset_index(drop=True),
+            expected.sort_values(sort).reset_index(drop=True),
+        )
+
+
+def test_plot_availability_reads_rollups(rollups, toolbox, dp, capsys):
+    toolbox.refresh_rollups()
+    routed = Plot(**dp._connection_details, verbose=False, rollup_ttl=0)
+    signals = Plot(**dp._connection_details, verbose=False, rollup_ttl=None)
+    sources = ["source_1_1", "source_1_2"]
+
+    expected = signals.plot_availability(sources, inline=True)[0]
+    counts = routed.plot_availability(sources, inline=True, show_query=True)[0]
+    assert "FROM signal_rollup_1d" in capsys.readouterr().out
+    pd.testing.assert_frame_equal(counts, expected)
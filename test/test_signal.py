@@ -1,6 +1,9 @@
 import matplotlib
+import pandas as pd
 import pytest
 
+from datapool_client import DataPool, reshape
+
 matplotlib.use("Agg")
 
 
@@ -45,6 +48,182 @@ def test_get_fast(setup_postgres, dp):
     ans4 = dp.signal.get(source_name="source_1_1", without_flags=True, minimal=False)
 
 
+@pytest.mark.parametrize("dimension_ttl", [300, None])
+@pytest.mark.parametrize(
+    "filter_name, names",
+    [
+        ("source_name", ["source_1_1", "source_2_2"]),
+        ("site_name", ["site_1", "site_2"]),
+        ("source_type_name", ["source_type_1", "source_type_3"]),
+    ],
+)
+def test_get_several_names(setup_postgres, dp, dimension_ttl, filter_name, names):
+    dp = DataPool(**dp._connection_details, verbose=False, dimension_ttl=dimension_ttl)
+    expected = pd.concat(
+        [dp.signal.get(**{filter_name: name}) for name in names], ignore_index=True
+    )
+    expected = expected.sort_values(list(expected.columns)).reset_index(drop=True)
+
+    for several in (names, set(names), tuple(names)):
+        result = dp.signal.get(**{filter_name: several})
+        pd.testing.assert_frame_equal(
+            result.sort_values(list(result.columns)).reset_index(drop=True), expected
+        )
+    assert len(
+        dp.signal.get(**{filter_name: names}, to_dataframe=False)["data"]
+    ) == len(expected)
+
+
+@pytest.mark.parametrize("dimension_ttl", [300, None])
+@pytest.mark.parametrize(
+    "columns",
+    [
+        ["timestamp", "value", "variable"],
+        ["site", "value"],
+        ["source_type", "timestamp", "serial"],
+        ["quality_flag", "timestamp", "value"],
+    ],
+)
+def test_get_columns(setup_postgres, dp, dimension_ttl, columns):
+    dp = DataPool(**dp._connection_details, verbose=False, dimension_ttl=dimension_ttl)
+    without_flags = "quality_flag" not in columns
+    expected = dp.signal.get(source_name="source_1_1", without_flags=without_flags)
+
+    result = dp.signal.get(source_name="source_1_1", columns=columns)
+    assert list(result.columns) == columns
+    pd.testing.assert_frame_equal(result, expected[columns])
+
+
+def test_get_columns_joins_only_their_tables(setup_postgres, dp):
+    signals = dp.signal.get(
+        source_name="source_1_1",
+        columns=["timestamp", "value", "variable"],
+        to_dataframe=False,
+    )
+    assert len(signals["data"][0]) == 3
+    assert "JOIN variable" in dp.signal.last_query
+    assert "JOIN site" not in dp.signal.last_query
+    assert "JOIN source" not in dp.signal.last_query
+
+
+@pytest.mark.parametrize("columns", [[], ["timestamp", "nope"], ["value", "value"]])
+def test_get_columns_invalid(setup_postgres, dp, columns):
+    with pytest.raises(ValueError):
+        dp.signal.get(source_name="source_1_1", columns=columns)
+
+
+@pytest.mark.parametrize("dimension_ttl", [300, None])
+@pytest.mark.parametrize("rule", ["1h", "1D", "2D"])
+def test_resample(setup_postgres, dp, dimension_ttl, rule):
+    dp = DataPool(**dp._connection_details, verbose=False, dimension_ttl=dimension_ttl)
+    groups = ["unit", "variable", "source", "serial", "source_type", "site"]
+    signals = dp.signal.get(source_type_name="source_type_1")
+    timestamps = pd.to_datetime(signals.timestamp)
+    buckets = pd.Timestamp("2000-01-01") + (
+        timestamps - pd.Timestamp("2000-01-01")
+    ) // pd.Timedelta(rule) * pd.Timedelta(rule)
+    expected = (
+        signals.assign(timestamp=buckets, unit=signals.unit.astype(str))
+        .groupby(["timestamp"] + groups, dropna=False)
+        .value.agg(["mean", "min", "max", "count", "first", "last"])
+        .reset_index()
+    )
+
+    result = dp.signal.resample(
+        rule,
+        source_type_name="source_type_1",
+        agg=["mean", "min", "max", "count", "first", "last"],
+    )
+    assert list(result.columns) == ["timestamp"] + list(expected.columns[7:]) + groups
+    result = result.assign(
+        timestamp=pd.to_datetime(result.timestamp), unit=result.unit.astype(str)
+    )
+    sort = ["timestamp", "variable", "source", "site"]
+    pd.testing.assert_frame_equal(
+        result[expected.columns].sort_values(sort).reset_index(drop=True),
+        expected.sort_values(sort).reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_resample_single_aggregate(setup_postgres, dp):
+    result = dp.signal.get(
+        source_name="source_1_1",
+        columns=["timestamp", "variable", "value"],
+        resample="1D",
+        agg="max",
+    )
+    assert list(result.columns) == ["timestamp", "variable", "value"]
+    assert "JOIN site" not in dp.signal.last_query
+    assert not reshape(result).empty
+    assert not reshape(
+        dp.signal.resample("1D", source_name="source_1_1", agg=["min", "max"]),
+        values=["min", "max"],
+    ).empty
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(resample="1D", agg="nope"),
+        dict(resample="1D", agg=[]),
+        dict(resample="0h"),
+        dict(resample="1D", without_flags=False),
+        dict(resample="1D", columns=["timestamp", "variable"]),
+        dict(resample="1D", parallel=2),
+    ],
+)
+def test_resample_invalid(setup_postgres, dp, kwargs):
+    with pytest.raises(ValueError):
+        dp.signal.get(source_name="source_1_1", **kwargs)
+
+
+@pytest.mark.parametrize("dimension_ttl", [300, None])
+@pytest.mark.parametrize("width", [1, 7, 1000])
+def test_get_m4(setup_postgres, dp, dimension_ttl, width):
+    dp = DataPool(**dp._connection_details, verbose=False, dimension_ttl=dimension_ttl)
+    series = ["variable", "source", "site"]
+    signals = dp.signal.get(
+        source_type_name="source_type_1", columns=["timestamp", "value"] + series
+    )
+    signals = signals.assign(timestamp=pd.to_datetime(signals.timestamp))
+    bucket = max(
+        (signals.timestamp.max() - signals.timestamp.min()) / width,
+        pd.Timedelta(microseconds=1),
+    )
+    origin = pd.Timestamp("2000-01-01")
+    signals["bucket"] = (signals.timestamp - origin) // bucket
+    expected = []
+    for _, group in signals.sort_values("timestamp").groupby(["bucket"] + series):
+        by_value = group.sort_values(["value", "timestamp"])
+        expected += [group.iloc[[0, -1]], by_value.iloc[[0]]]
+        expected.append(by_value.dropna(subset=["value"]).iloc[-1:])
+    expected = pd.concat(expected).drop(columns="bucket").drop_duplicates()
+
+    result = dp.signal.get_m4(
+        width,
+        source_type_name="source_type_1",
+        columns=["timestamp", "value"] + series,
+    )
+    assert list(result.columns) == ["timestamp", "value"] + series
+    assert result.timestamp.is_monotonic_increasing
+    result = result.assign(timestamp=pd.to_datetime(result.timestamp))
+    sort = ["timestamp"] + series
+    pd.testing.assert_frame_equal(
+        result.sort_values(sort).reset_index(drop=True),
+        expected.sort_values(sort).reset_index(drop=True),
+        check_dtype=False,
+        check_categorical=False,
+    )
+
+
+def test_get_m4_invalid(setup_postgres, dp):
+    with pytest.raises(ValueError):
+        dp.signal.get_m4(0, source_name="source_1_1")
+    with pytest.raises(ValueError):
+        dp.signal.get_m4(10, source_name="source_1_1", columns=["timestamp", "flag"])
+
+
 def test_get_raw(setup_postgres, dp):
     dp.signal.get(source_name="source_1_1", to_dataframe=False)
     dp.signal.get(variable_name="variable_1", to_dataframe=False)
@@ -68,6 +247,23 @@ def test_get_raw(setup_postgres, dp):
     )
 
 
+def test_get_raw_is_prepared_once(setup_postgres, dp):
+    def prepared():
+        return dp.query("SELECT name FROM pg_prepared_statements")["data"]
+
+    signals = dp.signal.get(source_name="source_1_1", to_dataframe=False)
+    statements = prepared()
+    assert statements
+    assert dp.signal.get(source_name="source_1_1", to_dataframe=False) == signals
+    assert dp.signal.get(source_name="source_1_2", to_dataframe=False)
+    assert prepared() == statements
+
+
+def test_values_are_bound(setup_postgres, dp):
+    assert dp.signal.get(source_name="source_1_1' OR 'a' = 'a").empty
+    assert dp.site.from_source("source_1_1' OR 'a' = 'a").empty
+
+
 def test_get_id(setup_postgres, dp):
     with pytest.raises(TypeError):
         dp.signal.get_id(variable_name="variable_1")
@@ -81,3 +277,151 @@ def test_get_id(setup_postgres, dp):
         start="2021-01-01",
         end="2021-12-01",
     )
+
+
+@pytest.mark.parametrize("without_flags", [True, False])
+@pytest.mark.parametrize("minimal", [True, False])
+@pytest.mark.parametrize("chunk_rows", [1, 2, 1000])
+def test_iter_chunks_rows(setup_postgres, dp, without_flags, minimal, chunk_rows):
+    expected = dp.signal.get(
+        source_type_name="source_type_1", without_flags=without_flags, minimal=minimal
+    )
+    chunks = list(
+        dp.signal.iter_chunks(
+            source_type_name="source_type_1",
+            without_flags=without_flags,
+            minimal=minimal,
+            chunk_rows=chunk_rows,
+        )
+    )
+    if chunk_rows == 1:
+        assert len(chunks) > 1
+    for chunk in chunks:
+        assert list(chunk.columns) == list(expected.columns)
+        assert len(chunk) <= chunk_rows
+
+    result = pd.concat(chunks, ignore_index=True)
+    sort = list(expected.columns)
+    pd.testing.assert_frame_equal(
+        result.sort_values(sort).reset_index(drop=True),
+        expected.sort_values(sort).reset_index(drop=True),
+    )
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 1000])
+def test_iter_chunks_columns(setup_postgres, dp, chunk_rows):
+    columns = ["value", "site"]
+    expected = dp.signal.get(source_type_name="source_type_1", columns=columns)
+    chunks = dp.signal.iter_chunks(
+        source_type_name="source_type_1", columns=columns, chunk_rows=chunk_rows
+    )
+
+    result = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("chunk_interval", ["1H", "1D", pd.Timedelta("400D")])
+def test_iter_chunks_interval(setup_postgres, dp, monkeypatch, chunk_interval):
+    expected = dp.signal.get(site_name="site_1", without_flags=False)
+
+    queries = []
+    query = dp.signal._query
+
+    def count_queries(*args, **kwargs):
+        queries.append(args[0])
+        return query(*args, **kwargs)
+
+    monkeypatch.setattr(dp.signal, "_query", count_queries)
+    chunks = list(
+        dp.signal.iter_chunks(
+            site_name="site_1",
+            start="1999-12-31",
+            end="2021-01-01",
+            without_flags=False,
+            chunk_interval=chunk_interval,
+        )
+    )
+    # windows without signals are skipped instead of queried
+    assert len(queries) <= 3 * len(chunks) + 1
+
+    result = pd.concat(chunks, ignore_index=True)
+    sort = list(expected.columns)
+    pd.testing.assert_frame_equal(
+        result.sort_values(sort).reset_index(drop=True),
+        expected.sort_values(sort).reset_index(drop=True),
+    )
+
+
+def test_iter_chunks_arguments(setup_postgres, dp):
+    with pytest.raises(ValueError):
+        next(dp.signal.iter_chunks(source_name="source_1_1"))
+    with pytest.raises(ValueError):
+        next(
+            dp.signal.iter_chunks(
+                source_name="source_1_1", chunk_rows=10, chunk_interval="1D"
+            )
+        )
+    with pytest.raises(ValueError):
+        next(dp.signal.iter_chunks(chunk_rows=10))
+
+
+@pytest.mark.parametrize("without_flags", [True, False])
+@pytest.mark.parametrize("parallel", [2, 3, 8])
+def test_get_parallel(setup_postgres, dp, without_flags, parallel):
+    expected = dp.signal.get(site_name="site_1", without_flags=without_flags)
+    result = dp.signal.get(
+        site_name="site_1", without_flags=without_flags, parallel=parallel
+    )
+    # rows of equal timestamps come in no particular order
+    sort = list(expected.columns)
+    pd.testing.assert_frame_equal(
+        result.sort_values(sort).reset_index(drop=True),
+        expected.sort_values(sort).reset_index(drop=True),
+        check_dtype=False,
+    )
+    assert result.timestamp.is_monotonic_increasing
+
+
+def test_get_parallel_empty(setup_postgres, dp):
+    result = dp.signal.get(source_name="not_existing", parallel=4)
+    assert result.empty
+    assert list(result.columns) == list(
+        dp.signal.get(source_name="not_existing").columns
+    )
+
+
+def test_parallel_queries_share_snapshot(setup_postgres, dp):
+    snapshots = dp.signal._query_parallel(
+        ["SELECT txid_current_snapshot()::text AS snapshot"] * 4, 4
+    )
+    assert len({frame.snapshot.iloc[0] for frame in snapshots}) == 1
+
+
+@pytest.mark.parametrize("without_flags", [True, False])
+def test_get_typed(setup_postgres, dp, without_flags):
+    dp_typed = DataPool(**dp._connection_details, verbose=False, typed=True)
+    expected = dp.signal.get(
+        source_type_name="source_type_1", without_flags=without_flags
+    )
+    typed = dp_typed.signal.get(
+        source_type_name="source_type_1", without_flags=without_flags
+    )
+
+    assert typed.timestamp.dtype == "datetime64[ns]"
+    assert isinstance(typed.variable.dtype, pd.CategoricalDtype)
+    assert set(typed.variable.cat.categories) == set(expected.variable)
+    pd.testing.assert_series_equal(typed.timestamp, pd.to_datetime(expected.timestamp))
+    pd.testing.assert_frame_equal(
+        typed.astype(expected.dtypes.to_dict()).drop(columns="timestamp"),
+        expected.drop(columns="timestamp"),
+    )
+    reshape(typed, only_values=without_flags)
+
+
+def test_get_float32(setup_postgres, dp):
+    dp_float32 = DataPool(**dp._connection_details, verbose=False, float32=True)
+    expected = dp.signal.get(source_name="source_1_1")
+    values = dp_float32.signal.get(source_name="source_1_1").value
+
+    assert values.dtype == "float32"
+    assert (values == expected.value.astype("float32")).all()
@@ -0,0 +1,90 @@
+import threading
+
+import pandas as pd
+import psycopg2
+import pytest
+
+from datapool_client import DataPool
+from datapool_client.core.streaming import CopyPipe, read_copy_streamed
+
+
+@pytest.fixture
+def dp_streamed(dp):
+    # a tiny buffer makes the COPY wait for the parser all the time
+    return DataPool(**dp._connection_details, verbose=False, stream_buffer_size=64)
+
+
+def test_pipe_holds_no_more_than_buffer_size():
+    pipe = CopyPipe(buffer_size=10)
+    received = []
+
+    def write():
+        for _ in range(100):
+            pipe.write(b"12345")
+        pipe._flush()
+        pipe.finish()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    while True:
+        assert pipe._size <= 20
+        chunk = pipe.read(3)
+        if not chunk:
+            break
+        received.append(chunk)
+    writer.join()
+
+    assert b"".join(received) == b"12345" * 100
+
+
+def test_pipe_raises_writer_error_at_end():
+    pipe = CopyPipe(buffer_size=10)
+    pipe.write(b"abc")
+    pipe._flush()
+    pipe.finish(RuntimeError("copy failed"))
+
+    assert pipe.read(3) == b"abc"
+    with pytest.raises(RuntimeError):
+        pipe.read(3)
+
+
+def test_closed_pipe_stops_writer():
+    pipe = CopyPipe(buffer_size=10)
+    pipe.close()
+    with pytest.raises(ValueError):
+        pipe.write(b"0123456789")
+
+
+def test_signal_get(setup_postgres, dp, dp_streamed):
+    expected = dp.signal.get(source_name="source_1_1", without_flags=False)
+    streamed = dp_streamed.signal.get(source_name="source_1_1", without_flags=False)
+    pd.testing.assert_frame_equal(streamed, expected)
+
+
+def test_query_error_keeps_connection_usable(setup_postgres, dp_streamed):
+    with pytest.raises(psycopg2.Error):
+        dp_streamed.query_df("SELECT 1 / (signal_id - 1) FROM signal")
+
+    assert len(dp_streamed.query_df("SELECT * FROM signal")) > 0
+
+
+def test_parser_error_stops_copy(setup_postgres, dp):
+    def parse(stream):
+        stream.read(10)
+        raise RuntimeError("parser failed")
+
+    conn = dp._pool.get_connection()
+    try:
+        with pytest.raises(RuntimeError):
+            read_copy_streamed(
+                conn.cursor(),
+                "COPY (SELECT * FROM generate_series(1, 100000)) TO STDOUT",
+                parse,
+                buffer_size=64,
+            )
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+            assert cur.fetchone() == (1,)
+    finally:
+        dp._pool.put_connection(conn)